@@ -1,26 +1,116 @@
+import argparse
+import csv
+import json
+import re
 import sqlite3
-from tabulate import tabulate
+import sys
+import time
+from collections import OrderedDict
+from itertools import islice
+
+from exporter import EXPORT_CHUNK_SIZE, export_format, iter_rows, write_export
+from schema_catalog import SchemaCatalog
+from table_renderer import render_grid
+from sqlite_profiles import DEFAULT_PROFILE, SQLITE_PROFILES, apply_profile, connect as connect_sqlite, restore_pragmas
+
+
+_SQL_KEYWORDS = {
+    "WHERE", "JOIN", "ON", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "NATURAL",
+    "GROUP", "ORDER", "LIMIT", "USING", "UNION", "HAVING", "AS", "SET"
+}
+
+def _table_aliases(query):
+    """Map each alias (and bare table name) in FROM/JOIN clauses to its table"""
+    aliases = {}
+    for table, alias in re.findall(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", query, re.I):
+        aliases[table] = table
+        if alias and alias.upper() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def _referenced_columns(query, alias, table, columns, operators, both_sides=True):
+    """Columns of table compared with one of operators somewhere in query
+
+    Qualified references (alias.col or table.col) count on either side of
+    the operator when both_sides is set; unqualified ones only on the left.
+    """
+    qualifier = rf"\b(?:{re.escape(alias)}|{re.escape(table)})\."
+    found = []
+    for col in columns:
+        name = re.escape(col)
+        patterns = [rf"(?:{qualifier}|(?<![.\w])){name}\b\s*(?:{operators})"]
+        if both_sides:
+            patterns.append(rf"(?:{operators})\s*{qualifier}{name}\b")
+        if any(re.search(pattern, query, re.I) for pattern in patterns):
+            found.append(col)
+    return found
+
+
+def _batched(rows, size):
+    """Yield lists of up to size rows from an iterator"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _json_object(number, line):
+    """Parse one JSONL line into a dict; ValueError names the line otherwise"""
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"line {number}: {e}")
+    if not isinstance(record, dict):
+        raise ValueError(f"line {number}: expected a JSON object, got {type(record).__name__}")
+    return record
+
 
 class DatabaseEditor:
-    def __init__(self):
+    PAGE_SIZE = 50
+    IMPORT_BATCH_SIZE = 10000
+    SCRIPT_GROUP_SIZE = 1000
+
+    RECORDED_QUERY_LIMIT = 200
+    COVERING_INDEX_MAX_COLUMNS = 5
+
+    def __init__(self, profile=DEFAULT_PROFILE):
         self.conn = None
         self.cur = None
+        self.catalog = None
+        self.profile = profile
+        self.recorded_queries = OrderedDict()
     
-    def connect(self):
-        """Connect to an existing database or create a new one"""
-        while True:
+    def connect(self, db_file=None, profile=None):
+        """Connect to an existing database or create a new one
+
+        The connection is tuned with a profile from sqlite_profiles
+        (interactive, bulk-load or analytics); when prompting, Enter keeps
+        the editor's current profile.
+        """
+        while not db_file:
             db_file = input("Enter database filename (e.g., school.db): ")
             if not db_file:
                 print("⚠️ Filename cannot be empty!")
                 continue
-            try:
-                self.conn = sqlite3.connect(db_file)
-                self.cur = self.conn.cursor()
-                print(f"✅ Connected to {db_file}")
-                break
-            except sqlite3.Error as e:
-                print(f"❌ Error: {e}")
-                return False
+            profile = input(f"Connection profile ({'/'.join(SQLITE_PROFILES)}) [{self.profile}]: ").strip()
+        profile = profile or self.profile
+        try:
+            conn = connect_sqlite(db_file, profile)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"❌ Error: {e}")
+            return False
+        if self.conn:
+            self.conn.close()
+        self.conn = conn
+        self.cur = self.conn.cursor()
+        self.catalog = SchemaCatalog(self.conn)
+        self.profile = profile
+        self.recorded_queries.clear()
+        self.conn.set_trace_callback(self._record_query)
+        print(f"✅ Connected to {db_file} ({profile} profile)")
         return True
 
     def create_table(self):
@@ -127,8 +217,7 @@ class DatabaseEditor:
             print("⚠️ Please connect to a database first!")
             return []
         
-        self.cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [table[0] for table in self.cur.fetchall()]
+        tables = self.catalog.tables()
         
         if tables:
             print("\n📋 Tables in database:")
@@ -139,8 +228,8 @@ class DatabaseEditor:
         
         return tables
 
-    def view_table(self, table_name=None):
-        """View contents of a table"""
+    def view_table(self, table_name=None, page_size=None):
+        """View contents of a table one page at a time"""
         if not self.conn:
             print("⚠️ Please connect to a database first!")
             return
@@ -157,23 +246,102 @@ class DatabaseEditor:
                 print("❌ Invalid selection")
                 return
         
+        page_size = page_size or self.PAGE_SIZE
+        
         try:
-            # Get table data
-            self.cur.execute(f"SELECT * FROM {table_name}")
-            data = self.cur.fetchall()
-            
-            # Get column names
-            self.cur.execute(f"PRAGMA table_info({table_name})")
-            headers = [col[1] for col in self.cur.fetchall()]
+            # Column names and the key used for paging come from the catalog
+            table = self.catalog.table(table_name)
+            if table is None:
+                print(f"❌ Table '{table_name}' not found")
+                return
+            headers = table.column_names
+            key_cols = table.page_key
             
-            if data:
-                print(f"\n📊 Contents of '{table_name}':")
-                print(tabulate(data, headers=headers, tablefmt="grid"))
-            else:
+            rows, has_more = self._fetch_page(table_name, key_cols, page_size)
+            if not rows:
                 print(f"ℹ️ Table '{table_name}' is empty")
+                return
+            
+            print(f"\n📊 Contents of '{table_name}':")
+            self._print_page(rows, headers, key_cols)
+            
+            # Small tables fit on one page - nothing to navigate
+            if not has_more:
+                return
+            
+            while True:
+                cmd = input("\n[n]ext, [p]revious, [j]ump to key, [q]uit: ").strip().lower()
+                if cmd in ("q", ""):
+                    break
+                
+                if cmd == "n":
+                    last_key = rows[-1][:len(key_cols)]
+                    page, _ = self._fetch_page(table_name, key_cols, page_size, last_key, ">")
+                    if not page:
+                        print("ℹ️ Already at the last page")
+                        continue
+                elif cmd == "p":
+                    first_key = rows[0][:len(key_cols)]
+                    page, _ = self._fetch_page(table_name, key_cols, page_size, first_key, "<")
+                    if not page:
+                        print("ℹ️ Already at the first page")
+                        continue
+                elif cmd == "j":
+                    key = tuple(self._parse_key(input(f"  {col}: ").strip()) for col in key_cols)
+                    page, _ = self._fetch_page(table_name, key_cols, page_size, key, ">=")
+                    if not page:
+                        print("ℹ️ No rows at or after that key")
+                        continue
+                else:
+                    print("❌ Invalid choice")
+                    continue
+                
+                rows = page
+                self._print_page(rows, headers, key_cols)
         except sqlite3.Error as e:
             print(f"❌ Error: {e}")
 
+    def _fetch_page(self, table_name, key_cols, page_size, bound=None, op=">"):
+        """Fetch one page of rows using keyset pagination on key_cols
+
+        Rows are returned in ascending key order with the key values
+        prepended, plus a flag telling whether more rows follow the page.
+        """
+        keys = ", ".join(key_cols)
+        direction = " DESC" if op == "<" else ""
+        sql = f"SELECT {keys}, * FROM {table_name}"
+        params = []
+        if bound is not None:
+            sql += f" WHERE ({keys}) {op} ({', '.join('?' * len(key_cols))})"
+            params.extend(bound)
+        sql += " ORDER BY " + ", ".join(f"{col}{direction}" for col in key_cols)
+        sql += " LIMIT ?"
+        params.append(page_size + 1)
+        
+        self.cur.execute(sql, params)
+        rows = self.cur.fetchmany(page_size + 1)
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if op == "<":
+            rows.reverse()
+        return rows, has_more
+
+    def _print_page(self, rows, headers, key_cols):
+        """Render a single page of rows fetched by _fetch_page"""
+        render_grid((row[len(key_cols):] for row in rows), headers)
+        first = ", ".join(str(value) for value in rows[0][:len(key_cols)])
+        last = ", ".join(str(value) for value in rows[-1][:len(key_cols)])
+        print(f"Showing {len(rows)} rows ({', '.join(key_cols)}: {first} to {last})")
+
+    def _parse_key(self, value):
+        """Convert typed key input to int/float where possible"""
+        for cast in (int, float):
+            try:
+                return cast(value)
+            except ValueError:
+                pass
+        return value
+
     def add_row(self):
         """Add a new row to a table"""
         tables = self.list_tables()
@@ -187,17 +355,15 @@ class DatabaseEditor:
             print("❌ Invalid selection")
             return
         
-        # Get column info
-        self.cur.execute(f"PRAGMA table_info({table_name})")
-        columns = self.cur.fetchall()
+        table = self.catalog.table(table_name)
         
         print(f"\n➕ Add row to '{table_name}':")
         values = []
-        for col in columns:
-            col_name, col_type = col[1], col[2]
+        for col in table.columns:
+            col_name, col_type = col.name, col.type
             constraints = []
-            if col[3]: constraints.append("NOT NULL")
-            if col[5]: constraints.append("PRIMARY KEY")
+            if col.notnull: constraints.append("NOT NULL")
+            if col.pk: constraints.append("PRIMARY KEY")
             
             prompt = f"  {col_name} ({col_type})"
             if constraints:
@@ -215,12 +381,9 @@ class DatabaseEditor:
                     value = None
                     break
                 
-                # Type conversion
+                # Type conversion by the column's affinity
                 try:
-                    if col_type.upper() == "INTEGER":
-                        value = int(value)
-                    elif col_type.upper() == "REAL":
-                        value = float(value)
+                    value = table.converters[col_name](value)
                     break
                 except ValueError:
                     print(f"⚠️ Invalid {col_type} value")
@@ -228,7 +391,7 @@ class DatabaseEditor:
             values.append(value)
         
         # Build INSERT statement
-        col_names = [col[1] for col in columns]
+        col_names = table.column_names
         placeholders = ",".join(["?"] * len(col_names))
         
         try:
@@ -258,8 +421,8 @@ class DatabaseEditor:
         self.view_table(table_name)
         
         # Get primary key
-        self.cur.execute(f"PRAGMA table_info({table_name})")
-        pk_col = next((col[1] for col in self.cur.fetchall() if col[5] > 0), None)
+        table = self.catalog.table(table_name)
+        pk_col = table.primary_key[0] if table and table.primary_key else None
         
         if not pk_col:
             print("❌ No primary key found - cannot safely delete rows")
@@ -288,6 +451,569 @@ class DatabaseEditor:
         except sqlite3.Error as e:
             print(f"❌ Error: {e}")
 
+    def import_file(self, table_name=None, path=None, batch_size=None, fast=None):
+        """Bulk import rows from a CSV or JSONL file into an existing table
+
+        The file is streamed in batches of batch_size rows, each coerced to
+        the column types from the schema catalog and inserted with executemany
+        in its own transaction. With fast=True the connection is switched to
+        the bulk-load profile for the duration of the load. Returns the rows
+        imported.
+        """
+        if not self.conn:
+            print("⚠️ Please connect to a database first!")
+            return 0
+        
+        if not table_name:
+            tables = self.list_tables()
+            if not tables:
+                return 0
+            
+            try:
+                choice = int(input("\nEnter table number to import into: ")) - 1
+                table_name = tables[choice]
+            except (ValueError, IndexError):
+                print("❌ Invalid selection")
+                return 0
+        
+        if not path:
+            path = input("File to import (.csv or .jsonl): ").strip()
+        if fast is None:
+            fast = input("Use the bulk-load profile for this import (faster; a power loss "
+                         "can lose the last batches)? (y/n): ").lower() == 'y'
+        batch_size = batch_size or self.IMPORT_BATCH_SIZE
+        
+        table = self.catalog.table(table_name)
+        if table is None:
+            print(f"❌ Table '{table_name}' not found")
+            return 0
+        
+        if path.lower().endswith(".csv"):
+            reader = self._read_csv
+        elif path.lower().endswith((".jsonl", ".ndjson")):
+            reader = self._read_jsonl
+        else:
+            print("❌ Unsupported file type - use .csv or .jsonl")
+            return 0
+        
+        try:
+            f = open(path, newline="", encoding="utf-8")
+        except OSError as e:
+            print(f"❌ Error: {e}")
+            return 0
+        
+        count = 0
+        start = time.perf_counter()
+        with f:
+            try:
+                columns, rows = reader(f)
+            except (ValueError, csv.Error) as e:
+                print(f"❌ Cannot read {path}: {e}")
+                return 0
+            unknown = [col for col in columns if col not in table.converters]
+            if not columns or unknown:
+                print(f"❌ File columns do not match '{table_name}': {', '.join(unknown) or 'no columns'}")
+                return 0
+            
+            converters = [table.converters[col] for col in columns]
+            placeholders = ",".join(["?"] * len(columns))
+            insert_sql = f"INSERT INTO {table_name} ({','.join(columns)}) VALUES ({placeholders})"
+            
+            saved_pragmas = None
+            # The index advisor's trace callback would run once per inserted row
+            self.conn.set_trace_callback(None)
+            if fast:
+                self.conn.commit()
+                saved_pragmas = apply_profile(self.conn, "bulk-load")
+            try:
+                for batch in _batched(rows, batch_size):
+                    values = self._coerce_batch(batch, converters, count + 1)
+                    self.cur.executemany(insert_sql, values)
+                    self.conn.commit()
+                    count += len(values)
+                    elapsed = time.perf_counter() - start
+                    print(f"  ... {count} rows ({count / elapsed:,.0f} rows/sec)", end="\r")
+            except (sqlite3.Error, ValueError, csv.Error) as e:
+                self.conn.rollback()
+                print(f"\n❌ Import stopped after {count} rows: {e}")
+                return count
+            finally:
+                if saved_pragmas:
+                    self.conn.commit()
+                    restore_pragmas(self.conn, saved_pragmas)
+                self.conn.set_trace_callback(self._record_query)
+        
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else 0
+        print(f"\n✅ Imported {count} rows into '{table_name}' in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+        return count
+
+    def export_table(self, table_name=None, path=None, compress=None, chunk_size=None):
+        """Stream a table to a CSV or JSONL file (gzipped when the name ends in .gz)
+
+        Rows are fetched and written chunk_size at a time in storage order, so
+        memory stays flat for tables of any size. Returns the rows exported.
+        """
+        if not self.conn:
+            print("⚠️ Please connect to a database first!")
+            return 0
+        
+        if not table_name:
+            tables = self.list_tables()
+            if not tables:
+                return 0
+            
+            try:
+                choice = int(input("\nEnter table number to export: ")) - 1
+                table_name = tables[choice]
+            except (ValueError, IndexError):
+                print("❌ Invalid selection")
+                return 0
+        
+        if not path:
+            path = input("Export to file (.csv or .jsonl, add .gz to compress): ").strip()
+        chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+        
+        try:
+            export_format(path)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 0
+        
+        start = time.perf_counter()
+        # A separate cursor so the export does not disturb self.cur
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"SELECT * FROM {table_name}")
+            headers = [col[0] for col in cursor.description]
+            count = write_export(
+                iter_rows(cursor, chunk_size), headers, path, compress, chunk_size,
+                lambda n: print(f"  ... {n} rows ({n / (time.perf_counter() - start):,.0f} rows/sec)", end="\r")
+            )
+        except (sqlite3.Error, OSError) as e:
+            print(f"\n❌ Export failed: {e}")
+            return 0
+        finally:
+            cursor.close()
+        
+        elapsed = time.perf_counter() - start
+        print(f"\n✅ Exported {count} rows from '{table_name}' to {path} in {elapsed:.2f}s")
+        return count
+
+    def _read_csv(self, f):
+        """Return the header columns and a row iterator for a CSV file"""
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return [col.strip() for col in header], reader
+
+    def _read_jsonl(self, f):
+        """Return the columns of the first object and a row iterator for a JSONL file
+
+        A line that is not a JSON object raises ValueError naming its line
+        number, from this call for the first line and from the iterator after.
+        """
+        lines = ((number, line) for number, line in enumerate(f, 1) if line.strip())
+        first = next(lines, None)
+        if first is None:
+            return [], iter(())
+        first = _json_object(*first)
+        columns = list(first)
+        
+        def rows():
+            yield [first.get(col) for col in columns]
+            for number, line in lines:
+                record = _json_object(number, line)
+                yield [record.get(col) for col in columns]
+        
+        return columns, rows()
+
+    def _coerce_batch(self, batch, converters, first_row):
+        """Apply column converters to a batch of raw rows"""
+        values = []
+        for offset, row in enumerate(batch):
+            try:
+                values.append(tuple(convert(value) for convert, value in zip(converters, row)))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"row {first_row + offset}: {e}")
+        return values
+
+    def run_operations(self, operations, group_size=None):
+        """Run operation dicts without prompting, committing in groups
+
+        Supported operations (selected by the "op" key):
+          create_table: table, columns (column definitions), foreign_keys
+          add_row:      table, values (one row dict) or rows (list of dicts)
+          delete_row:   table, key (primary key value) or keys (list); on a
+                        composite key each key is a list, one value per
+                        key column
+          view:         table, limit
+        Writes, create_table included, are committed every group_size
+        operations. On the first failure the uncommitted group is rolled back
+        and execution stops.
+        Returns True if every operation succeeded.
+        """
+        if not self.conn:
+            print("⚠️ Please connect to a database first!")
+            return False
+        
+        handlers = {
+            "create_table": self._op_create_table,
+            "add_row": self._op_add_row,
+            "delete_row": self._op_delete_row,
+            "view": self._op_view,
+        }
+        group_size = group_size or self.SCRIPT_GROUP_SIZE
+        stats = {}
+        pending = 0
+        number, name = 0, None
+        start_all = time.perf_counter()
+        
+        def record(name, started, rows):
+            count, rows_total, elapsed = stats.get(name, (0, 0, 0.0))
+            stats[name] = (count + 1, rows_total + rows, elapsed + time.perf_counter() - started)
+        
+        try:
+            for number, op in enumerate(operations, 1):
+                name = None
+                if not isinstance(op, dict):
+                    raise ValueError(f"expected an object, got {type(op).__name__}")
+                name = op.get("op")
+                if name not in handlers:
+                    raise ValueError(f"unknown operation {name!r}")
+                # sqlite3 only opens a transaction by itself before DML, so
+                # a create_table would otherwise commit on its own
+                if name != "view" and not self.conn.in_transaction:
+                    self.conn.execute("BEGIN")
+                started = time.perf_counter()
+                rows = handlers[name](op)
+                record(name, started, rows)
+                
+                if name != "view":
+                    pending += 1
+                if pending >= group_size:
+                    started = time.perf_counter()
+                    self.conn.commit()
+                    record("commit", started, pending)
+                    pending = 0
+            
+            started = time.perf_counter()
+            self.conn.commit()
+            record("commit", started, pending)
+            ok = True
+        except (sqlite3.Error, ValueError, KeyError, TypeError) as e:
+            self.conn.rollback()
+            print(f"❌ Operation {number} ({name}) failed: {e}")
+            print(f"🚫 Rolled back {pending} uncommitted operations")
+            ok = False
+        
+        elapsed_all = time.perf_counter() - start_all
+        summary = [
+            (op_name, count, rows, f"{elapsed:.4f}", f"{elapsed / count * 1000:.3f}")
+            for op_name, (count, rows, elapsed) in stats.items()
+        ]
+        print(f"\n⏱️ Ran {number if ok else number - 1} operations in {elapsed_all:.3f}s")
+        render_grid(summary, ["Operation", "Count", "Rows", "Total (s)", "Avg (ms)"])
+        return ok
+
+    def _op_create_table(self, op):
+        if_not_exists = "IF NOT EXISTS " if op.get("if_not_exists") else ""
+        definitions = list(op["columns"]) + list(op.get("foreign_keys", []))
+        self.cur.execute(f"CREATE TABLE {if_not_exists}{op['table']} (\n  " + ",\n  ".join(definitions) + "\n)")
+        return 0
+
+    def _op_add_row(self, op):
+        table_name = op["table"]
+        rows = op["rows"] if "rows" in op else [op["values"]]
+        if not rows:
+            return 0
+        
+        table = self.catalog.table(table_name)
+        columns = list(rows[0])
+        unknown = [col for col in columns if table is None or col not in table.converters]
+        if table is None or unknown:
+            raise ValueError(f"unknown table or columns for '{table_name}': {', '.join(unknown)}")
+        
+        converters = [table.converters[col] for col in columns]
+        values = self._coerce_batch([[row.get(col) for col in columns] for row in rows], converters, 1)
+        placeholders = ",".join(["?"] * len(columns))
+        self.cur.executemany(
+            f"INSERT INTO {table_name} ({','.join(columns)}) VALUES ({placeholders})",
+            values
+        )
+        return len(values)
+
+    def _op_delete_row(self, op):
+        table_name = op["table"]
+        table = self.catalog.table(table_name)
+        pk_cols = table.primary_key if table else []
+        if not pk_cols:
+            raise ValueError(f"no primary key found on '{table_name}' - cannot safely delete rows")
+        
+        keys = op["keys"] if "keys" in op else [op["key"]]
+        params = []
+        for key in keys:
+            values = tuple(key) if isinstance(key, (list, tuple)) else (key,)
+            # A partial composite key would delete every row sharing its prefix
+            if len(values) != len(pk_cols):
+                raise ValueError(f"key {key!r} needs one value for each of {', '.join(pk_cols)}")
+            params.append(values)
+        where = " AND ".join(f"{col}=?" for col in pk_cols)
+        self.cur.executemany(f"DELETE FROM {table_name} WHERE {where}", params)
+        return self.cur.rowcount
+
+    def _op_view(self, op):
+        table_name = op["table"]
+        table = self.catalog.table(table_name)
+        if table is None:
+            raise ValueError(f"no such table: {table_name}")
+        key_cols = table.page_key
+        rows, _ = self._fetch_page(table_name, key_cols, op.get("limit", self.PAGE_SIZE))
+        print(f"\n📊 Contents of '{table_name}':")
+        if rows:
+            self._print_page(rows, table.column_names, key_cols)
+        else:
+            print(f"ℹ️ Table '{table_name}' is empty")
+        return len(rows)
+
+    def _record_query(self, statement):
+        """Trace callback keeping the most recent distinct SELECT statements"""
+        text = statement.strip()
+        lowered = text.lower()
+        if not lowered.startswith("select") or "sqlite_master" in lowered or "pragma" in lowered:
+            return
+        self.recorded_queries.pop(text, None)
+        self.recorded_queries[text] = None
+        if len(self.recorded_queries) > self.RECORDED_QUERY_LIMIT:
+            self.recorded_queries.popitem(last=False)
+
+    def record_query(self, query):
+        """Add a query to the workload inspected by advise_indexes"""
+        self._record_query(query)
+
+    def _index_columns(self, table_name):
+        """Return {index name: [columns]} for a table, including its primary key"""
+        table = self.catalog.table(table_name)
+        result = {index.name: index.columns for index in table.indexes}
+        
+        # An INTEGER PRIMARY KEY is the rowid and has no separate index
+        pk_cols = table.primary_key
+        if pk_cols and not any(cols == pk_cols for cols in result.values()):
+            result["(primary key)"] = pk_cols
+        return result
+
+    def list_indexes(self, table_name=None):
+        """List indexes with their columns, for one table or the whole database"""
+        if not self.conn:
+            print("⚠️ Please connect to a database first!")
+            return []
+        
+        rows = []
+        for table in [table_name] if table_name else self.catalog.tables(internal=False):
+            info = self.catalog.table(table)
+            for index in info.indexes if info else []:
+                columns = ", ".join(col or "(expression)" for col in index.columns)
+                kind = {"c": "CREATE INDEX", "u": "UNIQUE constraint", "pk": "PRIMARY KEY"}.get(index.origin, index.origin)
+                rows.append((index.name, table, columns, "yes" if index.unique else "no", kind))
+        
+        if rows:
+            print("\n🗂️ Indexes:")
+            render_grid(rows, ["Index", "Table", "Columns", "Unique", "Origin"])
+        else:
+            print("ℹ️ No indexes found.")
+        return rows
+
+    def create_index(self, table_name=None, columns=None, index_name=None, unique=False):
+        """Create an index on one or more columns of a table"""
+        if not self.conn:
+            print("⚠️ Please connect to a database first!")
+            return
+        
+        if not table_name:
+            tables = self.list_tables()
+            if not tables:
+                return
+            try:
+                choice = int(input("\nEnter table number to index: ")) - 1
+                table_name = tables[choice]
+            except (ValueError, IndexError):
+                print("❌ Invalid selection")
+                return
+        
+        if not columns:
+            columns = [col.strip() for col in input("Columns (comma-separated, in index order): ").split(",") if col.strip()]
+            if not columns:
+                print("⚠️ An index needs at least one column!")
+                return
+            unique = input("UNIQUE index? (y/n): ").lower() == 'y'
+        index_name = index_name or f"idx_{table_name}_{'_'.join(columns)}"
+        
+        try:
+            start = time.perf_counter()
+            self.cur.execute(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX {index_name} ON {table_name} ({', '.join(columns)})"
+            )
+            self.conn.commit()
+            print(f"✅ Index '{index_name}' created in {time.perf_counter() - start:.2f}s")
+        except sqlite3.Error as e:
+            print(f"❌ Error creating index: {e}")
+
+    def drop_index(self, index_name=None):
+        """Drop an index created with CREATE INDEX"""
+        if not self.conn:
+            print("⚠️ Please connect to a database first!")
+            return
+        
+        if not index_name:
+            self.list_indexes()
+            index_name = input("\nIndex name to drop: ").strip()
+            if not index_name:
+                return
+        
+        try:
+            self.cur.execute(f"DROP INDEX {index_name}")
+            self.conn.commit()
+            print(f"✅ Index '{index_name}' dropped")
+        except sqlite3.Error as e:
+            print(f"❌ Error dropping index: {e}")
+
+    def advise_indexes(self, queries=None, interactive=True):
+        """Suggest indexes for unindexed foreign keys and full scans in a workload
+
+        Foreign keys whose columns are not the leading columns of any index
+        are flagged first. Then every query (the recorded SELECTs by default)
+        is run through EXPLAIN QUERY PLAN; each full table scan gets a
+        proposed index built from the columns the query filters, sorts and
+        reads on that table, shown with the plan before and after; it is
+        only suggested when the plan after no longer scans the table. Returns
+        a list of (reason, CREATE INDEX statement) suggestions.
+        """
+        if not self.conn:
+            print("⚠️ Please connect to a database first!")
+            return []
+        
+        suggestions = []
+        
+        print("\n🔎 Foreign keys without an index:")
+        found = False
+        for table in self.catalog.tables(internal=False):
+            indexed = list(self._index_columns(table).values())
+            for cols, ref_table, _ in self.catalog.table(table).foreign_keys:
+                if any(index_cols[:len(cols)] == cols for index_cols in indexed):
+                    continue
+                found = True
+                index_sql = f"CREATE INDEX idx_{table}_{'_'.join(cols)} ON {table} ({', '.join(cols)})"
+                print(f"  {table}({', '.join(cols)}) -> {ref_table}: {index_sql}")
+                suggestions.append((f"foreign key {table}({', '.join(cols)})", index_sql))
+        if not found:
+            print("  ✅ None")
+        
+        queries = list(self.recorded_queries) if queries is None else list(queries)
+        print(f"\n🔎 Checking {len(queries)} queries for full table scans:")
+        for query in queries:
+            try:
+                before = self._query_plan(self.cur, query)
+            except sqlite3.Error as e:
+                print(f"\n  ⚠️ Skipping query ({e}): {query}")
+                continue
+            
+            scans = [match.group(1) for match in (re.match(r"SCAN (\w+)$", step) for step in before) if match]
+            if not scans:
+                continue
+            
+            aliases = _table_aliases(query)
+            for alias in scans:
+                table = aliases.get(alias, alias)
+                index_cols = self._proposed_index(query, alias, table)
+                print(f"\n  Query: {query}")
+                print(f"  ⚠️ Full scan of '{table}'")
+                if not index_cols:
+                    print("  ℹ️ No filter, join or sort columns on this table - an index will not help")
+                    continue
+                
+                index_sql = f"CREATE INDEX idx_{table}_{'_'.join(index_cols)} ON {table} ({', '.join(index_cols)})"
+                after = self._query_plan_with_index(query, index_sql)
+                if f"SCAN {alias}" in after:
+                    print(f"  ℹ️ {index_sql} would not avoid the scan - not suggested")
+                    continue
+                print(f"  💡 {index_sql}")
+                print("  Plan before: " + " | ".join(before))
+                print("  Plan after:  " + " | ".join(after))
+                suggestions.append((f"full scan of {table}", index_sql))
+        
+        if not suggestions:
+            print("\n✅ No index suggestions")
+        elif interactive:
+            proposed = OrderedDict((index_sql, reason) for reason, index_sql in suggestions)
+            for index_sql, reason in proposed.items():
+                if input(f"\n{index_sql}\nCreate this index ({reason})? (y/n): ").lower() == 'y':
+                    try:
+                        self.cur.execute(index_sql.replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS", 1))
+                        self.conn.commit()
+                        print("✅ Index created")
+                    except sqlite3.Error as e:
+                        print(f"❌ Error creating index: {e}")
+        return suggestions
+
+    def _proposed_index(self, query, alias, table):
+        """Pick index columns for a scanned table
+
+        Columns compared with constants come first, then the first range
+        column, sort columns and join columns; the index is widened to
+        cover the table's other referenced columns when that stays small.
+        """
+        info = self.catalog.table(table)
+        columns = info.column_names if info else []
+        # The rowid alias is stored in every index already
+        rowid_cols = [col.name for col in info.columns if col.pk == 1 and col.type.upper() == "INTEGER"] if info else []
+        
+        constants = _referenced_columns(query, alias, table, columns,
+                                        r"=\s*(?:\?|:\w+|[-+]?\d|'|NULL\b)|\bIN\s*\(|\bIS\b",
+                                        both_sides=False)
+        ranges = _referenced_columns(query, alias, table, columns, r"<|>|\bBETWEEN\b|\bLIKE\b")
+        joins = _referenced_columns(query, alias, table, columns, r"=")
+        
+        order = []
+        clause = re.search(r"\b(?:ORDER|GROUP)\s+BY\s+(.*?)(?:\bLIMIT\b|\bHAVING\b|$)", query, re.I | re.S)
+        if clause:
+            for col in columns:
+                if re.search(rf"(?:\b(?:{re.escape(alias)}|{re.escape(table)})\.|(?<![.\w])){re.escape(col)}\b",
+                             clause.group(1)):
+                    order.append(col)
+        
+        index_cols = []
+        for col in constants + ranges[:1] + order + joins:
+            if col not in index_cols and col not in rowid_cols:
+                index_cols.append(col)
+        if not index_cols:
+            return []
+        
+        # Extend to a covering index when the table contributes only a few columns
+        used = [col for col in columns
+                if re.search(rf"\b(?:{re.escape(alias)}|{re.escape(table)})\.{re.escape(col)}\b", query)]
+        extra = [col for col in used if col not in index_cols and col not in rowid_cols]
+        if extra and len(index_cols) + len(extra) <= self.COVERING_INDEX_MAX_COLUMNS:
+            index_cols += extra
+        return index_cols
+
+    def _query_plan(self, cursor, query):
+        cursor.execute(f"EXPLAIN QUERY PLAN {query}")
+        return [row[3] for row in cursor.fetchall()]
+
+    def _query_plan_with_index(self, query, index_sql):
+        """Plan the query against a schema-only in-memory copy plus the new index"""
+        clone = sqlite3.connect(":memory:")
+        try:
+            for sql in self.catalog.ddl():
+                try:
+                    clone.execute(sql)
+                except sqlite3.Error:
+                    # e.g. shadow tables already created by a virtual table
+                    pass
+            clone.execute(index_sql)
+            return self._query_plan(clone.cursor(), query)
+        finally:
+            clone.close()
+
     def close(self):
         """Close the database connection"""
         if self.conn:
@@ -295,6 +1021,35 @@ class DatabaseEditor:
             print("🔌 Database connection closed")
         self.conn = None
         self.cur = None
+        self.catalog = None
+
+def manage_indexes(editor):
+    print("\n🗂️ Index Management")
+    print("1. List Indexes")
+    print("2. Create Index")
+    print("3. Drop Index")
+    print("4. Index Advisor")
+    choice = input("Select an option (1-4): ")
+    
+    if choice == "1":
+        editor.list_indexes()
+    elif choice == "2":
+        editor.create_index()
+    elif choice == "3":
+        editor.drop_index()
+    elif choice == "4":
+        path = input("File of queries to analyse (blank for recorded queries): ").strip()
+        queries = None
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    queries = [query.strip() for query in f.read().split(";") if query.strip()]
+            except OSError as e:
+                print(f"❌ Error: {e}")
+                return
+        editor.advise_indexes(queries)
+    else:
+        print("❌ Invalid choice")
 
 def main():
     editor = DatabaseEditor()
@@ -310,11 +1065,14 @@ def main():
             print("4. View Table Data")
             print("5. Add Row")
             print("6. Delete Row")
-            print("7. Exit")
+            print("7. Import CSV/JSONL")
+            print("8. Export CSV/JSONL")
+            print("9. Manage Indexes")
+            print("10. Exit")
             print("="*40)
             
             try:
-                choice = input("\nSelect an option (1-7): ")
+                choice = input("\nSelect an option (1-10): ")
                 
                 if choice == "1":
                     editor.connect()
@@ -329,6 +1087,12 @@ def main():
                 elif choice == "6":
                     editor.delete_row()
                 elif choice == "7":
+                    editor.import_file()
+                elif choice == "8":
+                    editor.export_table()
+                elif choice == "9":
+                    manage_indexes(editor)
+                elif choice == "10":
                     editor.close()
                     print("\n👋 Goodbye!")
                     break
@@ -343,5 +1107,51 @@ def main():
         if hasattr(editor, 'close'):
             editor.close()
 
+def run_script(argv=None):
+    """Headless entry point: run a JSON/JSONL operations script against a database"""
+    parser = argparse.ArgumentParser(description="Run DatabaseEditor operations from a script file")
+    parser.add_argument("script", help="JSON file ({'database': ..., 'operations': [...]} or a list) "
+                                       "or JSONL file with one operation per line")
+    parser.add_argument("--db", help="database file (overrides 'database' in the script)")
+    parser.add_argument("--group-size", type=int, default=DatabaseEditor.SCRIPT_GROUP_SIZE,
+                        help="operations per transaction")
+    parser.add_argument("--profile", choices=SQLITE_PROFILES, default=DEFAULT_PROFILE,
+                        help="SQLite connection profile")
+    args = parser.parse_args(argv)
+    
+    try:
+        with open(args.script, encoding="utf-8") as f:
+            if args.script.lower().endswith((".jsonl", ".ndjson")):
+                database = args.db
+                operations = (json.loads(line) for line in f if line.strip())
+                return _run_script_operations(database, operations, args.group_size, args.profile)
+            script = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot read script {args.script}: {e}")
+        return False
+    
+    if isinstance(script, list):
+        script = {"operations": script}
+    if not isinstance(script, dict):
+        print("❌ Script must be a JSON object or a list of operations")
+        return False
+    database = args.db or script.get("database")
+    return _run_script_operations(database, script.get("operations", []), args.group_size, args.profile)
+
+def _run_script_operations(database, operations, group_size, profile=DEFAULT_PROFILE):
+    if not database:
+        print("❌ No database given - use --db or a 'database' key in the script")
+        return False
+    
+    editor = DatabaseEditor(profile)
+    try:
+        if not editor.connect(database, profile):
+            return False
+        return editor.run_operations(operations, group_size)
+    finally:
+        editor.close()
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(0 if run_script() else 1)
     main()
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""Move orders older than a cutoff date out of the live online_stores tables.
+
+Orders dated before --before are copied with their order_items and
+order_totals rows into orders_archive, order_items_archive and
+order_totals_archive and then deleted from the live tables. The archived
+totals keep the amounts as they were, so later price changes do not
+rewrite retired history.
+
+Orders are moved in primary-key order, --batch-size orders per short
+transaction, with a checkpoint row for the cutoff written in the same
+transaction, so an interrupted run continues after the last committed
+batch. --sleep pauses between batches to leave room for the live workload
+and --max-seconds stops after a time budget (run it again to continue).
+
+Usage:
+  python archive_orders.py --sqlite store.db --before 2020-01-01
+  python archive_orders.py --before 2020-01-01 --sleep 0.2
+"""
+import argparse
+import datetime
+import sys
+import time
+
+from online_stores import DB_CONFIG, OnlineStore
+from store_backends import MySQLBackend, SQLiteBackend, StoreError
+
+ARCHIVE_BATCH_SIZE = 1000
+
+ARCHIVE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS orders_archive (
+        id INT PRIMARY KEY,
+        customer_id INT,
+        salesperson_id INT,
+        order_date DATE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS order_items_archive (
+        id INT PRIMARY KEY,
+        order_id INT NOT NULL,
+        product_id INT,
+        quantity INT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS order_totals_archive (
+        order_id INT PRIMARY KEY,
+        item_count INT NOT NULL,
+        total_amount DECIMAL(12,2) NOT NULL
+    )
+    """,
+    # One row per cutoff: a different cutoff has to rescan from the start
+    """
+    CREATE TABLE IF NOT EXISTS archive_checkpoints (
+        cutoff DATE PRIMARY KEY,
+        last_id INT NOT NULL,
+        orders_archived BIGINT NOT NULL,
+        items_archived BIGINT NOT NULL
+    )
+    """,
+]
+
+# Live table -> (archive table, columns, column holding the order id),
+# children first so the deletes never leave orphans even without cascades
+ARCHIVED_TABLES = [
+    ("order_totals", "order_totals_archive", "order_id, item_count, total_amount", "order_id"),
+    ("order_items", "order_items_archive", "id, order_id, product_id, quantity", "order_id"),
+    ("orders", "orders_archive", "id, customer_id, salesperson_id, order_date", "id"),
+]
+
+
+class OrderArchiver:
+    """Chunked, resumable move of old orders into the archive tables"""
+
+    def __init__(self, store, cutoff, batch_size=ARCHIVE_BATCH_SIZE, sleep=0.0, max_seconds=None):
+        self.store = store
+        self.cutoff = str(cutoff)
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.max_seconds = max_seconds
+
+    def run(self):
+        """Archive every order before the cutoff past the checkpoint
+
+        Returns the number of orders archived by this run, or None if it
+        stopped on an error (committed batches are kept).
+        """
+        try:
+            self._prepare()
+            return self._archive()
+        except StoreError as e:
+            print(f"\nArchiving stopped: {e}")
+            print("Run the archive job again to resume from the last checkpoint.")
+            return None
+
+    def _prepare(self):
+        with self.store.transaction("archive") as cursor:
+            for ddl in ARCHIVE_TABLES:
+                cursor.execute(ddl)
+            cursor.execute("SELECT last_id, orders_archived, items_archived "
+                           "FROM archive_checkpoints WHERE cutoff = %s", (self.cutoff,))
+            checkpoint = cursor.fetchone()
+        if checkpoint:
+            self.last_id, self.orders_archived, self.items_archived = checkpoint
+            print(f"Resuming after order {self.last_id} "
+                  f"({self.orders_archived} orders archived before {self.cutoff} so far)")
+        else:
+            self.last_id, self.orders_archived, self.items_archived = 0, 0, 0
+
+    def _archive(self):
+        start = time.perf_counter()
+        archived = 0
+        while True:
+            moved = self._archive_batch()
+            if not moved:
+                break
+            archived += moved
+            elapsed = time.perf_counter() - start
+            print(f"  ... order {self.last_id}: {archived} orders this run "
+                  f"({archived / elapsed:,.0f} orders/sec)", end="\r")
+            if self.max_seconds is not None and elapsed >= self.max_seconds:
+                print(f"\nStopped after {elapsed:.0f}s; run again to continue")
+                break
+            if self.sleep:
+                time.sleep(self.sleep)
+        elapsed = time.perf_counter() - start
+        rate = archived / elapsed if elapsed else 0
+        print(f"\nArchived {archived} orders in {elapsed:.2f}s ({rate:,.0f} orders/sec); "
+              f"{self.orders_archived} orders and {self.items_archived} lines before {self.cutoff} in total")
+        return archived
+
+    def _archive_batch(self):
+        """Move the next batch and the checkpoint in one transaction; returns its size"""
+        with self.store.transaction("archive") as cursor:
+            # A keyset step over the primary key, so each batch starts where
+            # the last one ended instead of rescanning deleted rows
+            cursor.execute("SELECT id FROM orders WHERE id > %s AND order_date < %s ORDER BY id LIMIT %s",
+                           (self.last_id, self.cutoff, self.batch_size))
+            order_ids = [row[0] for row in cursor.fetchall()]
+            if not order_ids:
+                return 0
+
+            # Statements name the ids rather than repeating the date range, so
+            # they only lock the rows being moved
+            placeholders = ", ".join(["%s"] * len(order_ids))
+            cursor.execute(f"SELECT COUNT(*) FROM order_items WHERE order_id IN ({placeholders})", order_ids)
+            items = cursor.fetchone()[0]
+            for live, archive, columns, key in ARCHIVED_TABLES:
+                cursor.execute(f"INSERT INTO {archive} ({columns}) "
+                               f"SELECT {columns} FROM {live} WHERE {key} IN ({placeholders})", order_ids)
+                cursor.execute(f"DELETE FROM {live} WHERE {key} IN ({placeholders})", order_ids)
+
+            checkpoint = (self.cutoff, order_ids[-1], self.orders_archived + len(order_ids),
+                          self.items_archived + items)
+            cursor.execute("INSERT INTO archive_checkpoints (cutoff, last_id, orders_archived, items_archived) "
+                           "VALUES (%s, %s, %s, %s) " +
+                           self.store.backend.upsert(["cutoff"], ["last_id", "orders_archived", "items_archived"]),
+                           checkpoint)
+        # Only advance once the batch has committed
+        self.last_id, self.orders_archived, self.items_archived = checkpoint[1:]
+        self.store.report_cache.clear()
+        return len(order_ids)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--sqlite", metavar="DB_FILE", help="SQLite store database")
+    target.add_argument("--mysql-db", default=DB_CONFIG["database"],
+                        help="MySQL store database (default: %(default)s)")
+    parser.add_argument("--before", required=True, type=datetime.date.fromisoformat,
+                        help="archive orders dated before this day (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE,
+                        help="orders per batch and transaction")
+    parser.add_argument("--sleep", type=float, default=0.0, help="seconds to pause between batches")
+    parser.add_argument("--max-seconds", type=float, help="stop after this long (run again to continue)")
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        backend = SQLiteBackend(args.sqlite)
+    else:
+        backend = MySQLBackend(**dict(DB_CONFIG, database=args.mysql_db))
+
+    store = OnlineStore(backend, pool_size=1, cache_size=0)
+    archiver = OrderArchiver(store, args.before, args.batch_size, args.sleep, args.max_seconds)
+    return archiver.run() is not None
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
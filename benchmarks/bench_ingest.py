@@ -0,0 +1,130 @@
+"""Order line ingestion: per-row add_order_item vs. the group-commit queue.
+
+--threads producer threads each add --lines order lines to random
+existing orders of a store filled by benchmarks.store_data, three ways:
+
+  per-row   add_order_item, one transaction and commit per line
+  queued    OrderLineQueue.submit() and wait for that line's future, like
+            a checkout request that must not answer before its line is durable
+  pipelined submit() every line, then wait for all futures (bulk loads)
+
+Prints lines/sec and per-line latency for each, plus the queue's average
+batch size.
+
+Usage:
+  python -m benchmarks.bench_ingest --sqlite ingest.db --threads 16 --lines 500
+"""
+import argparse
+import contextlib
+import os
+import random
+import threading
+import time
+
+from benchmarks.bench_store import summarize, table_sizes
+from benchmarks.store_data import DEFAULT_VOLUMES, add_backend_arguments, generate, open_store
+from order_ingest import INGEST_BATCH_SIZE, INGEST_MAX_DELAY, OrderLineQueue
+
+
+def random_lines(seed, count, max_id):
+    rng = random.Random(seed)
+    return [(rng.randint(1, max_id["orders"]), rng.randint(1, max_id["products"]), rng.randint(1, 5))
+            for _ in range(count)]
+
+
+def run_threads(threads, work):
+    """Run work(thread_number) on each thread; returns (elapsed, per-line latencies)"""
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(number):
+        samples = work(number)
+        with lock:
+            latencies.extend(samples)
+
+    workers = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def bench_per_row(store, lines):
+    def work(number):
+        samples = []
+        for line in lines[number]:
+            start = time.perf_counter()
+            store.add_order_item(*line)
+            samples.append(time.perf_counter() - start)
+        return samples
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return run_threads(len(lines), work)
+
+
+def bench_queued(line_queue, lines):
+    def work(number):
+        samples = []
+        for line in lines[number]:
+            start = time.perf_counter()
+            line_queue.submit(*line).result()
+            samples.append(time.perf_counter() - start)
+        return samples
+    return run_threads(len(lines), work)
+
+
+def bench_pipelined(line_queue, lines):
+    def work(number):
+        start = time.perf_counter()
+        futures = [line_queue.submit(*line) for line in lines[number]]
+        for future in futures:
+            future.result()
+        # Only the total is meaningful here; report it as each line's latency
+        return [time.perf_counter() - start] * len(futures)
+    return run_threads(len(lines), work)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_backend_arguments(parser)
+    for name, default in DEFAULT_VOLUMES.items():
+        parser.add_argument(f"--{name}", type=int, default=default, help="volume when generating data")
+    parser.add_argument("--threads", type=int, default=16, help="producer threads")
+    parser.add_argument("--lines", type=int, default=500, help="lines per producer and mode")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument("--max-delay-ms", type=float, default=INGEST_MAX_DELAY * 1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    store, created = open_store(args, pool_size=args.threads, cache_size=0)
+    if created:
+        generate(store, args.customers, args.products, args.salespeople, args.orders)
+    max_id = {table: max_id or 1 for table, (_, max_id) in table_sizes(store).items()}
+
+    def lines_for(mode):
+        return [random_lines(f"{args.seed}-{mode}-{number}", args.lines, max_id) for number in range(args.threads)]
+
+    results = {"per-row": bench_per_row(store, lines_for("per-row"))}
+    batches = {}
+    for mode, bench in (("queued", bench_queued), ("pipelined", bench_pipelined)):
+        with OrderLineQueue(store, args.batch_size, args.max_delay_ms / 1000) as line_queue:
+            results[mode] = bench(line_queue, lines_for(mode))
+        stats = line_queue.stats
+        batches[mode] = stats["lines"] / stats["batches"] if stats["batches"] else 0
+
+    total = args.threads * args.lines
+    print(f"\n{args.threads} producers x {args.lines} lines on {store.backend.name} "
+          f"(batch {args.batch_size}, window {args.max_delay_ms:g} ms):")
+    print(f"  {'mode':10} {'lines/sec':>10} {'p50 ms':>8} {'p95 ms':>8} {'avg batch':>10}")
+    for mode, (elapsed, latencies) in results.items():
+        summary = summarize(latencies)
+        batch = f"{batches[mode]:10.1f}" if mode in batches else f"{1:10.1f}"
+        print(f"  {mode:10} {total / elapsed:10,.0f} {summary['p50_ms']:8.2f} {summary['p95_ms']:8.2f} {batch}")
+    per_row = total / results["per-row"][0]
+    for mode in batches:
+        print(f"{mode} vs per-row: {total / results[mode][0] / per_row:.1f}x the throughput")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark the movies view: per-row name lookups vs. the joined query.
+
+Copies leffat2.db to a temporary file, scales the movies table up with
+synthetic rows and times both ways of resolving director/actor names.
+
+Usage: python -m benchmarks.bench_movies [--movies 100000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from leffat import MOVIES_WITH_NAMES_QUERY
+
+
+def scale_up(conn, movies):
+    """Add synthetic movies, some pointing at missing directors/actors"""
+    cur = conn.cursor()
+    cur.execute("SELECT id FROM directors")
+    director_ids = [row[0] for row in cur.fetchall()] + [None, 999999]
+    cur.execute("SELECT id FROM actors")
+    actor_ids = [row[0] for row in cur.fetchall()] + [None, 999999]
+    
+    rng = random.Random(42)
+    cur.executemany(
+        "INSERT INTO movies (name, year_of_release, director_id, actor_id) VALUES (?, ?, ?, ?)",
+        ((f"Movie {i}", rng.randint(1920, 2025), rng.choice(director_ids), rng.choice(actor_ids))
+         for i in range(movies))
+    )
+    conn.commit()
+
+
+def n_plus_one(cur):
+    """The original display_table logic: two lookups per movie row"""
+    cur.execute("SELECT * FROM movies")
+    data = cur.fetchall()
+    result = []
+    for movie_id, name, year, director_id, actor_id in data:
+        cur.execute("SELECT name FROM directors WHERE id=?", (director_id,))
+        director_result = cur.fetchone()
+        director = director_result[0] if director_result else f"Unknown Director (ID:{director_id})"
+        cur.execute("SELECT name FROM actors WHERE id=?", (actor_id,))
+        actor_result = cur.fetchone()
+        actor = actor_result[0] if actor_result else f"Unknown Actor (ID:{actor_id})"
+        result.append((movie_id, name, year, director, actor))
+    return result
+
+
+def joined(cur):
+    cur.execute(MOVIES_WITH_NAMES_QUERY)
+    return cur.fetchall()
+
+
+def timed(func, cur):
+    start = time.perf_counter()
+    rows = func(cur)
+    return rows, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movies", type=int, default=100000, help="synthetic movies to add")
+    parser.add_argument("--db", default="leffat2.db", help="source database to copy")
+    args = parser.parse_args()
+    
+    tmpdir = tempfile.mkdtemp()
+    try:
+        db_file = os.path.join(tmpdir, "leffat_bench.db")
+        shutil.copy(args.db, db_file)
+        conn = sqlite3.connect(db_file)
+        scale_up(conn, args.movies)
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM movies")
+        total = cur.fetchone()[0]
+        
+        slow_rows, slow_time = timed(n_plus_one, cur)
+        fast_rows, fast_time = timed(joined, cur)
+        conn.close()
+        
+        if sorted(slow_rows) != fast_rows:
+            raise SystemExit("Results differ between N+1 lookups and joined query!")
+        
+        print(f"Movies: {total}")
+        print(f"N+1 lookups:  {slow_time:.3f}s ({2 * total + 1} queries)")
+        print(f"Joined query: {fast_time:.3f}s (1 query)")
+        print(f"Speedup: {slow_time / fast_time:.1f}x")
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark table rendering: tabulate over fetchall() vs. the streaming grid.
+
+Builds a temporary SQLite table of --rows rows (integer, short text, real
+and a long TEXT column) and renders SELECT * from it with both
+approaches into a sink that discards the text. Each run happens in a
+fresh subprocess so its peak RSS is its own; time to first row is when
+the sink has received the header and the first data row.
+
+Usage: python -m benchmarks.bench_render [--rows 1000000]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+HEADERS = ["id", "name", "price", "notes"]
+
+
+class Sink:
+    """Text stream that counts lines and notes when the first data row arrives"""
+
+    # top border, header, header separator, first row
+    FIRST_ROW_LINE = 4
+
+    def __init__(self, start):
+        self.start = start
+        self.lines = 0
+        self.chars = 0
+        self.first_row = None
+
+    def write(self, text):
+        self.lines += text.count("\n")
+        self.chars += len(text)
+        if self.first_row is None and self.lines >= self.FIRST_ROW_LINE:
+            self.first_row = time.perf_counter() - self.start
+
+    def flush(self):
+        pass
+
+
+def build(path, rows):
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price REAL, notes TEXT)")
+    conn.executemany(
+        "INSERT INTO items VALUES (?, ?, ?, ?)",
+        ((i, f"Item {i}", round(rng.uniform(1, 1000), 2), "lorem ipsum " * rng.randint(1, 20))
+         for i in range(1, rows + 1))
+    )
+    conn.commit()
+    conn.close()
+
+
+def run_case(case, path):
+    conn = sqlite3.connect(path)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    sink = Sink(start)
+    cursor = conn.execute("SELECT * FROM items")
+    if case == "tabulate":
+        from tabulate import tabulate
+        sink.write(tabulate(cursor.fetchall(), headers=HEADERS, tablefmt="grid"))
+    else:
+        from table_renderer import render_grid
+        render_grid(cursor, HEADERS, out=sink)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    conn.close()
+    # ru_maxrss is in KiB on Linux
+    return {"first_row": sink.first_row, "total": elapsed, "peak_mb": (peak - baseline) / 1024,
+            "lines": sink.lines}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--case", choices=["tabulate", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args.db)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "render.db")
+        build(path, args.rows)
+        print(f"Rendering {args.rows} rows:")
+        print(f"  {'renderer':10} {'first row (s)':>14} {'total (s)':>10} {'peak RSS (MB)':>14}")
+        for case in ("tabulate", "stream"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_render", "--case", case, "--db", path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output)
+            print(f"  {case:10} {result['first_row']:14.3f} {result['total']:10.2f} {result['peak_mb']:14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Insert and scan throughput of each SQLite connection profile.
+
+For every profile in sqlite_profiles (plus "default", a bare sqlite3.connect
+with the rollback journal) a fresh database file is filled with --rows rows
+committed --commit-every rows at a time, then scanned --scans times with an
+aggregate and a sort on an unindexed column. The read-only analytics
+profile cannot insert, so it scans the file the bulk-load run produced.
+
+Usage:
+  python -m benchmarks.bench_sqlite_profiles --rows 200000 --commit-every 100
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from sqlite_profiles import SQLITE_PROFILES, connect
+
+SCAN_QUERIES = [
+    "SELECT category, COUNT(*), SUM(amount), AVG(amount) FROM events GROUP BY category",
+    "SELECT id, amount FROM events ORDER BY note LIMIT 100",
+]
+
+
+def open_connection(path, profile):
+    return sqlite3.connect(path) if profile == "default" else connect(path, profile)
+
+
+def bench_inserts(path, profile, rows, commit_every, seed):
+    rng = random.Random(seed)
+    connection = open_connection(path, profile)
+    connection.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, category INTEGER, "
+                       "amount REAL, note TEXT)")
+    connection.commit()
+    start = time.perf_counter()
+    for first in range(0, rows, commit_every):
+        connection.executemany(
+            "INSERT INTO events (category, amount, note) VALUES (?, ?, ?)",
+            ((rng.randrange(50), rng.uniform(1, 1000), f"note {rng.random():.12f}")
+             for _ in range(min(commit_every, rows - first)))
+        )
+        connection.commit()
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return rows / elapsed
+
+
+def bench_scans(path, profile, scans):
+    connection = open_connection(path, profile)
+    rows = connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    # One untimed pass so every profile starts with the file in the OS cache
+    for query in SCAN_QUERIES:
+        connection.execute(query).fetchall()
+    start = time.perf_counter()
+    for _ in range(scans):
+        for query in SCAN_QUERIES:
+            connection.execute(query).fetchall()
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return rows * scans * len(SCAN_QUERIES) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--commit-every", type=int, default=100, help="rows per transaction")
+    parser.add_argument("--scans", type=int, default=5, help="passes over the scan queries")
+    parser.add_argument("--dir", help="directory for the database files (default: a temp dir)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    profiles = ["default"] + [name for name in SQLITE_PROFILES if not SQLITE_PROFILES[name].get("read_only")]
+    read_only = [name for name in SQLITE_PROFILES if SQLITE_PROFILES[name].get("read_only")]
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        print(f"\n{args.rows} rows, {args.commit_every} rows per commit, {args.scans} scan passes:")
+        print(f"  {'profile':12} {'inserts/sec':>14} {'scanned rows/sec':>18}")
+        paths = {}
+        for profile in profiles:
+            paths[profile] = os.path.join(directory, f"{profile}.db")
+            insert_rate = bench_inserts(paths[profile], profile, args.rows, args.commit_every, args.seed)
+            scan_rate = bench_scans(paths[profile], profile, args.scans)
+            print(f"  {profile:12} {insert_rate:14,.0f} {scan_rate:18,.0f}")
+        for profile in read_only:
+            scan_rate = bench_scans(paths["bulk-load"], profile, args.scans)
+            print(f"  {profile:12} {'(read-only)':>14} {scan_rate:18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
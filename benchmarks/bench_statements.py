@@ -0,0 +1,74 @@
+"""Per-call latency of OnlineStore hot paths with and without prepared statements.
+
+Times add_order, add_order_item and view_order_details against a store
+filled by benchmarks.store_data, alternating rounds with the statement
+registry enabled and disabled so both modes see the same data and cache
+state, and prints p50/p95 for each plus the p50 improvement.
+
+Usage:
+  python -m benchmarks.bench_statements --orders 20000 --iterations 2000
+  python -m benchmarks.bench_statements --mysql --iterations 5000
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from benchmarks.bench_store import summarize, table_sizes
+from benchmarks.store_data import DEFAULT_VOLUMES, add_backend_arguments, generate, open_store
+
+
+def run_benchmarks(store, iterations, rounds, seed):
+    rng = random.Random(seed)
+    max_id = {table: max_id or 1 for table, (_, max_id) in table_sizes(store).items()}
+
+    cases = [
+        ("add_order", lambda: store.add_order(
+            rng.randint(1, max_id["customers"]), rng.randint(1, max_id["salespeople"]), "2024-06-01")),
+        ("add_order_item", lambda: store.add_order_item(
+            rng.randint(1, max_id["orders"]), rng.randint(1, max_id["products"]), rng.randint(1, 5))),
+        ("view_order_details", lambda: store.view_order_details(rng.randint(1, max_id["orders"]))),
+    ]
+
+    samples = {(name, mode): [] for name, _ in cases for mode in ("unprepared", "prepared")}
+    per_round = max(1, iterations // rounds)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(rounds):
+            for mode in ("unprepared", "prepared"):
+                store.statements.enabled = mode == "prepared"
+                for name, call in cases:
+                    for _ in range(per_round):
+                        start = time.perf_counter()
+                        call()
+                        samples[name, mode].append(time.perf_counter() - start)
+    store.statements.enabled = True
+    return {key: summarize(values) for key, values in samples.items()}, [name for name, _ in cases]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_backend_arguments(parser)
+    for name, default in DEFAULT_VOLUMES.items():
+        parser.add_argument(f"--{name}", type=int, default=default, help="volume when generating data")
+    parser.add_argument("--iterations", type=int, default=2000, help="calls per path and mode")
+    parser.add_argument("--rounds", type=int, default=10, help="alternations between the two modes")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    store, created = open_store(args, cache_size=0)
+    if created:
+        generate(store, args.customers, args.products, args.salespeople, args.orders, seed=args.seed)
+
+    print(f"\nBenchmarking prepared statements on {store.backend.name}:")
+    results, names = run_benchmarks(store, args.iterations, args.rounds, args.seed)
+    for name in names:
+        before, after = results[name, "unprepared"], results[name, "prepared"]
+        change = (before["p50_ms"] - after["p50_ms"]) / before["p50_ms"] * 100
+        print(f"  {name:20} unprepared p50 {before['p50_ms']:7.3f} ms  p95 {before['p95_ms']:7.3f} ms   "
+              f"prepared p50 {after['p50_ms']:7.3f} ms  p95 {after['p95_ms']:7.3f} ms   ({change:+.1f}%)")
+    print(f"  registry: {store.statements.stats()}")
+
+
+if __name__ == "__main__":
+    main()
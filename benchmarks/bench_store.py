@@ -0,0 +1,153 @@
+"""Latency benchmark for the OnlineStore order reports.
+
+Times view_orders, view_order_details and the list_orders_by_* reports
+against a store filled by benchmarks.store_data, reports p50/p95/p99 per
+method, writes the results as JSON and optionally compares them with a
+saved baseline (exit status 1 on a regression).
+
+Usage:
+  python -m benchmarks.bench_store --orders 100000 --output results.json
+  python -m benchmarks.bench_store --sqlite store.db --baseline results.json
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+from benchmarks.store_data import DEFAULT_VOLUMES, add_backend_arguments, generate, open_store
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "calls": len(samples),
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def table_sizes(store):
+    sizes = {}
+    with store.transaction() as cursor:
+        for table in ("customers", "products", "salespeople", "orders", "order_items"):
+            cursor.execute(f"SELECT COUNT(*), MAX(id) FROM {table}")
+            sizes[table] = cursor.fetchone()
+    return sizes
+
+
+def run_benchmarks(store, iterations, full_scan_iterations, skew, seed):
+    """Call each report repeatedly with skewed ids and return latency summaries"""
+    rng = random.Random(seed)
+    sizes = table_sizes(store)
+    max_id = {table: max_id or 1 for table, (_, max_id) in sizes.items()}
+    
+    def skewed(table):
+        return int(max_id[table] * rng.random() ** skew) + 1
+    
+    cases = [
+        ("view_orders", full_scan_iterations, lambda: store.view_orders()),
+        ("view_order_details", iterations, lambda: store.view_order_details(rng.randint(1, max_id["orders"]))),
+        ("list_orders_by_customer", iterations, lambda: store.list_orders_by_customer(skewed("customers"))),
+        ("list_orders_by_salesperson", iterations,
+         lambda: store.list_orders_by_salesperson(rng.randint(1, max_id["salespeople"]))),
+        ("list_orders_by_product", iterations, lambda: store.list_orders_by_product(skewed("products"))),
+    ]
+    
+    results = {}
+    with open(os.devnull, "w") as devnull:
+        for name, count, call in cases:
+            samples = []
+            for _ in range(count):
+                with contextlib.redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    call()
+                    samples.append(time.perf_counter() - start)
+            results[name] = summarize(samples)
+            print(f"  {name:28} p50 {results[name]['p50_ms']:9.2f} ms  "
+                  f"p95 {results[name]['p95_ms']:9.2f} ms  p99 {results[name]['p99_ms']:9.2f} ms")
+    return results, {table: count for table, (count, _) in sizes.items()}
+
+
+def compare(results, baseline, threshold):
+    """Print per-method changes against a baseline; return True if any p95 regressed"""
+    regressed = False
+    print(f"\nComparison with baseline ({baseline['meta'].get('timestamp', 'unknown date')}):")
+    for name, current in results.items():
+        previous = baseline["results"].get(name)
+        if not previous:
+            print(f"  {name:28} (not in baseline)")
+            continue
+        changes = {key: (current[key] - previous[key]) / previous[key] * 100 if previous[key] else 0.0
+                   for key in ("p50_ms", "p95_ms", "p99_ms")}
+        flag = ""
+        if changes["p95_ms"] > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"  {name:28} p50 {changes['p50_ms']:+7.1f}%  p95 {changes['p95_ms']:+7.1f}%  "
+              f"p99 {changes['p99_ms']:+7.1f}%{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_backend_arguments(parser)
+    for name, default in DEFAULT_VOLUMES.items():
+        parser.add_argument(f"--{name}", type=int, default=default, help="volume when generating data")
+    parser.add_argument("--iterations", type=int, default=50, help="calls per report")
+    parser.add_argument("--full-scan-iterations", type=int, default=5, help="calls to view_orders")
+    parser.add_argument("--skew", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results saved by a previous run")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p95 slowdown in percent")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="report cache entries (default 0 times the database, not the cache)")
+    args = parser.parse_args()
+    
+    store, created = open_store(args, cache_size=args.cache_size)
+    if created:
+        generate(store, args.customers, args.products, args.salespeople, args.orders,
+                 skew=args.skew, seed=args.seed)
+    
+    print(f"\nBenchmarking {store.backend.name} store:")
+    results, sizes = run_benchmarks(store, args.iterations, args.full_scan_iterations, args.skew, args.seed)
+    if args.cache_size:
+        store.print_cache_stats()
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "backend": store.backend.name,
+            "rows": sizes,
+            "iterations": args.iterations,
+            "cache_size": args.cache_size,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
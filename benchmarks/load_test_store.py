@@ -0,0 +1,142 @@
+"""Load-test the store service with concurrent keep-alive HTTP clients.
+
+Without --url a service is started in this process on a free port, over
+a synthetic SQLite store (benchmarks.store_data) that is generated first
+when the database is new. Each client thread sends a weighted mix of
+reads (single rows, order details, report pages, product search) and a
+share of POST /orders writes for --seconds, then the client-side
+throughput and latency percentiles are printed next to the server's own
+GET /metrics figures.
+
+Usage:
+  python -m benchmarks.load_test_store --sqlite store.db --orders 100000 --clients 16
+  python -m benchmarks.load_test_store --url http://127.0.0.1:8080 --clients 32
+"""
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.store_data import DEFAULT_VOLUMES, add_backend_arguments, generate, open_store
+from store_service import SERVICE_WORKERS, PooledHTTPServer, StoreService
+
+
+def request_mix(rng, volumes, write_share):
+    """Pick the next (method, path, body) for a client"""
+    if rng.random() < write_share:
+        items = [[rng.randint(1, volumes["products"]), rng.randint(1, 5)] for _ in range(rng.randint(1, 4))]
+        body = {"customer_id": rng.randint(1, volumes["customers"]),
+                "salesperson_id": rng.randint(1, volumes["salespeople"]),
+                "order_date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", "items": items}
+        return "POST", "/orders", body
+    roll = rng.random()
+    if roll < 0.30:
+        return "GET", f"/orders/{rng.randint(1, volumes['orders'])}", None
+    if roll < 0.50:
+        return "GET", f"/customers/{rng.randint(1, volumes['customers'])}/orders?limit=20", None
+    if roll < 0.60:
+        return "GET", f"/products/{rng.randint(1, volumes['products'])}/orders?limit=20", None
+    if roll < 0.80:
+        return "GET", f"/products/{rng.randint(1, volumes['products'])}", None
+    if roll < 0.90:
+        return "GET", f"/customers?after={rng.randint(0, volumes['customers'])}&limit=20", None
+    return "GET", f"/products/search?q=product+{rng.randint(1, 99)}&limit=10", None
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def client(host, port, deadline, seed, volumes, write_share, results):
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    latencies, errors = [], 0
+    while time.perf_counter() < deadline:
+        method, path, body = request_mix(rng, volumes, write_share)
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if data else {}
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, body=data, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+    results.append((latencies, errors))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="a running service (default: start one in this process)")
+    add_backend_arguments(parser)
+    for name, default in DEFAULT_VOLUMES.items():
+        parser.add_argument(f"--{name}", type=int, default=default,
+                            help=f"{name} in the store (generated for a new database)")
+    parser.add_argument("--clients", type=int, default=16, help="concurrent client threads")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--write-share", type=float, default=0.05, help="fraction of requests that create orders")
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="service threads (in-process only)")
+    parser.add_argument("--pool-size", type=int, default=8, help="pooled connections (in-process only)")
+    args = parser.parse_args()
+    volumes = {name: getattr(args, name) for name in DEFAULT_VOLUMES}
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        store, created = open_store(args, pool_size=args.pool_size)
+        if created:
+            generate(store, **volumes)
+        server = PooledHTTPServer(("127.0.0.1", 0), StoreService(store), max(args.workers, args.clients))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+
+    results = []
+    deadline = time.perf_counter() + args.seconds
+    threads = [threading.Thread(target=client, args=(host, port, deadline, seed, volumes,
+                                                     args.write_share, results))
+               for seed in range(args.clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for client_latencies, _ in results for latency in client_latencies)
+    errors = sum(client_errors for _, client_errors in results)
+    print(f"\n{args.clients} clients for {elapsed:.1f}s: {len(latencies)} requests "
+          f"({len(latencies) / elapsed:,.0f} req/sec), {errors} errors")
+    if latencies:
+        print(f"Client latency ms: p50 {percentile(latencies, 0.5):.2f}, p95 {percentile(latencies, 0.95):.2f}, "
+              f"p99 {percentile(latencies, 0.99):.2f}, max {latencies[-1]:.2f}")
+
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    connection.request("GET", "/metrics")
+    metrics = json.loads(connection.getresponse().read())
+    connection.close()
+    print("\nServer latency by route:")
+    print(f"  {'route':52} {'count':>7} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for route, entry in sorted(metrics["routes"].items(), key=lambda item: -item[1]["count"]):
+        print(f"  {route:52} {entry['count']:7} {entry['errors']:4} {entry['p50_ms']:8.2f} "
+              f"{entry['p95_ms']:8.2f} {entry['p99_ms']:8.2f} {entry['max_ms']:8.2f}")
+    cache = metrics["report_cache"]
+    print(f"Report cache hit rate: {cache['hit_rate']:.1%}")
+
+    if server:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Seeded synthetic data for the online_stores schema.
+
+Customers and products are picked with a power-law skew so a few hot
+ids receive most orders, like a real store. Rows are generated lazily
+and written in executemany batches, so volumes are bounded by disk
+rather than memory.
+
+Usage: python -m benchmarks.store_data --sqlite store.db --orders 1000000
+"""
+import argparse
+import datetime
+import random
+import time
+
+from online_stores import DB_CONFIG, OnlineStore
+from store_backends import MySQLBackend, SQLiteBackend
+
+DEFAULT_VOLUMES = {
+    "customers": 10000,
+    "products": 1000,
+    "salespeople": 50,
+    "orders": 100000,
+}
+
+
+def skewed(rng, n, skew):
+    """Pick an id in 1..n; skew > 1 concentrates picks on the low ids"""
+    return int(n * rng.random() ** skew) + 1
+
+
+def _batched_insert(cursor, query, rows, batch_size):
+    batch = []
+    count = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            cursor.executemany(query, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        cursor.executemany(query, batch)
+        count += len(batch)
+    return count
+
+
+def generate(store, customers, products, salespeople, orders, max_items=5,
+             skew=3.0, seed=42, start_date="2015-01-01", days=3650, batch_size=10000):
+    """Fill a store whose tables are empty with synthetic rows
+
+    Explicit ids 1..N are used so orders can reference customers,
+    products and salespeople without reading them back.
+
+    Each table is written in its own transaction; order lines are
+    committed together with their orders, batch_size orders at a time,
+    and order_totals is rebuilt at the end.
+    """
+    rng = random.Random(seed)
+    start = datetime.date.fromisoformat(start_date)
+    started = time.perf_counter()
+    
+    with store.transaction() as cursor:
+        _batched_insert(cursor, "INSERT INTO customers (id, name, email, address) VALUES (%s, %s, %s, %s)",
+                        ((i, f"Customer {i}", f"customer{i}@example.com", f"{i} Example Street")
+                         for i in range(1, customers + 1)), batch_size)
+    with store.transaction() as cursor:
+        _batched_insert(cursor, "INSERT INTO products (id, name, price, description) VALUES (%s, %s, %s, %s)",
+                        ((i, f"Product {i}", round(rng.uniform(1, 2000), 2), f"Synthetic product number {i}")
+                         for i in range(1, products + 1)), batch_size)
+    with store.transaction() as cursor:
+        _batched_insert(cursor, "INSERT INTO salespeople (id, first_name, last_name, employment_type) "
+                                "VALUES (%s, %s, %s, %s)",
+                        ((i, f"Sales{i}", f"Person{i}", "payroll" if i % 3 else "on_call")
+                         for i in range(1, salespeople + 1)), batch_size)
+    
+    item_count = 0
+    for first in range(1, orders + 1, batch_size):
+        last = min(first + batch_size, orders + 1)
+        headers = []
+        lines = []
+        for order_id in range(first, last):
+            order_date = start + datetime.timedelta(days=rng.randrange(days))
+            headers.append((order_id, skewed(rng, customers, skew), rng.randint(1, salespeople), order_date))
+            for _ in range(skewed(rng, max_items, 1.5)):
+                lines.append((order_id, skewed(rng, products, skew), rng.randint(1, 5)))
+        with store.transaction() as cursor:
+            cursor.executemany("INSERT INTO orders (id, customer_id, salesperson_id, order_date) "
+                               "VALUES (%s, %s, %s, %s)", headers)
+            cursor.executemany("INSERT INTO order_items (order_id, product_id, quantity) "
+                               "VALUES (%s, %s, %s)", lines)
+        item_count += len(lines)
+    
+    store.rebuild_order_totals()
+    elapsed = time.perf_counter() - started
+    print(f"Generated {customers} customers, {products} products, {salespeople} salespeople, "
+          f"{orders} orders and {item_count} order items in {elapsed:.1f}s")
+    return item_count
+
+
+def add_backend_arguments(parser):
+    parser.add_argument("--sqlite", metavar="DB_FILE", help="SQLite database file (default: in-memory)")
+    parser.add_argument("--mysql", action="store_true", help="use the MySQL server from DB_CONFIG")
+    parser.add_argument("--schema", default="online_stores.sql", help="schema for a new SQLite database")
+
+
+def open_store(args, **store_options):
+    """Open an OnlineStore for the backend chosen on the command line
+
+    Returns the store and whether its database was created empty.
+    """
+    if args.mysql:
+        return OnlineStore(MySQLBackend(**DB_CONFIG), **store_options), False
+    backend = SQLiteBackend(args.sqlite or ":memory:")
+    created = not backend.has_schema()
+    if created:
+        backend.load_schema(args.schema)
+        # Start from empty tables rather than the schema's sample rows
+        connection = backend.connect()
+        for table in ("order_totals", "order_items", "orders", "salespeople", "customers", "products"):
+            connection.execute(f"DELETE FROM {table}")
+        connection.commit()
+        connection.close()
+    return OnlineStore(backend, **store_options), created
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_backend_arguments(parser)
+    for name, default in DEFAULT_VOLUMES.items():
+        parser.add_argument(f"--{name}", type=int, default=default)
+    parser.add_argument("--max-items", type=int, default=5, help="most lines per order")
+    parser.add_argument("--skew", type=float, default=3.0, help="popularity skew for customers/products")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    store, _ = open_store(args)
+    generate(store, args.customers, args.products, args.salespeople, args.orders,
+             max_items=args.max_items, skew=args.skew, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection frees up within the checkout timeout"""
+
+
+class ConnectionPool:
+    """Thread-safe pool of DB-API connections.
+
+    Connections are opened lazily by calling ``connect()`` up to ``size``
+    at a time. ``check(conn)`` is used as a health check on checkout; a
+    connection that fails it is closed and replaced with a fresh one.
+    ``on_discard(conn)`` is called just before a connection is closed.
+    """
+
+    def __init__(self, connect, size=5, timeout=30.0, check=None, on_discard=None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.timeout = timeout
+        self._connect = connect
+        self._check = check
+        self._on_discard = on_discard
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def acquire(self):
+        """Check out a healthy connection, waiting up to ``timeout`` seconds"""
+        if self._closed:
+            raise PoolTimeout("Connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"No connection available within {self.timeout}s")
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if self._check and not self._is_healthy(conn):
+                self._discard(conn)
+                return self._connect()
+            return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool, or close it if ``discard`` is set"""
+        try:
+            if discard or self._closed:
+                self._discard(conn)
+            else:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block"""
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except BaseException:
+            discard = self._check is not None and not self._is_healthy(conn)
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def close(self):
+        """Close every idle connection; busy ones are closed on release"""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _is_healthy(self, conn):
+        try:
+            return self._check(conn)
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        try:
+            if self._on_discard:
+                self._on_discard(conn)
+            conn.close()
+        except Exception:
+            pass
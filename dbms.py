@@ -0,0 +1,78 @@
+"""One command for the SQLite editor, the movie database and the online store.
+
+Each subcommand imports only the module that implements it, so drivers
+and renderers (mysql.connector, NumPy, http.server) load when a command
+first needs them rather than on every start. Everything after the
+subcommand is handed to that tool's own argument parser; use
+"dbms.py COMMAND -h" for its options.
+
+--startup-time prints to stderr how long the command took to start (from
+this module's first line until the tool is called, not counting the
+interpreter's own start-up) and which optional modules were loaded by
+then. For a per-module breakdown run it under python -X importtime.
+
+Usage:
+  python dbms.py script operations.jsonl --db shop.db
+  python dbms.py movies --db leffat2.db
+  python dbms.py store --sqlite shop.db
+  python dbms.py --startup-time serve --sqlite shop.db --port 8080
+"""
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import importlib
+import sys
+
+# name: (module, function, help)
+COMMANDS = {
+    "editor": ("Database", "main", "interactive SQLite database editor"),
+    "script": ("Database", "run_script", "run a JSON/JSONL operations script against a SQLite database"),
+    "movies": ("leffat", "main", "movie database menu"),
+    "store": ("online_stores", "main", "online store menu"),
+    "serve": ("store_service", "main", "serve the online store as a local JSON HTTP service"),
+    "migrate": ("migrate_store", "main", "migrate an online_store.sql database to online_stores.sql"),
+    "archive": ("archive_orders", "main", "move old orders into the archive tables"),
+}
+
+# Reported by --startup-time when a command has already imported them
+OPTIONAL_MODULES = ("tabulate", "mysql.connector", "numpy", "http.server", "table_renderer")
+
+
+def load_command(name):
+    """Import the module behind a subcommand and return its entry point"""
+    module_name, function, _ = COMMANDS[name]
+    return getattr(importlib.import_module(module_name), function)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="dbms.py", description=__doc__.splitlines()[0],
+        epilog="commands:\n" + "\n".join(f"  {name:9} {entry[2]}" for name, entry in COMMANDS.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print the startup time and loaded optional modules to stderr")
+    parser.add_argument("command", choices=COMMANDS, metavar="COMMAND")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="options for the command")
+    args = parser.parse_args(argv)
+    if args.command == "editor" and args.args:
+        parser.error("editor takes no options")
+
+    entry_point = load_command(args.command)
+    if args.startup_time:
+        loaded = [name for name in OPTIONAL_MODULES if name in sys.modules]
+        print(f"Startup: {(time.perf_counter() - _STARTED) * 1000:.1f} ms, "
+              f"{len(sys.modules)} modules loaded (optional: {', '.join(loaded) or 'none'})",
+              file=sys.stderr)
+
+    if args.command == "editor":
+        return entry_point()
+    # Tools print their own usage with the subcommand in place of the script name
+    sys.argv[0] = f"dbms.py {args.command}"
+    return entry_point(args.args)
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() is False else 0)
@@ -0,0 +1,98 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+from decimal import Decimal
+from itertools import islice
+
+EXPORT_CHUNK_SIZE = 10000
+
+
+def export_format(path):
+    """Return "csv" or "jsonl" from a file name, ignoring a trailing .gz"""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Unsupported export file type: {path} (use .csv or .jsonl, optionally .gz)")
+
+
+def iter_rows(cursor, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield rows from an executed cursor, pulling chunk_size rows at a time"""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def json_value(value):
+    """json default= hook for DECIMAL, date/time and BLOB values"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    return str(value)
+
+
+def _csv_formatter(headers):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def format_rows(rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    return format_rows([headers]), format_rows
+
+
+def _jsonl_formatter(headers):
+    # One encoder for the whole export; json.dumps(default=...) builds one per call
+    encode = json.JSONEncoder(default=json_value).encode
+
+    def format_rows(rows):
+        return "".join(encode(dict(zip(headers, row))) + "\n" for row in rows)
+
+    return "", format_rows
+
+
+def write_export(rows, headers, path, compress=None, chunk_size=EXPORT_CHUNK_SIZE, progress=None):
+    """Stream rows to a CSV or JSONL file and return the number written
+
+    Rows are consumed lazily and written and flushed chunk_size at a time,
+    so memory stays flat however many rows the iterator yields. The file is
+    gzipped when compress is true or, by default, when path ends in .gz.
+    progress, if given, is called with the running row count after each chunk.
+    """
+    fmt = export_format(path)
+    if compress is None:
+        compress = path.lower().endswith(".gz")
+    header, format_rows = (_csv_formatter if fmt == "csv" else _jsonl_formatter)(list(headers))
+
+    if compress:
+        f = gzip.open(path, "wt", compresslevel=6, encoding="utf-8", newline="")
+    else:
+        f = open(path, "w", encoding="utf-8", newline="")
+
+    count = 0
+    rows = iter(rows)
+    with f:
+        f.write(header)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            f.write(format_rows(chunk))
+            f.flush()
+            count += len(chunk)
+            if progress:
+                progress(count)
+    return count
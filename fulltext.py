@@ -0,0 +1,64 @@
+import re
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def search_words(text):
+    """Words of a free-text search, lower-cased, punctuation dropped"""
+    return [word.lower() for word in _WORD.findall(text or "")]
+
+
+def fts5_query(text):
+    """FTS5 MATCH expression requiring every word of text as a prefix
+
+    Each word is quoted, so user input can never be parsed as FTS5 query
+    syntax. Returns None when text contains no words.
+    """
+    words = search_words(text)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+def mysql_boolean_query(text):
+    """MySQL BOOLEAN MODE expression requiring every word of text as a prefix"""
+    words = search_words(text)
+    return " ".join(f"+{word}*" for word in words) or None
+
+
+def fts5_schema(table, columns, key="id"):
+    """Statements for an external-content FTS5 index on table(columns)
+
+    The index is named {table}_fts and kept in sync by insert, delete and
+    update triggers on table; key is the table's integer primary key.
+    """
+    index = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{col}" for col in columns)
+    old_values = ", ".join(f"old.{col}" for col in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {index} USING fts5({cols}, content='{table}', content_rowid='{key}', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER {index}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {index} (rowid, {cols}) VALUES (new.{key}, {new_values}); END",
+        f"CREATE TRIGGER {index}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {index} ({index}, rowid, {cols}) VALUES ('delete', old.{key}, {old_values}); END",
+        f"CREATE TRIGGER {index}_update AFTER UPDATE OF {key}, {cols} ON {table} BEGIN "
+        f"INSERT INTO {index} ({index}, rowid, {cols}) VALUES ('delete', old.{key}, {old_values}); "
+        f"INSERT INTO {index} (rowid, {cols}) VALUES (new.{key}, {new_values}); END",
+        # Index the rows that existed before the triggers
+        f"INSERT INTO {index} ({index}) VALUES ('rebuild')",
+    ]
+
+
+def ensure_fts5(cursor, table, columns, key="id"):
+    """Create the FTS5 index and triggers for table unless they exist
+
+    Works with any cursor on a SQLite connection (table names are trusted
+    identifiers, so no placeholders are needed); the caller commits.
+    Returns True if the index was created.
+    """
+    cursor.execute(f"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '{table}_fts'")
+    if cursor.fetchall():
+        return False
+    for statement in fts5_schema(table, columns, key):
+        cursor.execute(statement)
+    return True
@@ -1,49 +1,78 @@
+import argparse
 import sqlite3
-from tabulate import tabulate
+
+from fulltext import ensure_fts5, fts5_query, search_words
+from sqlite_profiles import DEFAULT_PROFILE, SQLITE_PROFILES, connect as connect_sqlite
+from table_renderer import render_grid
+
+# LEFT JOINs keep movies whose director/actor row is missing, labelled the
+# same way the old per-row lookups did
+MOVIES_WITH_NAMES_QUERY = """
+SELECT m.id, m.name, m.year_of_release,
+       COALESCE(d.name, 'Unknown Director (ID:' || IFNULL(m.director_id, 'None') || ')'),
+       COALESCE(a.name, 'Unknown Actor (ID:' || IFNULL(m.actor_id, 'None') || ')')
+FROM movies m
+LEFT JOIN directors d ON d.id = m.director_id
+LEFT JOIN actors a ON a.id = m.actor_id
+ORDER BY m.id
+"""
+
+# Searchable tables, in the order their matches are listed, and the year
+# shown with each match; build_search_indexes gives each one an FTS5 index
+# on name named {table}_fts
+SEARCH_TABLES = {
+    "movies": "year_of_release",
+    "actors": "year_of_birth",
+    "directors": "year_of_birth",
+}
 
 class MovieDatabase:
-    def __init__(self, db_file='leffat2.db'):
-        self.conn = sqlite3.connect(db_file)
+    def __init__(self, db_file='leffat2.db', profile=DEFAULT_PROFILE, wal=False):
+        # Connection pragmas come from a named profile in sqlite_profiles; the
+        # file's journal mode is only switched when wal is asked for
+        self.conn = connect_sqlite(db_file, profile, set_journal=wal)
         self.cur = self.conn.cursor()
+        self.fts = self._has_search_indexes()
+
+    def _has_search_indexes(self):
+        """True if build_search_indexes has already been run on this file"""
+        self.cur.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN (%s)"
+            % ", ".join("?" * len(SEARCH_TABLES)),
+            [f"{table}_fts" for table in SEARCH_TABLES]
+        )
+        return self.cur.fetchone()[0] == len(SEARCH_TABLES)
+
+    def build_search_indexes(self):
+        """Create the FTS5 name indexes search uses instead of LIKE scans
+
+        Adds a {table}_fts table and its sync triggers to the database file
+        for every table in SEARCH_TABLES.
+        """
+        try:
+            for table in SEARCH_TABLES:
+                ensure_fts5(self.cur, table, ["name"])
+            self.conn.commit()
+            self.fts = True
+            print("Search indexes ready.")
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"Error building search indexes: {e}")
 
     def display_table(self, table_name):
         try:
-            # Get table data
-            self.cur.execute(f"SELECT * FROM {table_name}")
-            data = self.cur.fetchall()
-            
-            if not data:
-                print(f"\n{table_name.capitalize()} table is empty")
-                return
-                
-            # Get column names
-            self.cur.execute(f"PRAGMA table_info({table_name})")
-            columns = self.cur.fetchall()
-            headers = [column[1] for column in columns]
-            
-            # Special handling for movies table
+            # Movies are shown with director/actor names resolved in one joined query
             if table_name == "movies":
-                data_with_names = []
-                for row in data:
-                    movie_id, name, year, director_id, actor_id = row
-                    
-                    # Get director name with error handling
-                    self.cur.execute("SELECT name FROM directors WHERE id=?", (director_id,))
-                    director_result = self.cur.fetchone()
-                    director = director_result[0] if director_result else f"Unknown Director (ID:{director_id})"
-                    
-                    # Get actor name with error handling
-                    self.cur.execute("SELECT name FROM actors WHERE id=?", (actor_id,))
-                    actor_result = self.cur.fetchone()
-                    actor = actor_result[0] if actor_result else f"Unknown Actor (ID:{actor_id})"
-                    
-                    data_with_names.append((movie_id, name, year, director, actor))
-                
-                data = data_with_names
+                self.cur.execute(MOVIES_WITH_NAMES_QUERY)
                 headers = ["ID", "Movie Title", "Year", "Director", "Actor"]
+            else:
+                self.cur.execute(f"SELECT * FROM {table_name}")
+                headers = [column[0] for column in self.cur.description]
             
-            print(f"\n{table_name.capitalize()} Table:")
-            print(tabulate(data, headers=headers, tablefmt="grid"))
+            # Rows are printed as they are fetched instead of all at once
+            shown = render_grid(self.cur, headers, title=f"\n{table_name.capitalize()} Table:")
+            if not shown:
+                print(f"\n{table_name.capitalize()} table is empty")
             
         except sqlite3.Error as e:
             print(f"Error displaying {table_name}: {e}")
@@ -86,12 +115,12 @@ class MovieDatabase:
         print("\nAvailable Directors:")
         self.cur.execute("SELECT id, name FROM directors")
         directors = self.cur.fetchall()
-        print(tabulate(directors, headers=["ID", "Name"], tablefmt="grid"))
+        render_grid(directors, ["ID", "Name"])
         
         print("\nAvailable Actors:")
         self.cur.execute("SELECT id, name FROM actors")
         actors = self.cur.fetchall()
-        print(tabulate(actors, headers=["ID", "Name"], tablefmt="grid"))
+        render_grid(actors, ["ID", "Name"])
         
         # Get movie details
         title = input("\nMovie Title: ")
@@ -122,19 +151,78 @@ class MovieDatabase:
         except sqlite3.Error as e:
             print(f"Error adding movie: {e}")
 
+    def search(self, query, limit=20):
+        """Search movie, actor and director names
+
+        Every word of query must match the start of a word in the name.
+        Returns up to limit (kind, id, name, year) rows, grouped by table in
+        SEARCH_TABLES order and best match first within each table.
+        """
+        words = search_words(query)
+        if not words:
+            return []
+        if self.fts:
+            # bm25() is lower for better matches, but its scale depends on each
+            # index's own statistics, so scores are only compared within a table
+            parts = [
+                f"SELECT '{table[:-1]}', t.id, t.name, t.{year}, {rank} AS rank, "
+                f"bm25({table}_fts) AS score "
+                f"FROM {table}_fts JOIN {table} t ON t.id = {table}_fts.rowid "
+                f"WHERE {table}_fts MATCH :term"
+                for rank, (table, year) in enumerate(SEARCH_TABLES.items())
+            ]
+            params = {"term": fts5_query(query), "limit": limit}
+        else:
+            conditions = " AND ".join(f"(' ' || lower(t.name)) LIKE :w{i}" for i in range(len(words)))
+            parts = [
+                f"SELECT '{table[:-1]}', t.id, t.name, t.{year}, {rank} AS rank, 0 AS score "
+                f"FROM {table} t WHERE {conditions}"
+                for rank, (table, year) in enumerate(SEARCH_TABLES.items())
+            ]
+            params = {f"w{i}": f"% {word}%" for i, word in enumerate(words)}
+            params["limit"] = limit
+        self.cur.execute(" UNION ALL ".join(parts) + " ORDER BY rank, score, 3 LIMIT :limit", params)
+        return [row[:4] for row in self.cur.fetchall()]
+
+    def display_search(self, query):
+        try:
+            results = self.search(query)
+        except sqlite3.Error as e:
+            print(f"Error searching: {e}")
+            return
+        if not results:
+            print(f"\nNo matches for '{query}'")
+            return
+        print(f"\nMatches for '{query}':")
+        render_grid(results, ["Type", "ID", "Name", "Year"])
+
     def close(self):
         self.conn.close()
 
-def main():
-    db = MovieDatabase()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Movie database management")
+    parser.add_argument("--db", default="leffat2.db", help="movie database file")
+    parser.add_argument("--profile", choices=SQLITE_PROFILES, default=DEFAULT_PROFILE,
+                        help="SQLite connection profile (analytics opens the file read-only)")
+    parser.add_argument("--wal", action="store_true",
+                        help="let the profile switch the file to WAL (stored in the file); "
+                             "by default its journal mode is left as it is")
+    parser.add_argument("--build-search-index", action="store_true",
+                        help="add the FTS5 name indexes to the file before starting")
+    args = parser.parse_args(argv)
+    db = MovieDatabase(args.db, args.profile, args.wal)
+    if args.build_search_index:
+        db.build_search_indexes()
     
     while True:
         print("\nMovie Database Management System")
         print("1. View Tables")
         print("2. Add Data")
-        print("3. Exit")
+        print("3. Search")
+        print("4. Build Search Index")
+        print("5. Exit")
         
-        choice = input("Select an option (1-3): ")
+        choice = input("Select an option (1-5): ")
         
         if choice == "1":
             print("\nView Tables:")
@@ -169,6 +257,12 @@ def main():
                 print("Invalid choice.")
                 
         elif choice == "3":
+            db.display_search(input("\nSearch for: "))
+                
+        elif choice == "4":
+            db.build_search_indexes()
+            
+        elif choice == "5":
             break
             
         else:
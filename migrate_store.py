@@ -0,0 +1,278 @@
+"""Migrate an online_store.sql database into the online_stores.sql schema.
+
+The old layout keeps one row per product line in orders(customer_id,
+product_id, quantity, order_date). Lines of the same customer on the same
+day become one new order header with an order_items row per old line.
+Customers and products are copied with their ids, so the target must not
+hold orders of its own: a new SQLite target is created without the
+schema's sample data, and a first run into a store that already has
+orders is refused.
+
+Old orders are read in primary-key chunks. Each chunk is written in one
+target transaction, together with a checkpoint row in migration_checkpoints,
+so an interrupted or repeated run continues after the last committed chunk.
+Running it again later migrates only the rows added since, which lets the
+old application keep running until the cut-over.
+
+A MySQL target defaults to DB_CONFIG's database, the one OnlineStore
+opens. The old application used that same name, so a MySQL source has to
+be a copy of it under another name.
+
+Usage:
+  python migrate_store.py --source-sqlite old.db --sqlite new.db
+  python migrate_store.py --source-mysql-db online_store_old
+"""
+import argparse
+import sys
+import time
+
+from online_stores import DB_CONFIG, OnlineStore
+from store_backends import MySQLBackend, SQLiteBackend, StoreError
+
+MIGRATION_NAME = "online_store_orders"
+MIGRATION_CHUNK_SIZE = 5000
+# (customer_id, order_date) pairs per legacy_order_groups lookup
+GROUP_LOOKUP_SIZE = 500
+
+MIGRATION_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS migration_checkpoints (
+        name VARCHAR(64) PRIMARY KEY,
+        last_id INT NOT NULL,
+        rows_migrated BIGINT NOT NULL,
+        orders_created BIGINT NOT NULL,
+        salesperson_id INT
+    )
+    """,
+    # Which new order holds the lines of a (customer, day) group, so lines
+    # from later chunks or later runs join the same order
+    """
+    CREATE TABLE IF NOT EXISTS legacy_order_groups (
+        customer_id INT NOT NULL,
+        order_date DATE NOT NULL,
+        order_id INT NOT NULL,
+        PRIMARY KEY (customer_id, order_date)
+    )
+    """,
+]
+
+
+class StoreMigration:
+    """Chunked, resumable copy of the flat orders table into orders + order_items"""
+
+    def __init__(self, source, store, chunk_size=MIGRATION_CHUNK_SIZE, salesperson_id=None):
+        self.source = source
+        self.store = store
+        self.chunk_size = chunk_size
+        self.salesperson_id = salesperson_id
+        self._source_conn = None
+
+    def run(self):
+        """Migrate everything past the checkpoint
+
+        Returns the number of old rows migrated by this run, or None if it
+        stopped on an error (committed chunks are kept).
+        """
+        try:
+            self._source_conn = self.source.connect()
+            if not self._prepare_target():
+                return None
+            self._copy_table("customers", "id, name, email, address")
+            self._copy_table("products", "id, name, price, description")
+            return self._migrate_orders()
+        except (StoreError, self.source.Error) as e:
+            print(f"\nMigration stopped: {e}")
+            print("Run the migration again to resume from the last checkpoint.")
+            return None
+        finally:
+            if self._source_conn is not None:
+                self._source_conn.close()
+
+    def _prepare_target(self):
+        """Load the checkpoint; returns False if the target cannot be migrated into"""
+        with self.store.transaction("migration") as cursor:
+            for ddl in MIGRATION_TABLES:
+                cursor.execute(ddl)
+            cursor.execute("SELECT last_id, rows_migrated, orders_created, salesperson_id "
+                           "FROM migration_checkpoints WHERE name = %s", (MIGRATION_NAME,))
+            checkpoint = cursor.fetchone()
+            if checkpoint:
+                self.last_id, self.rows_migrated, self.orders_created, saved_salesperson = checkpoint
+                self.salesperson_id = self.salesperson_id or saved_salesperson
+                print(f"Resuming after old order {self.last_id} "
+                      f"({self.rows_migrated} rows, {self.orders_created} orders migrated so far)")
+            else:
+                # Orders already there would end up attached to the copied
+                # customers and products of the same ids
+                cursor.execute("SELECT COUNT(*) FROM orders")
+                if cursor.fetchone()[0]:
+                    print("The target store already has orders; migrate into a new store "
+                          "or one created without the schema's sample data.")
+                    return False
+                self.last_id, self.rows_migrated, self.orders_created = 0, 0, 0
+            if self.salesperson_id is None:
+                # The old layout has no salespeople; attach migrated orders to a
+                # placeholder so they still show up in the salesperson joins
+                cursor.execute("SELECT id FROM salespeople WHERE first_name = %s AND last_name = %s",
+                               ("Legacy", "Import"))
+                existing = cursor.fetchall()
+                if existing:
+                    self.salesperson_id = existing[0][0]
+                else:
+                    cursor.execute("INSERT INTO salespeople (first_name, last_name, employment_type) "
+                                   "VALUES (%s, %s, %s)", ("Legacy", "Import", "on_call"))
+                    self.salesperson_id = cursor.lastrowid
+                    print(f"Created placeholder salesperson {self.salesperson_id} for migrated orders")
+        return True
+
+    def _source_chunks(self, query, last_id=0):
+        """Yield source rows after last_id chunk by chunk, one short keyset query each"""
+        while True:
+            cursor = self.source.cursor(self._source_conn)
+            try:
+                cursor.execute(query, (last_id, self.chunk_size))
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+            # Do not hold a read snapshot open on the live source between chunks
+            self._source_conn.commit()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def _copy_table(self, table, columns):
+        """Upsert a reference table by id; the source wins on conflicts"""
+        names = [col.strip() for col in columns.split(",")]
+        placeholders = ", ".join(["%s"] * len(names))
+        insert = f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) " + \
+            self.store.backend.upsert(["id"], names[1:])
+        copied = 0
+        for rows in self._source_chunks(f"SELECT {columns} FROM {table} WHERE id > %s ORDER BY id LIMIT %s"):
+            with self.store.transaction("migration") as cursor:
+                repriced = self._repriced_products(cursor, rows) if table == "products" else []
+                cursor.executemany(insert, rows)
+                if repriced:
+                    # Orders already in the target are totalled at the old prices
+                    placeholders = ", ".join(["%s"] * len(repriced))
+                    cursor.execute(f"""
+                    UPDATE order_totals
+                    SET total_amount = (
+                        SELECT SUM(oi.quantity * p.price)
+                        FROM order_items oi
+                        JOIN products p ON oi.product_id = p.id
+                        WHERE oi.order_id = order_totals.order_id
+                    )
+                    WHERE order_id IN (SELECT order_id FROM order_items WHERE product_id IN ({placeholders}))
+                    """, repriced)
+            copied += len(rows)
+        print(f"Copied {copied} {table}")
+
+    def _repriced_products(self, cursor, rows):
+        """Ids of products in rows that exist in the target with a different price"""
+        placeholders = ", ".join(["%s"] * len(rows))
+        cursor.execute(f"SELECT id, price FROM products WHERE id IN ({placeholders})", [row[0] for row in rows])
+        current = dict(cursor.fetchall())
+        return [row[0] for row in rows if row[0] in current and float(current[row[0]]) != float(row[2])]
+
+    def _migrate_orders(self):
+        query = ("SELECT id, customer_id, product_id, quantity, order_date FROM orders "
+                 "WHERE id > %s ORDER BY id LIMIT %s")
+        start = time.perf_counter()
+        migrated = 0
+        for rows in self._source_chunks(query, self.last_id):
+            self._migrate_chunk(rows)
+            migrated += len(rows)
+            elapsed = time.perf_counter() - start
+            print(f"  ... old order {self.last_id}: {migrated} rows this run "
+                  f"({migrated / elapsed:,.0f} rows/sec)", end="\r")
+        elapsed = time.perf_counter() - start
+        rate = migrated / elapsed if elapsed else 0
+        print(f"\nMigrated {migrated} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec); "
+              f"{self.rows_migrated} rows into {self.orders_created} orders in total")
+        return migrated
+
+    def _migrate_chunk(self, rows):
+        """Write one chunk of old rows and the checkpoint in a single transaction"""
+        groups = {(row[1], str(row[4])): None for row in rows}
+        with self.store.transaction("migration") as cursor:
+            # Primary-key lookups of the groups earlier chunks already created
+            keys = list(groups)
+            for first in range(0, len(keys), GROUP_LOOKUP_SIZE):
+                batch = keys[first:first + GROUP_LOOKUP_SIZE]
+                # An OR of equalities, not a row-value IN: SQLite scans the
+                # table for a long IN list of pairs but seeks each OR branch
+                condition = " OR ".join(["(customer_id = %s AND order_date = %s)"] * len(batch))
+                cursor.execute(f"SELECT customer_id, order_date, order_id FROM legacy_order_groups "
+                               f"WHERE {condition}",
+                               [value for key in batch for value in key])
+                for customer_id, order_date, order_id in cursor.fetchall():
+                    groups[customer_id, str(order_date)] = order_id
+
+            insert = cursor.prepared("insert_order")
+            new_groups = []
+            for (customer_id, order_date), order_id in groups.items():
+                if order_id is None:
+                    insert.execute((customer_id, self.salesperson_id, order_date))
+                    groups[customer_id, order_date] = insert.lastrowid
+                    new_groups.append((customer_id, order_date, insert.lastrowid))
+            if new_groups:
+                cursor.executemany("INSERT INTO legacy_order_groups (customer_id, order_date, order_id) "
+                                   "VALUES (%s, %s, %s)", new_groups)
+
+            lines = [(groups[row[1], str(row[4])], row[2], row[3]) for row in rows]
+            cursor.executemany(self.store.statements.sql("insert_order_item"), lines)
+            order_ids = sorted(set(groups.values()))
+            self.store.refresh_order_totals(cursor, order_ids)
+
+            last_id = rows[-1][0]
+            checkpoint = (MIGRATION_NAME, last_id, self.rows_migrated + len(rows),
+                          self.orders_created + len(new_groups), self.salesperson_id)
+            cursor.execute("INSERT INTO migration_checkpoints "
+                           "(name, last_id, rows_migrated, orders_created, salesperson_id) "
+                           "VALUES (%s, %s, %s, %s, %s) " +
+                           self.store.backend.upsert(["name"], ["last_id", "rows_migrated",
+                                                                "orders_created", "salesperson_id"]),
+                           checkpoint)
+        # Only advance once the chunk has committed
+        self.last_id, self.rows_migrated, self.orders_created = checkpoint[1:4]
+        self.store.report_cache.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--source-sqlite", metavar="DB_FILE", help="old-layout SQLite database")
+    source.add_argument("--source-mysql-db", metavar="DATABASE", help="old-layout MySQL database")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--sqlite", metavar="DB_FILE", help="new-layout SQLite database")
+    target.add_argument("--mysql-db", default=DB_CONFIG["database"],
+                        help="new-layout MySQL database (default: %(default)s)")
+    parser.add_argument("--schema", default="online_stores.sql", help="schema for a new SQLite database")
+    parser.add_argument("--chunk-size", type=int, default=MIGRATION_CHUNK_SIZE,
+                        help="old rows per chunk and target transaction")
+    parser.add_argument("--salesperson-id", type=int,
+                        help="salesperson for migrated orders (default: create a placeholder)")
+    args = parser.parse_args(argv)
+    if not args.sqlite and args.source_mysql_db == args.mysql_db:
+        parser.error(f"--source-mysql-db and --mysql-db are both {args.mysql_db}; "
+                     "migrate from a copy of the old database")
+
+    if args.source_sqlite:
+        source = SQLiteBackend(args.source_sqlite)
+    else:
+        source = MySQLBackend(**dict(DB_CONFIG, database=args.source_mysql_db))
+    if args.sqlite:
+        backend = SQLiteBackend(args.sqlite)
+        if not backend.has_schema():
+            backend.load_schema(args.schema, sample_data=False)
+    else:
+        backend = MySQLBackend(**dict(DB_CONFIG, database=args.mysql_db))
+
+    store = OnlineStore(backend, pool_size=1, cache_size=0)
+    migration = StoreMigration(source, store, args.chunk_size, args.salesperson_id)
+    return migration.run() is not None
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,8 +1,15 @@
+import sys
+
 import mysql.connector
 from mysql.connector import Error
 
+from query_stats import InstrumentedCursor, QueryStats
+from store_backends import MySQLBackend
+
 class OnlineStore:
-    def __init__(self):
+    def __init__(self, slow_query_ms=None, slow_query_log=None):
+        # Per-statement timings; slow statements are logged with their EXPLAIN
+        self.query_stats = QueryStats(slow_query_ms, slow_query_log, MySQLBackend.explain)
         try:
             self.connection = mysql.connector.connect(
                 host='localhost',
@@ -20,32 +27,37 @@ class OnlineStore:
             self.connection.close()
             print("MySQL connection is closed")
 
+    def _cursor(self):
+        """Return an instrumented cursor attributed to the calling method"""
+        method = sys._getframe(1).f_code.co_name
+        return InstrumentedCursor(self.connection.cursor(), self.connection, self.query_stats, method)
+
     # CRUD operations for Products
     def add_product(self, name, price, description):
         try:
-            cursor = self.connection.cursor()
-            query = "INSERT INTO products (name, price, description) VALUES (%s, %s, %s)"
-            cursor.execute(query, (name, price, description))
-            self.connection.commit()
+            with self._cursor() as cursor:
+                query = "INSERT INTO products (name, price, description) VALUES (%s, %s, %s)"
+                cursor.execute(query, (name, price, description))
+                self.connection.commit()
             print("Product added successfully")
         except Error as e:
             print(f"Error adding product: {e}")
 
     def delete_product(self, product_id):
         try:
-            cursor = self.connection.cursor()
-            query = "DELETE FROM products WHERE id = %s"
-            cursor.execute(query, (product_id,))
-            self.connection.commit()
+            with self._cursor() as cursor:
+                query = "DELETE FROM products WHERE id = %s"
+                cursor.execute(query, (product_id,))
+                self.connection.commit()
             print("Product deleted successfully")
         except Error as e:
             print(f"Error deleting product: {e}")
 
     def view_products(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM products")
-            products = cursor.fetchall()
+            with self._cursor() as cursor:
+                cursor.execute("SELECT * FROM products")
+                products = cursor.fetchall()
             print("\nProducts:")
             for product in products:
                 print(f"ID: {product[0]}, Name: {product[1]}, Price: ${product[2]:.2f}, Description: {product[3]}")
@@ -55,29 +67,29 @@ class OnlineStore:
     # CRUD operations for Customers
     def add_customer(self, name, email, address):
         try:
-            cursor = self.connection.cursor()
-            query = "INSERT INTO customers (name, email, address) VALUES (%s, %s, %s)"
-            cursor.execute(query, (name, email, address))
-            self.connection.commit()
+            with self._cursor() as cursor:
+                query = "INSERT INTO customers (name, email, address) VALUES (%s, %s, %s)"
+                cursor.execute(query, (name, email, address))
+                self.connection.commit()
             print("Customer added successfully")
         except Error as e:
             print(f"Error adding customer: {e}")
 
     def delete_customer(self, customer_id):
         try:
-            cursor = self.connection.cursor()
-            query = "DELETE FROM customers WHERE id = %s"
-            cursor.execute(query, (customer_id,))
-            self.connection.commit()
+            with self._cursor() as cursor:
+                query = "DELETE FROM customers WHERE id = %s"
+                cursor.execute(query, (customer_id,))
+                self.connection.commit()
             print("Customer deleted successfully")
         except Error as e:
             print(f"Error deleting customer: {e}")
 
     def view_customers(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM customers")
-            customers = cursor.fetchall()
+            with self._cursor() as cursor:
+                cursor.execute("SELECT * FROM customers")
+                customers = cursor.fetchall()
             print("\nCustomers:")
             for customer in customers:
                 print(f"ID: {customer[0]}, Name: {customer[1]}, Email: {customer[2]}, Address: {customer[3]}")
@@ -87,36 +99,36 @@ class OnlineStore:
     # CRUD operations for Orders
     def add_order(self, customer_id, product_id, quantity, order_date):
         try:
-            cursor = self.connection.cursor()
-            query = "INSERT INTO orders (customer_id, product_id, quantity, order_date) VALUES (%s, %s, %s, %s)"
-            cursor.execute(query, (customer_id, product_id, quantity, order_date))
-            self.connection.commit()
+            with self._cursor() as cursor:
+                query = "INSERT INTO orders (customer_id, product_id, quantity, order_date) VALUES (%s, %s, %s, %s)"
+                cursor.execute(query, (customer_id, product_id, quantity, order_date))
+                self.connection.commit()
             print("Order added successfully")
         except Error as e:
             print(f"Error adding order: {e}")
 
     def delete_order(self, order_id):
         try:
-            cursor = self.connection.cursor()
-            query = "DELETE FROM orders WHERE id = %s"
-            cursor.execute(query, (order_id,))
-            self.connection.commit()
+            with self._cursor() as cursor:
+                query = "DELETE FROM orders WHERE id = %s"
+                cursor.execute(query, (order_id,))
+                self.connection.commit()
             print("Order deleted successfully")
         except Error as e:
             print(f"Error deleting order: {e}")
 
     def view_orders(self):
         try:
-            cursor = self.connection.cursor()
-            query = """
-            SELECT o.id, c.name AS customer, p.name AS product, o.quantity, p.price, 
-                   (o.quantity * p.price) AS total, o.order_date
-            FROM orders o
-            JOIN customers c ON o.customer_id = c.id
-            JOIN products p ON o.product_id = p.id
-            """
-            cursor.execute(query)
-            orders = cursor.fetchall()
+            with self._cursor() as cursor:
+                query = """
+                SELECT o.id, c.name AS customer, p.name AS product, o.quantity, p.price, 
+                       (o.quantity * p.price) AS total, o.order_date
+                FROM orders o
+                JOIN customers c ON o.customer_id = c.id
+                JOIN products p ON o.product_id = p.id
+                """
+                cursor.execute(query)
+                orders = cursor.fetchall()
             print("\nOrders:")
             for order in orders:
                 print(f"Order ID: {order[0]}, Customer: {order[1]}, Product: {order[2]}, "
@@ -128,16 +140,16 @@ class OnlineStore:
     # Special queries
     def list_orders_by_customer(self, customer_id):
         try:
-            cursor = self.connection.cursor()
-            query = """
-            SELECT o.id, p.name AS product, o.quantity, p.price, 
-                   (o.quantity * p.price) AS total, o.order_date
-            FROM orders o
-            JOIN products p ON o.product_id = p.id
-            WHERE o.customer_id = %s
-            """
-            cursor.execute(query, (customer_id,))
-            orders = cursor.fetchall()
+            with self._cursor() as cursor:
+                query = """
+                SELECT o.id, p.name AS product, o.quantity, p.price, 
+                       (o.quantity * p.price) AS total, o.order_date
+                FROM orders o
+                JOIN products p ON o.product_id = p.id
+                WHERE o.customer_id = %s
+                """
+                cursor.execute(query, (customer_id,))
+                orders = cursor.fetchall()
             print(f"\nOrders for Customer ID {customer_id}:")
             for order in orders:
                 print(f"Order ID: {order[0]}, Product: {order[1]}, Quantity: {order[2]}, "
@@ -147,17 +159,17 @@ class OnlineStore:
 
     def list_orders_by_product(self, product_id):
         try:
-            cursor = self.connection.cursor()
-            query = """
-            SELECT o.id, c.name AS customer, o.quantity, p.price, 
-                   (o.quantity * p.price) AS total, o.order_date
-            FROM orders o
-            JOIN customers c ON o.customer_id = c.id
-            JOIN products p ON o.product_id = p.id
-            WHERE o.product_id = %s
-            """
-            cursor.execute(query, (product_id,))
-            orders = cursor.fetchall()
+            with self._cursor() as cursor:
+                query = """
+                SELECT o.id, c.name AS customer, o.quantity, p.price, 
+                       (o.quantity * p.price) AS total, o.order_date
+                FROM orders o
+                JOIN customers c ON o.customer_id = c.id
+                JOIN products p ON o.product_id = p.id
+                WHERE o.product_id = %s
+                """
+                cursor.execute(query, (product_id,))
+                orders = cursor.fetchall()
             print(f"\nOrders for Product ID {product_id}:")
             for order in orders:
                 print(f"Order ID: {order[0]}, Customer: {order[1]}, Quantity: {order[2]}, "
@@ -1,307 +1,925 @@
-import mysql.connector
-from mysql.connector import Error
+import argparse
+import base64
+import datetime
+import json
+import sys
+from collections import namedtuple
+from contextlib import contextmanager
+
+from connection_pool import ConnectionPool, PoolTimeout
+from exporter import EXPORT_CHUNK_SIZE, export_format, iter_rows, write_export
+from query_stats import InstrumentedCursor, QueryStats
+from result_cache import ResultCache
+from statement_registry import StatementRegistry
+from store_backends import MySQLBackend, SQLiteBackend, StoreConstraintError, StoreError
+
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '',
+    'database': 'online_store'
+}
+
+# Per-order item count and total computed from the raw order lines; the
+# order_totals table caches this so the summary report skips the join
+ORDER_TOTALS_QUERY = """
+SELECT oi.order_id, COUNT(oi.product_id) AS item_count,
+       SUM(oi.quantity * p.price) AS total_amount
+FROM order_items oi
+JOIN products p ON oi.product_id = p.id
+{where}
+GROUP BY oi.order_id
+"""
+
+# Same as in online_stores.sql; stores created before order_totals existed
+# get the table, filled from their order lines, when OnlineStore connects
+ORDER_TOTALS_TABLE = """
+CREATE TABLE order_totals (
+    order_id INT PRIMARY KEY,
+    item_count INT NOT NULL,
+    total_amount DECIMAL(12,2) NOT NULL,
+    FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE
+)
+"""
+
+# Hot statements prepared once per pooled connection ({salesperson} is
+# filled in with the backend's name concatenation)
+PREPARED_STATEMENTS = {
+    "insert_order": "INSERT INTO orders (customer_id, salesperson_id, order_date) VALUES (%s, %s, %s)",
+    "insert_order_item": "INSERT INTO order_items (order_id, product_id, quantity) VALUES (%s, %s, %s)",
+    "order_parties": "SELECT customer_id, salesperson_id FROM orders WHERE id = %s",
+    "order_header": """
+        SELECT o.id, c.name AS customer, c.email, c.address,
+               {salesperson} AS salesperson,
+               s.employment_type, o.order_date
+        FROM orders o
+        JOIN customers c ON o.customer_id = c.id
+        JOIN salespeople s ON o.salesperson_id = s.id
+        WHERE o.id = %s
+    """,
+    "order_items": """
+        SELECT p.name, p.price, oi.quantity, (p.price * oi.quantity) AS total
+        FROM order_items oi
+        JOIN products p ON oi.product_id = p.id
+        WHERE oi.order_id = %s
+    """,
+}
+
+# Datasets that OnlineStore.export() can stream to CSV/JSONL
+EXPORT_QUERIES = {
+    "products": "SELECT id, name, price, description FROM products ORDER BY id",
+    "customers": "SELECT id, name, email, address FROM customers ORDER BY id",
+    "salespeople": "SELECT id, first_name, last_name, employment_type FROM salespeople ORDER BY id",
+    "orders": """
+        SELECT o.id AS order_id, o.order_date, o.customer_id, c.name AS customer,
+               o.salesperson_id, s.first_name AS salesperson_first_name,
+               s.last_name AS salesperson_last_name,
+               t.item_count, t.total_amount
+        FROM orders o
+        JOIN order_totals t ON t.order_id = o.id
+        JOIN customers c ON o.customer_id = c.id
+        JOIN salespeople s ON o.salesperson_id = s.id
+        ORDER BY o.id
+    """,
+    "order_lines": """
+        SELECT oi.id AS item_id, oi.order_id, o.order_date, oi.product_id,
+               p.name AS product, oi.quantity, p.price AS unit_price,
+               (oi.quantity * p.price) AS total
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        JOIN products p ON oi.product_id = p.id
+        ORDER BY oi.id
+    """,
+}
+
+# Typed rows returned by the paginated report APIs
+CustomerOrder = namedtuple("CustomerOrder", "order_id order_date product_count total_amount")
+SalespersonOrder = namedtuple("SalespersonOrder", "order_id customer order_date product_count total_amount")
+ProductOrder = namedtuple("ProductOrder", "order_id customer order_date quantity unit_price total item_id")
+ReportPage = namedtuple("ReportPage", "rows next_cursor")
+ProductMatch = namedtuple("ProductMatch", "id name price description score")
+
+# Rows returned by the non-printing read APIs used by the HTTP service
+Product = namedtuple("Product", "id name price description")
+Customer = namedtuple("Customer", "id name email address")
+Salesperson = namedtuple("Salesperson", "id first_name last_name employment_type")
+OrderSummary = namedtuple("OrderSummary", "id customer_id salesperson_id order_date item_count total_amount")
+OrderDetail = namedtuple("OrderDetail", "id customer email address salesperson employment_type order_date items")
+OrderLine = namedtuple("OrderLine", "product price quantity total")
+
+# Row type of each reference table; its fields are the table's columns
+TABLE_ROWS = {"products": Product, "customers": Customer, "salespeople": Salesperson}
+
+def encode_report_cursor(order_date, row_id):
+    """Opaque cursor pointing just after the row with this (order_date, id)"""
+    raw = json.dumps([None if order_date is None else str(order_date), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_report_cursor(cursor):
+    try:
+        order_date, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return order_date, int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid report cursor: {cursor!r}")
 
 class OnlineStore:
-    def __init__(self):
+    def __init__(self, backend=None, pool_size=5, pool_timeout=30.0,
+                 slow_query_ms=None, slow_query_log=None,
+                 cache_size=1024, cache_ttl=60.0, prepared_statements=True, **db_config):
+        """Open a pooled store on backend (MySQL with DB_CONFIG by default)
+
+        Every statement is timed into self.query_stats; statements taking at
+        least slow_query_ms are written with their EXPLAIN output to
+        slow_query_log (or printed when no log file is given). The
+        first pages of the orders_by_* reports are cached in self.report_cache
+        for up to cache_ttl seconds (cache_size=0 disables the cache).
+        PREPARED_STATEMENTS are prepared once per pooled connection through
+        self.statements unless prepared_statements is false.
+        """
+        self.backend = backend or MySQLBackend(**dict(DB_CONFIG, **db_config))
+        self.query_stats = QueryStats(slow_query_ms, slow_query_log, self.backend.explain)
+        self.report_cache = ResultCache(cache_size, cache_ttl)
+        self.statements = StatementRegistry(self.backend, enabled=prepared_statements)
+        salesperson = self.backend.concat("s.first_name", "' '", "s.last_name")
+        for name, sql in PREPARED_STATEMENTS.items():
+            self.statements.register(name, sql.format(salesperson=salesperson))
+        if self.backend.max_connections:
+            pool_size = min(pool_size, self.backend.max_connections)
+        self.pool = ConnectionPool(
+            self.backend.connect,
+            size=pool_size,
+            timeout=pool_timeout,
+            check=self.backend.check,
+            on_discard=self.statements.forget
+        )
         try:
-            self.connection = mysql.connector.connect(
-                host='localhost',
-                user='root',
-                password='',
-                database='online_store'
-            )
-            if self.connection.is_connected():
-                print("Connected to MySQL database")
-        except Error as e:
-            print(f"Error while connecting to MySQL: {e}")
+            with self.transaction("connect") as cursor:
+                # Databases created before product search get their index here
+                self.backend.ensure_product_search(cursor)
+                if self._ensure_order_totals(cursor):
+                    print("Created the order_totals table from existing orders")
+                print(f"Connected to {self.backend.name} database")
+        except StoreError as e:
+            print(f"Error while connecting to {self.backend.name}: {e}")
 
     def __del__(self):
-        if hasattr(self, 'connection') and self.connection.is_connected():
-            self.connection.close()
-            print("MySQL connection is closed")
+        if hasattr(self, 'pool'):
+            self.pool.close()
+            print(f"{self.backend.name} connection pool is closed")
+
+    @contextmanager
+    def transaction(self, method=None, stream=False):
+        """Yield a cursor on a pooled connection, wrapped in one transaction
+
+        The transaction commits when the block exits cleanly and rolls back
+        otherwise. The cursor is always closed and the connection returned.
+        Backend errors and pool checkout timeouts are raised as StoreError,
+        writes refused for their data as StoreConstraintError. Statements
+        are timed under method, by default the caller's name. This is also
+        how the migration, archival, analytics and ingest tools run their
+        own statements against the store.
+        """
+        try:
+            connection = self.pool.acquire()
+        except (PoolTimeout, self.backend.Error) as e:
+            raise StoreError(str(e)) from e
+        discard = False
+        # Attribute statements to the OnlineStore method using this block
+        method = method or sys._getframe(2).f_code.co_name
+        raw_cursor = self.backend.stream_cursor(connection) if stream else self.backend.cursor(connection)
+        cursor = InstrumentedCursor(raw_cursor, connection, self.query_stats, method,
+                                    prepare=lambda name: self.statements.cursor(connection, name))
+        try:
+            yield cursor
+            connection.commit()
+        except BaseException as e:
+            try:
+                connection.rollback()
+            except self.backend.Error:
+                discard = True
+            if isinstance(e, self.backend.ConstraintError):
+                raise StoreConstraintError(str(e)) from e
+            if isinstance(e, self.backend.Error):
+                raise StoreError(str(e)) from e
+            raise
+        finally:
+            cursor.close()
+            self.pool.release(connection, discard=discard)
 
     
     def add_product(self, name, price, description):
         try:
-            cursor = self.connection.cursor()
-            query = "INSERT INTO products (name, price, description) VALUES (%s, %s, %s)"
-            cursor.execute(query, (name, price, description))
-            self.connection.commit()
+            with self.transaction() as cursor:
+                query = "INSERT INTO products (name, price, description) VALUES (%s, %s, %s)"
+                cursor.execute(query, (name, price, description))
             print("Product added successfully")
-        except Error as e:
+        except StoreError as e:
             print(f"Error adding product: {e}")
 
     def delete_product(self, product_id):
         try:
-            cursor = self.connection.cursor()
-            query = "DELETE FROM products WHERE id = %s"
-            cursor.execute(query, (product_id,))
-            self.connection.commit()
+            with self.transaction() as cursor:
+                query = "DELETE FROM products WHERE id = %s"
+                cursor.execute(query, (product_id,))
             print("Product deleted successfully")
-        except Error as e:
+        except StoreError as e:
             print(f"Error deleting product: {e}")
 
+    def update_product_price(self, product_id, price):
+        """Change a product's price, keeping order totals and cached reports in sync"""
+        try:
+            with self.transaction() as cursor:
+                cursor.execute("UPDATE products SET price = %s WHERE id = %s", (price, product_id))
+                query = """
+                UPDATE order_totals
+                SET total_amount = (
+                    SELECT SUM(oi.quantity * p.price)
+                    FROM order_items oi
+                    JOIN products p ON oi.product_id = p.id
+                    WHERE oi.order_id = order_totals.order_id
+                )
+                WHERE order_id IN (SELECT order_id FROM order_items WHERE product_id = %s)
+                """
+                cursor.execute(query, (product_id,))
+        except StoreError as e:
+            print(f"Error updating product price: {e}")
+            return
+        self.invalidate_reports(products=[product_id])
+        try:
+            self._invalidate_reports_for_product(product_id)
+        except StoreError as e:
+            # The new price is committed; drop every cached report rather
+            # than keep serving totals at the old price
+            self.report_cache.clear()
+            print(f"Product price updated, but cached reports could not be checked ({e}); report cache cleared")
+            return
+        print("Product price updated successfully")
+
     def view_products(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM products")
-            products = cursor.fetchall()
+            with self.transaction() as cursor:
+                cursor.execute("SELECT * FROM products")
+                products = cursor.fetchall()
             print("\nProducts:")
             for product in products:
                 print(f"ID: {product[0]}, Name: {product[1]}, Price: ${product[2]:.2f}, Description: {product[3]}")
-        except Error as e:
+        except StoreError as e:
             print(f"Error viewing products: {e}")
 
+    def find_products(self, query, limit=20):
+        """Up to limit ProductMatch rows for query, best match first
+
+        Every word of query must match the start of a word in the product.
+        Returns None for a query without words; errors raise StoreError.
+        """
+        search = self.backend.product_search(query, limit)
+        if search is None:
+            return None
+        with self.transaction() as cursor:
+            cursor.execute(*search)
+            return [ProductMatch(*row) for row in cursor.fetchall()]
+
+    def search_products(self, query, limit=20):
+        """Print and return the find_products matches for query
+
+        Returns an empty list for a query without words, None on error.
+        """
+        try:
+            matches = self.find_products(query, limit)
+        except StoreError as e:
+            print(f"Error searching products: {e}")
+            return None
+        if matches is None:
+            print("Enter at least one word to search for")
+            return []
+        print(f"\nProducts matching '{query}':")
+        for match in matches:
+            print(f"ID: {match.id}, Name: {match.name}, Price: ${match.price:.2f}, "
+                  f"Description: {match.description}")
+        if not matches:
+            print("No matching products")
+        return matches
+
    
     def add_customer(self, name, email, address):
         try:
-            cursor = self.connection.cursor()
-            query = "INSERT INTO customers (name, email, address) VALUES (%s, %s, %s)"
-            cursor.execute(query, (name, email, address))
-            self.connection.commit()
+            with self.transaction() as cursor:
+                query = "INSERT INTO customers (name, email, address) VALUES (%s, %s, %s)"
+                cursor.execute(query, (name, email, address))
             print("Customer added successfully")
-        except Error as e:
+        except StoreError as e:
             print(f"Error adding customer: {e}")
 
     def delete_customer(self, customer_id):
         try:
-            cursor = self.connection.cursor()
-            query = "DELETE FROM customers WHERE id = %s"
-            cursor.execute(query, (customer_id,))
-            self.connection.commit()
+            with self.transaction() as cursor:
+                query = "DELETE FROM customers WHERE id = %s"
+                cursor.execute(query, (customer_id,))
             print("Customer deleted successfully")
-        except Error as e:
+        except StoreError as e:
             print(f"Error deleting customer: {e}")
 
     def view_customers(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM customers")
-            customers = cursor.fetchall()
+            with self.transaction() as cursor:
+                cursor.execute("SELECT * FROM customers")
+                customers = cursor.fetchall()
             print("\nCustomers:")
             for customer in customers:
                 print(f"ID: {customer[0]}, Name: {customer[1]}, Email: {customer[2]}, Address: {customer[3]}")
-        except Error as e:
+        except StoreError as e:
             print(f"Error viewing customers: {e}")
 
     
     def add_salesperson(self, first_name, last_name, employment_type):
         try:
-            cursor = self.connection.cursor()
-            query = "INSERT INTO salespeople (first_name, last_name, employment_type) VALUES (%s, %s, %s)"
-            cursor.execute(query, (first_name, last_name, employment_type))
-            self.connection.commit()
+            with self.transaction() as cursor:
+                query = "INSERT INTO salespeople (first_name, last_name, employment_type) VALUES (%s, %s, %s)"
+                cursor.execute(query, (first_name, last_name, employment_type))
             print("Salesperson added successfully")
-        except Error as e:
+        except StoreError as e:
             print(f"Error adding salesperson: {e}")
 
     def delete_salesperson(self, salesperson_id):
         try:
-            cursor = self.connection.cursor()
-            query = "DELETE FROM salespeople WHERE id = %s"
-            cursor.execute(query, (salesperson_id,))
-            self.connection.commit()
+            with self.transaction() as cursor:
+                query = "DELETE FROM salespeople WHERE id = %s"
+                cursor.execute(query, (salesperson_id,))
             print("Salesperson deleted successfully")
-        except Error as e:
+        except StoreError as e:
             print(f"Error deleting salesperson: {e}")
 
     def view_salespeople(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM salespeople")
-            salespeople = cursor.fetchall()
+            with self.transaction() as cursor:
+                cursor.execute("SELECT * FROM salespeople")
+                salespeople = cursor.fetchall()
             print("\nSalespeople:")
             for salesperson in salespeople:
                 print(f"ID: {salesperson[0]}, Name: {salesperson[1]} {salesperson[2]}, Employment Type: {salesperson[3]}")
-        except Error as e:
+        except StoreError as e:
             print(f"Error viewing salespeople: {e}")
 
+    def rows_after(self, table, after=0, limit=50):
+        """Up to limit TABLE_ROWS rows of table with an id above after, by id"""
+        row_type = TABLE_ROWS[table]
+        with self.transaction() as cursor:
+            cursor.execute(f"SELECT {', '.join(row_type._fields)} FROM {table} "
+                           f"WHERE id > %s ORDER BY id LIMIT %s", (after, limit))
+            return [row_type(*row) for row in cursor.fetchall()]
+
+    def get_row(self, table, row_id):
+        """The TABLE_ROWS row of table with this id, or None"""
+        row_type = TABLE_ROWS[table]
+        with self.transaction() as cursor:
+            cursor.execute(f"SELECT {', '.join(row_type._fields)} FROM {table} WHERE id = %s", (row_id,))
+            rows = cursor.fetchall()
+        return row_type(*rows[0]) if rows else None
+
+    def insert_row(self, table, values):
+        """Insert values for every TABLE_ROWS column but id and return the new id"""
+        columns = TABLE_ROWS[table]._fields[1:]
+        placeholders = ", ".join(["%s"] * len(columns))
+        with self.transaction() as cursor:
+            cursor.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", tuple(values))
+            return cursor.lastrowid
+
     def add_order(self, customer_id, salesperson_id, order_date):
         """Create a new order and return the order ID"""
         try:
-            cursor = self.connection.cursor()
-            query = "INSERT INTO orders (customer_id, salesperson_id, order_date) VALUES (%s, %s, %s)"
-            cursor.execute(query, (customer_id, salesperson_id, order_date))
-            self.connection.commit()
-            order_id = cursor.lastrowid
+            with self.transaction() as cursor:
+                insert = cursor.prepared("insert_order")
+                insert.execute((customer_id, salesperson_id, order_date))
+                order_id = insert.lastrowid
+            self.invalidate_reports(customers=[customer_id], salespeople=[salesperson_id])
             print(f"Order created successfully. Order ID: {order_id}")
             return order_id
-        except Error as e:
+        except StoreError as e:
             print(f"Error creating order: {e}")
             return None
 
     def add_order_item(self, order_id, product_id, quantity):
         """Add a product to an existing order"""
         try:
-            cursor = self.connection.cursor()
-            query = "INSERT INTO order_items (order_id, product_id, quantity) VALUES (%s, %s, %s)"
-            cursor.execute(query, (order_id, product_id, quantity))
-            self.connection.commit()
+            with self.transaction() as cursor:
+                cursor.prepared("insert_order_item").execute((order_id, product_id, quantity))
+                self.refresh_order_totals(cursor, [order_id])
+                parties = cursor.prepared("order_parties")
+                parties.execute((order_id,))
+                # Prepared cursors are reused, so always read them to the end
+                customer_id, salesperson_id = parties.fetchall()[0]
+            self.invalidate_reports([customer_id], [salesperson_id], [product_id])
             print("Product added to order successfully")
-        except Error as e:
+        except StoreError as e:
             print(f"Error adding product to order: {e}")
 
+    def create_order_with_items(self, customer_id, salesperson_id, order_date, items):
+        """Create an order and all of its (product_id, quantity) lines atomically
+
+        The header and lines are written in one transaction, with the lines
+        sent as a single executemany. Returns the new order ID, or None if
+        anything failed (in which case nothing is written).
+        """
+        items = list(items)
+        try:
+            order_id = self.insert_orders([(customer_id, salesperson_id, order_date, items)])[0]
+            print(f"Order created successfully with {len(items)} items. Order ID: {order_id}")
+            return order_id
+        except StoreError as e:
+            print(f"Error creating order: {e}")
+            return None
+
+    def create_orders(self, orders, batch_size=1000):
+        """Bulk-load (customer_id, salesperson_id, order_date, items) tuples
+
+        Orders are committed in batches of batch_size, with the lines of the
+        whole batch sent in one executemany. A failing batch is rolled back as a
+        whole; batches committed before it are kept. Returns the IDs of the
+        orders that were committed.
+        """
+        order_ids = []
+        batch = []
+        try:
+            for order in orders:
+                batch.append(order)
+                if len(batch) >= batch_size:
+                    order_ids.extend(self.insert_orders(batch))
+                    batch = []
+            if batch:
+                order_ids.extend(self.insert_orders(batch))
+            print(f"Imported {len(order_ids)} orders successfully")
+        except StoreError as e:
+            print(f"Error importing orders after {len(order_ids)} committed: {e}")
+        return order_ids
+
+    def insert_orders(self, batch):
+        """Insert (customer_id, salesperson_id, order_date, items) orders in one
+        transaction and return their IDs
+
+        Nothing is printed; failures raise StoreError (StoreConstraintError
+        for an unknown customer, salesperson or product).
+        """
+        order_ids = []
+        lines = []
+        with self.transaction() as cursor:
+            insert = cursor.prepared("insert_order")
+            for customer_id, salesperson_id, order_date, items in batch:
+                insert.execute((customer_id, salesperson_id, order_date))
+                order_id = insert.lastrowid
+                order_ids.append(order_id)
+                lines.extend((order_id, product_id, quantity) for product_id, quantity in items)
+            if lines:
+                # Not the prepared statement: MySQL's plain executemany
+                # rewrites this into multi-row INSERTs, prepared runs per row
+                cursor.executemany(self.statements.sql("insert_order_item"), lines)
+                self.refresh_order_totals(cursor, order_ids)
+        self.invalidate_reports(
+            customers={order[0] for order in batch},
+            salespeople={order[1] for order in batch},
+            products={line[1] for line in lines}
+        )
+        return order_ids
+
+    def insert_order_items(self, lines):
+        """Add (order_id, product_id, quantity) lines to existing orders in one transaction
+
+        The lines go out in one executemany with one order_totals refresh.
+        Nothing is printed; failures raise StoreError.
+        """
+        order_ids = sorted({line[0] for line in lines})
+        with self.transaction() as cursor:
+            cursor.executemany(self.statements.sql("insert_order_item"), lines)
+            self.refresh_order_totals(cursor, order_ids)
+            placeholders = ", ".join(["%s"] * len(order_ids))
+            cursor.execute(f"SELECT customer_id, salesperson_id FROM orders WHERE id IN ({placeholders})",
+                           order_ids)
+            parties = cursor.fetchall()
+        self.invalidate_reports(
+            customers={row[0] for row in parties},
+            salespeople={row[1] for row in parties},
+            products={line[1] for line in lines}
+        )
+
     def delete_order(self, order_id):
         try:
-            cursor = self.connection.cursor()
-            
-            query = "DELETE FROM order_items WHERE order_id = %s"
-            cursor.execute(query, (order_id,))
-           
-            query = "DELETE FROM orders WHERE id = %s"
-            cursor.execute(query, (order_id,))
-            self.connection.commit()
+            with self.transaction() as cursor:
+                query = """
+                SELECT o.customer_id, o.salesperson_id, oi.product_id
+                FROM orders o
+                LEFT JOIN order_items oi ON o.id = oi.order_id
+                WHERE o.id = %s
+                """
+                cursor.execute(query, (order_id,))
+                affected = cursor.fetchall()
+                
+                query = "DELETE FROM order_items WHERE order_id = %s"
+                cursor.execute(query, (order_id,))
+                
+                query = "DELETE FROM order_totals WHERE order_id = %s"
+                cursor.execute(query, (order_id,))
+               
+                query = "DELETE FROM orders WHERE id = %s"
+                cursor.execute(query, (order_id,))
+            self.invalidate_reports(
+                customers={row[0] for row in affected},
+                salespeople={row[1] for row in affected},
+                products={row[2] for row in affected if row[2] is not None}
+            )
             print("Order deleted successfully")
-        except Error as e:
+        except StoreError as e:
             print(f"Error deleting order: {e}")
 
+    def refresh_order_totals(self, cursor, order_ids):
+        """Recompute the order_totals rows for the given orders from their items
+
+        Call with the cursor of the transaction that changed their lines.
+        """
+        placeholders = ", ".join(["%s"] * len(order_ids))
+        query = "INSERT INTO order_totals (order_id, item_count, total_amount)" + \
+            ORDER_TOTALS_QUERY.format(where=f"WHERE oi.order_id IN ({placeholders})") + \
+            self.backend.upsert(["order_id"], ["item_count", "total_amount"])
+        cursor.execute(query, tuple(order_ids))
+
+    def _ensure_order_totals(self, cursor):
+        """Create and fill order_totals if the store's schema predates it"""
+        if self.backend.has_table(cursor, "order_totals"):
+            return False
+        cursor.execute(ORDER_TOTALS_TABLE)
+        cursor.execute("INSERT INTO order_totals (order_id, item_count, total_amount)" +
+                       ORDER_TOTALS_QUERY.format(where=""))
+        return True
+
+    def rebuild_order_totals(self):
+        """Recompute the whole order_totals table from the raw order lines"""
+        try:
+            with self.transaction() as cursor:
+                self._ensure_order_totals(cursor)
+                cursor.execute("DELETE FROM order_totals")
+                query = "INSERT INTO order_totals (order_id, item_count, total_amount)" + \
+                    ORDER_TOTALS_QUERY.format(where="")
+                cursor.execute(query)
+                count = cursor.rowcount
+            # Any cached report may have been built from the old totals
+            self.report_cache.clear()
+            print(f"Order totals rebuilt for {count} orders")
+        except StoreError as e:
+            print(f"Error rebuilding order totals: {e}")
+
+    def verify_order_totals(self):
+        """Compare order_totals against the raw join and return mismatched rows
+
+        Each mismatch is (order_id, expected_items, expected_total,
+        stored_items, stored_total); a missing side is reported as None.
+        """
+        try:
+            query = f"""
+            SELECT r.order_id, r.item_count, r.total_amount, t.item_count, t.total_amount
+            FROM ({ORDER_TOTALS_QUERY.format(where="")}) r
+            LEFT JOIN order_totals t ON t.order_id = r.order_id
+            WHERE t.order_id IS NULL
+               OR t.item_count <> r.item_count
+               OR t.total_amount <> r.total_amount
+            UNION ALL
+            SELECT t.order_id, NULL, NULL, t.item_count, t.total_amount
+            FROM order_totals t
+            WHERE NOT EXISTS (SELECT 1 FROM order_items oi WHERE oi.order_id = t.order_id)
+            """
+            with self.transaction() as cursor:
+                cursor.execute(query)
+                mismatches = cursor.fetchall()
+            if mismatches:
+                print(f"\n{len(mismatches)} order totals out of date:")
+                for mismatch in mismatches:
+                    print(f"Order ID: {mismatch[0]}, Expected: {mismatch[1]} items / {mismatch[2]}, "
+                          f"Stored: {mismatch[3]} items / {mismatch[4]}")
+            else:
+                print("Order totals are up to date")
+            return mismatches
+        except StoreError as e:
+            print(f"Error verifying order totals: {e}")
+            return None
+
+    def print_query_stats(self, limit=10, export_path=None):
+        """Show the statements with the most total time, optionally exporting all counters"""
+        snapshot = self.query_stats.snapshot()
+        statements = sorted(snapshot["statements"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        print(f"\nTop {min(limit, len(statements))} statements by total time:")
+        for key, entry in statements[:limit]:
+            print(f"Calls: {entry['calls']}, Total: {entry['total_ms']:.1f} ms, "
+                  f"Avg: {entry['avg_ms']:.2f} ms, Max: {entry['max_ms']:.2f} ms, "
+                  f"Rows: {entry['rows']}, Errors: {entry['errors']}")
+            print(f"  {key[:150]}")
+        print("\nBy method:")
+        for method, entry in sorted(snapshot["methods"].items(), key=lambda item: item[1]["total_ms"], reverse=True):
+            print(f"{method}: {entry['calls']} statements, {entry['total_ms']:.1f} ms total")
+        if export_path:
+            self.query_stats.export(export_path)
+            print(f"Query statistics exported to {export_path}")
+        return snapshot
+
     def view_orders(self):
         try:
-            cursor = self.connection.cursor()
-            query = """
+            query = f"""
             SELECT o.id, c.name AS customer, 
-                   CONCAT(s.first_name, ' ', s.last_name) AS salesperson,
-                   o.order_date, SUM(oi.quantity * p.price) AS total_amount
-            FROM orders o
+                   {self.backend.concat("s.first_name", "' '", "s.last_name")} AS salesperson,
+                   o.order_date, t.total_amount
+            FROM order_totals t
+            JOIN orders o ON t.order_id = o.id
             JOIN customers c ON o.customer_id = c.id
             JOIN salespeople s ON o.salesperson_id = s.id
-            JOIN order_items oi ON o.id = oi.order_id
-            JOIN products p ON oi.product_id = p.id
-            GROUP BY o.id
+            WHERE t.item_count > 0
             ORDER BY o.order_date DESC
             """
-            cursor.execute(query)
-            orders = cursor.fetchall()
+            with self.transaction() as cursor:
+                cursor.execute(query)
+                orders = cursor.fetchall()
             print("\nOrders Summary:")
             for order in orders:
                 print(f"Order ID: {order[0]}, Customer: {order[1]}, "
                       f"Salesperson: {order[2]}, Date: {order[3]}, "
                       f"Total: ${order[4]:.2f}")
-        except Error as e:
+        except StoreError as e:
             print(f"Error viewing orders: {e}")
 
+    def orders_after(self, after=0, limit=50):
+        """Up to limit OrderSummary rows with an order id above after, by id"""
+        query = """
+        SELECT o.id, o.customer_id, o.salesperson_id, o.order_date, t.item_count, t.total_amount
+        FROM orders o
+        LEFT JOIN order_totals t ON t.order_id = o.id
+        WHERE o.id > %s
+        ORDER BY o.id
+        LIMIT %s
+        """
+        with self.transaction() as cursor:
+            cursor.execute(query, (after, limit))
+            return [OrderSummary(*row) for row in cursor.fetchall()]
+
+    def order_detail(self, order_id):
+        """The OrderDetail of an order with its OrderLine items, or None"""
+        with self.transaction() as cursor:
+            header = cursor.prepared("order_header")
+            header.execute((order_id,))
+            rows = header.fetchall()
+            if not rows:
+                return None
+            lines = cursor.prepared("order_items")
+            lines.execute((order_id,))
+            items = [OrderLine(*item) for item in lines.fetchall()]
+        return OrderDetail(*rows[0], items)
+
     def view_order_details(self, order_id):
         """View detailed information about a specific order"""
         try:
-            cursor = self.connection.cursor()
-            
-            
-            query_header = """
-            SELECT o.id, c.name AS customer, c.email, c.address,
-                   CONCAT(s.first_name, ' ', s.last_name) AS salesperson,
-                   s.employment_type, o.order_date
-            FROM orders o
-            JOIN customers c ON o.customer_id = c.id
-            JOIN salespeople s ON o.salesperson_id = s.id
-            WHERE o.id = %s
-            """
-            cursor.execute(query_header, (order_id,))
-            order_header = cursor.fetchone()
+            order = self.order_detail(order_id)
             
-            if order_header:
-                print(f"\nOrder Details - ID: {order_header[0]}")
-                print(f"Customer: {order_header[1]}")
-                print(f"Email: {order_header[2]}")
-                print(f"Address: {order_header[3]}")
-                print(f"Salesperson: {order_header[4]} ({order_header[5]})")
-                print(f"Order Date: {order_header[6]}")
-                
-              
-                query_items = """
-                SELECT p.name, p.price, oi.quantity, (p.price * oi.quantity) AS total
-                FROM order_items oi
-                JOIN products p ON oi.product_id = p.id
-                WHERE oi.order_id = %s
-                """
-                cursor.execute(query_items, (order_id,))
-                items = cursor.fetchall()
+            if order:
+                print(f"\nOrder Details - ID: {order.id}")
+                print(f"Customer: {order.customer}")
+                print(f"Email: {order.email}")
+                print(f"Address: {order.address}")
+                print(f"Salesperson: {order.salesperson} ({order.employment_type})")
+                print(f"Order Date: {order.order_date}")
                 
                 print("\nOrder Items:")
                 total_order = 0
-                for item in items:
-                    print(f"  Product: {item[0]}, Price: ${item[1]:.2f}, "
-                          f"Quantity: {item[2]}, Total: ${item[3]:.2f}")
-                    total_order += item[3]
+                for item in order.items:
+                    print(f"  Product: {item.product}, Price: ${item.price:.2f}, "
+                          f"Quantity: {item.quantity}, Total: ${item.total:.2f}")
+                    total_order += item.total
                 
                 print(f"\nOrder Total: ${total_order:.2f}")
             else:
                 print(f"Order with ID {order_id} not found.")
                 
-        except Error as e:
+        except StoreError as e:
             print(f"Error viewing order details: {e}")
 
-    def list_orders_by_customer(self, customer_id):
-        try:
-            cursor = self.connection.cursor()
-            query = """
-            SELECT o.id, o.order_date, COUNT(oi.product_id) AS product_count,
-                   SUM(oi.quantity * p.price) AS total_amount
+    def _report_page(self, report, report_id, method, query, date_col, id_col, row_type, limit, cursor):
+        """Fetch one page of a report ordered by (date_col, id_col) descending
+
+        query must contain an {after} slot for the keyset condition and take
+        the report id as its first parameter. First pages are served from
+        and stored in the report cache.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        key = (report, report_id)
+        if cursor is None:
+            hit, cached = self.report_cache.get(key)
+            if hit and cached[0] == limit:
+                return cached[1]
+
+        params = [report_id]
+        after = ""
+        if cursor is not None:
+            last_date, last_id = decode_report_cursor(cursor)
+            # Both backends sort NULL dates last in descending order
+            if last_date is None:
+                after = f"AND {date_col} IS NULL AND {id_col} < %s"
+                params.append(last_id)
+            else:
+                after = f"AND ({date_col} < %s OR ({date_col} = %s AND {id_col} < %s) OR {date_col} IS NULL)"
+                params += [last_date, last_date, last_id]
+        params.append(limit + 1)
+
+        generation = self.report_cache.generation
+        with self.transaction(method) as db_cursor:
+            db_cursor.execute(query.format(after=after), params)
+            rows = db_cursor.fetchall()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            # The keyset id is the last selected column for product lines
+            last_id = rows[-1][-1] if row_type is ProductOrder else rows[-1][0]
+            next_cursor = encode_report_cursor(rows[-1][row_type._fields.index("order_date")], last_id)
+        page = ReportPage([row_type(*row) for row in rows], next_cursor)
+        if cursor is None:
+            self.report_cache.put(key, (limit, page), generation)
+        return page
+
+    def orders_by_customer(self, customer_id, limit=50, cursor=None):
+        """Return a ReportPage of CustomerOrder rows, newest first
+
+        Pass the previous page's next_cursor to continue; it is None on the
+        last page. Pages are read from orders joined to order_totals through
+        the (customer_id, order_date) index, so each costs about the same.
+        """
+        query = """
+        SELECT o.id, o.order_date, t.item_count, t.total_amount
+        FROM orders o
+        JOIN order_totals t ON t.order_id = o.id
+        WHERE o.customer_id = %s AND t.item_count > 0 {after}
+        ORDER BY o.order_date DESC, o.id DESC
+        LIMIT %s
+        """
+        return self._report_page("customer", customer_id, "orders_by_customer", query,
+                                 "o.order_date", "o.id", CustomerOrder, limit, cursor)
+
+    def orders_by_salesperson(self, salesperson_id, limit=50, cursor=None):
+        """Return a ReportPage of SalespersonOrder rows, newest first"""
+        query = """
+        SELECT o.id, c.name AS customer, o.order_date, t.item_count, t.total_amount
+        FROM orders o
+        JOIN order_totals t ON t.order_id = o.id
+        JOIN customers c ON o.customer_id = c.id
+        WHERE o.salesperson_id = %s AND t.item_count > 0 {after}
+        ORDER BY o.order_date DESC, o.id DESC
+        LIMIT %s
+        """
+        return self._report_page("salesperson", salesperson_id, "orders_by_salesperson", query,
+                                 "o.order_date", "o.id", SalespersonOrder, limit, cursor)
+
+    def orders_by_product(self, product_id, limit=50, cursor=None):
+        """Return a ReportPage of ProductOrder lines, newest first
+
+        Lines are keyed by (order_date, order item id). order_date lives on
+        orders, so each page still sorts the product's lines.
+        """
+        query = """
+        SELECT o.id, c.name AS customer, o.order_date,
+               oi.quantity, p.price, (oi.quantity * p.price) AS total, oi.id
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        JOIN customers c ON o.customer_id = c.id
+        JOIN products p ON oi.product_id = p.id
+        WHERE oi.product_id = %s {after}
+        ORDER BY o.order_date DESC, oi.id DESC
+        LIMIT %s
+        """
+        return self._report_page("product", product_id, "orders_by_product", query,
+                                 "o.order_date", "oi.id", ProductOrder, limit, cursor)
+
+    def _print_report_pages(self, fetch, report_id, page_size, prompt, print_row):
+        """Print a paginated report page by page, optionally asking before each next page"""
+        cursor = None
+        while True:
+            page = fetch(report_id, page_size, cursor)
+            for row in page.rows:
+                print_row(row)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+            if prompt and input("Show more? (y/n): ").lower() != 'y':
+                break
+
+    def invalidate_reports(self, customers=(), salespeople=(), products=()):
+        """Drop cached reports for the given ids; call after the write commits"""
+        keys = [("customer", customer_id) for customer_id in customers]
+        keys += [("salesperson", salesperson_id) for salesperson_id in salespeople]
+        keys += [("product", product_id) for product_id in products]
+        self.report_cache.invalidate(keys)
+
+    def _invalidate_reports_for_product(self, product_id):
+        """Drop cached customer/salesperson reports that include a product"""
+        affected = {}
+        for report, column in (("customer", "customer_id"), ("salesperson", "salesperson_id")):
+            cached = self.report_cache.cached_ids(report)
+            if not cached:
+                continue
+            placeholders = ", ".join(["%s"] * len(cached))
+            query = f"""
+            SELECT DISTINCT o.{column}
             FROM orders o
             JOIN order_items oi ON o.id = oi.order_id
-            JOIN products p ON oi.product_id = p.id
-            WHERE o.customer_id = %s
-            GROUP BY o.id
-            ORDER BY o.order_date DESC
+            WHERE oi.product_id = %s AND o.{column} IN ({placeholders})
             """
-            cursor.execute(query, (customer_id,))
-            orders = cursor.fetchall()
+            with self.transaction() as cursor:
+                cursor.execute(query, (product_id, *cached))
+                affected[report] = [row[0] for row in cursor.fetchall()]
+        self.invalidate_reports(affected.get("customer", ()), affected.get("salesperson", ()))
+
+    def export(self, dataset, path, compress=None, chunk_size=EXPORT_CHUNK_SIZE):
+        """Stream one of EXPORT_QUERIES to a .csv or .jsonl file (gzipped for .gz)
+
+        Rows are read through an unbuffered cursor chunk_size at a time and
+        written as they arrive, so memory use does not grow with the table.
+        The pooled connection is held until the export finishes. Returns the
+        number of rows written.
+        """
+        try:
+            query = EXPORT_QUERIES[dataset]
+            export_format(path)
+            with self.transaction(f"export_{dataset}", stream=True) as cursor:
+                cursor.execute(query)
+                headers = [column[0] for column in cursor.description]
+                count = write_export(iter_rows(cursor, chunk_size), headers, path, compress, chunk_size,
+                                     lambda n: print(f"  ... {n} rows", end="\r"))
+            print(f"\nExported {count} {dataset} rows to {path}")
+            return count
+        except KeyError:
+            print(f"Error exporting: unknown dataset '{dataset}' (choose from {', '.join(EXPORT_QUERIES)})")
+        except (StoreError, OSError, ValueError) as e:
+            print(f"Error exporting {dataset}: {e}")
+        return 0
+
+    def print_cache_stats(self):
+        stats = self.report_cache.stats()
+        print(f"\nReport cache: {stats['size']} entries, {stats['hits']} hits, "
+              f"{stats['misses']} misses ({stats['hit_rate']:.1%} hit rate), "
+              f"{stats['invalidations']} invalidated, {stats['expired']} expired, "
+              f"{stats['evictions']} evicted")
+        return stats
+
+    def list_orders_by_customer(self, customer_id, page_size=50, prompt=False):
+        try:
             print(f"\nOrders for Customer ID {customer_id}:")
-            for order in orders:
-                print(f"Order ID: {order[0]}, Date: {order[1]}, "
-                      f"Products: {order[2]}, Total: ${order[3]:.2f}")
-        except Error as e:
+            self._print_report_pages(
+                self.orders_by_customer, customer_id, page_size, prompt,
+                lambda order: print(f"Order ID: {order.order_id}, Date: {order.order_date}, "
+                                    f"Products: {order.product_count}, Total: ${order.total_amount:.2f}")
+            )
+        except StoreError as e:
             print(f"Error listing orders by customer: {e}")
 
-    def list_orders_by_salesperson(self, salesperson_id):
+    def list_orders_by_salesperson(self, salesperson_id, page_size=50, prompt=False):
         try:
-            cursor = self.connection.cursor()
-            query = """
-            SELECT o.id, c.name AS customer, o.order_date,
-                   COUNT(oi.product_id) AS product_count,
-                   SUM(oi.quantity * p.price) AS total_amount
-            FROM orders o
-            JOIN customers c ON o.customer_id = c.id
-            JOIN order_items oi ON o.id = oi.order_id
-            JOIN products p ON oi.product_id = p.id
-            WHERE o.salesperson_id = %s
-            GROUP BY o.id
-            ORDER BY o.order_date DESC
-            """
-            cursor.execute(query, (salesperson_id,))
-            orders = cursor.fetchall()
             print(f"\nOrders handled by Salesperson ID {salesperson_id}:")
-            for order in orders:
-                print(f"Order ID: {order[0]}, Customer: {order[1]}, "
-                      f"Date: {order[2]}, Products: {order[3]}, "
-                      f"Total: ${order[4]:.2f}")
-        except Error as e:
+            self._print_report_pages(
+                self.orders_by_salesperson, salesperson_id, page_size, prompt,
+                lambda order: print(f"Order ID: {order.order_id}, Customer: {order.customer}, "
+                                    f"Date: {order.order_date}, Products: {order.product_count}, "
+                                    f"Total: ${order.total_amount:.2f}")
+            )
+        except StoreError as e:
             print(f"Error listing orders by salesperson: {e}")
 
-    def list_orders_by_product(self, product_id):
+    def list_orders_by_product(self, product_id, page_size=50, prompt=False):
         try:
-            cursor = self.connection.cursor()
-            query = """
-            SELECT o.id, c.name AS customer, o.order_date,
-                   oi.quantity, p.price, (oi.quantity * p.price) AS total
-            FROM orders o
-            JOIN customers c ON o.customer_id = c.id
-            JOIN order_items oi ON o.id = oi.order_id
-            JOIN products p ON oi.product_id = p.id
-            WHERE oi.product_id = %s
-            ORDER BY o.order_date DESC
-            """
-            cursor.execute(query, (product_id,))
-            orders = cursor.fetchall()
             print(f"\nOrders containing Product ID {product_id}:")
-            for order in orders:
-                print(f"Order ID: {order[0]}, Customer: {order[1]}, "
-                      f"Date: {order[2]}, Quantity: {order[3]}, "
-                      f"Unit Price: ${order[4]:.2f}, Total: ${order[5]:.2f}")
-        except Error as e:
+            self._print_report_pages(
+                self.orders_by_product, product_id, page_size, prompt,
+                lambda order: print(f"Order ID: {order.order_id}, Customer: {order.customer}, "
+                                    f"Date: {order.order_date}, Quantity: {order.quantity}, "
+                                    f"Unit Price: ${order.unit_price:.2f}, Total: ${order.total:.2f}")
+            )
+        except StoreError as e:
             print(f"Error listing orders by product: {e}")
 
-def main():
-    store = OnlineStore()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Online store database management")
+    parser.add_argument("--sqlite", metavar="DB_FILE",
+                        help="use an embedded SQLite database instead of MySQL")
+    parser.add_argument("--schema", default="online_stores.sql",
+                        help="schema loaded into a new SQLite database")
+    parser.add_argument("--slow-query-ms", type=float,
+                        help="log statements at least this slow, with their EXPLAIN output")
+    parser.add_argument("--slow-query-log", help="slow-query log file (JSON lines)")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="serve the store as a local JSON HTTP service instead of the menu")
+    args = parser.parse_args(argv)
+    
+    backend = None
+    if args.sqlite:
+        backend = SQLiteBackend(args.sqlite)
+        if not backend.has_schema():
+            backend.load_schema(args.schema)
+    store = OnlineStore(backend, slow_query_ms=args.slow_query_ms, slow_query_log=args.slow_query_log)
+    if args.serve is not None:
+        from store_service import serve
+        serve(store, port=args.serve)
+        return
     
     while True:
         print("\nOnline Store Database Management System")
@@ -320,6 +938,8 @@ def main():
             print("1. Add Product")
             print("2. Delete Product")
             print("3. View Products")
+            print("4. Update Product Price")
+            print("5. Search Products")
             sub_choice = input("Enter your choice: ")
             
             if sub_choice == '1':
@@ -332,6 +952,12 @@ def main():
                 store.delete_product(product_id)
             elif sub_choice == '3':
                 store.view_products()
+            elif sub_choice == '4':
+                product_id = int(input("Enter product ID: "))
+                price = float(input("Enter new price: "))
+                store.update_product_price(product_id, price)
+            elif sub_choice == '5':
+                store.search_products(input("Search for: "))
                 
         elif choice == '2':
            
@@ -379,6 +1005,8 @@ def main():
             print("3. Delete Order")
             print("4. View Orders Summary")
             print("5. View Order Details")
+            print("6. Create Order with Items")
+            print("7. Archive Old Orders")
             sub_choice = input("Enter your choice: ")
             
             if sub_choice == '1':
@@ -399,6 +1027,25 @@ def main():
             elif sub_choice == '5':
                 order_id = int(input("Enter order ID to view details: "))
                 store.view_order_details(order_id)
+            elif sub_choice == '6':
+                customer_id = int(input("Enter customer ID: "))
+                salesperson_id = int(input("Enter salesperson ID: "))
+                order_date = input("Enter order date (YYYY-MM-DD): ")
+                items = []
+                while True:
+                    product_id = input("Enter product ID (blank to finish): ").strip()
+                    if not product_id:
+                        break
+                    quantity = int(input("Enter quantity: "))
+                    items.append((int(product_id), quantity))
+                store.create_order_with_items(customer_id, salesperson_id, order_date, items)
+            elif sub_choice == '7':
+                from archive_orders import OrderArchiver
+                cutoff = input("Archive orders dated before (YYYY-MM-DD): ").strip()
+                try:
+                    OrderArchiver(store, datetime.date.fromisoformat(cutoff)).run()
+                except ValueError:
+                    print(f"Invalid date: {cutoff}")
                 
         elif choice == '5':
            
@@ -406,17 +1053,43 @@ def main():
             print("1. Orders by Customer")
             print("2. Orders by Salesperson")
             print("3. Orders by Product")
+            print("4. Verify Order Totals")
+            print("5. Rebuild Order Totals")
+            print("6. Query Statistics")
+            print("7. Report Cache Statistics")
+            print("8. Export to CSV/JSONL")
+            print("9. Sales Analytics")
             sub_choice = input("Enter your choice: ")
             
             if sub_choice == '1':
                 customer_id = int(input("Enter customer ID: "))
-                store.list_orders_by_customer(customer_id)
+                store.list_orders_by_customer(customer_id, prompt=True)
             elif sub_choice == '2':
                 salesperson_id = int(input("Enter salesperson ID: "))
-                store.list_orders_by_salesperson(salesperson_id)
+                store.list_orders_by_salesperson(salesperson_id, prompt=True)
             elif sub_choice == '3':
                 product_id = int(input("Enter product ID: "))
-                store.list_orders_by_product(product_id)
+                store.list_orders_by_product(product_id, prompt=True)
+            elif sub_choice == '4':
+                store.verify_order_totals()
+            elif sub_choice == '5':
+                store.rebuild_order_totals()
+            elif sub_choice == '6':
+                export_path = input("Export to JSON file (blank to skip): ").strip()
+                store.print_query_stats(export_path=export_path or None)
+            elif sub_choice == '7':
+                store.print_cache_stats()
+            elif sub_choice == '8':
+                dataset = input(f"Dataset ({', '.join(EXPORT_QUERIES)}): ").strip()
+                path = input("Output file (.csv or .jsonl, add .gz to compress): ").strip()
+                store.export(dataset, path)
+            elif sub_choice == '9':
+                try:
+                    from sales_analytics import SalesAnalytics
+                except ImportError as e:
+                    print(f"Sales analytics needs NumPy: {e}")
+                else:
+                    SalesAnalytics(store).print_report()
                 
         elif choice == '6':
             print("Exiting...")
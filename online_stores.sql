@@ -46,6 +46,29 @@ CREATE TABLE order_items (
     FOREIGN KEY (product_id) REFERENCES products(id)
 );
 
+-- Per-order totals maintained by OnlineStore alongside order_items writes,
+-- so the orders summary does not re-aggregate the whole order history
+CREATE TABLE order_totals (
+    order_id INT PRIMARY KEY,
+    item_count INT NOT NULL,
+    total_amount DECIMAL(12,2) NOT NULL,
+    FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE
+);
+
+-- Indexes for the order reports. InnoDB only adds bare foreign key
+-- indexes and SQLite adds none, so declare them with the report ordering.
+-- Both engines append the primary key to secondary indexes, so these also
+-- serve the (order_date, id) keyset pages without a sort
+CREATE INDEX idx_orders_order_date ON orders (order_date);
+CREATE INDEX idx_orders_customer_id ON orders (customer_id, order_date);
+CREATE INDEX idx_orders_salesperson_id ON orders (salesperson_id, order_date);
+CREATE INDEX idx_order_items_order_id ON order_items (order_id, product_id, quantity);
+CREATE INDEX idx_order_items_product_id ON order_items (product_id);
+
+-- Product search (OnlineStore.search_products). SQLite has no FULLTEXT
+-- indexes; the SQLite backend builds an FTS5 table for it instead
+CREATE FULLTEXT INDEX ft_products_search ON products (name, description);
+
 -- Sample data
 INSERT INTO products (name, price, description) VALUES
 ('Laptop', 999.99, 'High-performance laptop'),
@@ -66,4 +89,10 @@ INSERT INTO orders (customer_id, salesperson_id, order_date) VALUES
 
 INSERT INTO order_items (order_id, product_id, quantity) VALUES
 (1, 1, 1),  -- 1 Laptop
-(1, 3, 2);  -- 2 Headphones
\ No newline at end of file
+(1, 3, 2);  -- 2 Headphones
+
+INSERT INTO order_totals (order_id, item_count, total_amount)
+SELECT oi.order_id, COUNT(oi.product_id), SUM(oi.quantity * p.price)
+FROM order_items oi
+JOIN products p ON oi.product_id = p.id
+GROUP BY oi.order_id;
\ No newline at end of file
@@ -0,0 +1,152 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from store_backends import StoreConstraintError, StoreError
+
+INGEST_BATCH_SIZE = 500
+INGEST_MAX_DELAY = 0.002
+INGEST_MAX_PENDING = 10000
+
+_STOP = object()
+
+
+class IngestQueueFull(Exception):
+    """Raised when a line cannot be queued within the submit timeout"""
+
+
+class OrderLineQueue:
+    """Write-behind queue turning many add_order_item calls into group commits
+
+    submit() queues an order line and returns a Future at once. A single
+    writer thread takes up to batch_size lines, waiting at most max_delay
+    seconds after the first one for more to arrive, and writes them with
+    OnlineStore.insert_order_items: one executemany, one order_totals
+    refresh and one commit. The futures resolve (to None) once that commit
+    has returned, i.e. when the lines are as durable as a per-row
+    add_order_item. A batch the database rejects for its data
+    (StoreConstraintError) is split in halves and retried, so only the bad
+    lines' futures get the error; any other failure fails the whole batch.
+
+    At most max_pending lines wait in memory; submit() then blocks, up to
+    its timeout, until the writer catches up.
+    """
+
+    def __init__(self, store, batch_size=INGEST_BATCH_SIZE, max_delay=INGEST_MAX_DELAY,
+                 max_pending=INGEST_MAX_PENDING):
+        self.store = store
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        # submit() calls between their closed check and their put
+        self._submitting = 0
+        self._idle = threading.Condition()
+        self.stats = {"lines": 0, "batches": 0, "failed": 0, "full_batches": 0, "commit_ms": 0.0}
+        self._writer = threading.Thread(target=self._run, name="order-line-writer", daemon=True)
+        self._writer.start()
+
+    def submit(self, order_id, product_id, quantity, timeout=None):
+        """Queue one line; returns a Future resolved when it is committed
+
+        Blocks while the queue is full, raising IngestQueueFull after
+        timeout seconds (None waits for as long as it takes). Cancelling
+        the future before the writer takes the line drops the line.
+        """
+        with self._idle:
+            if self._closed:
+                raise StoreError("Order line queue is closed")
+            self._submitting += 1
+        future = Future()
+        try:
+            self._pending.put(((order_id, product_id, quantity), future), timeout=timeout)
+        except queue.Full:
+            raise IngestQueueFull(f"{self._pending.maxsize} order lines already waiting")
+        finally:
+            with self._idle:
+                self._submitting -= 1
+                self._idle.notify_all()
+        return future
+
+    def close(self, timeout=None):
+        """Commit everything already queued and stop the writer"""
+        with self._idle:
+            if self._closed:
+                return
+            self._closed = True
+            # Lines of submit() calls already past the closed check go in
+            # ahead of the stop marker, so the writer still commits them
+            self._idle.wait_for(lambda: not self._submitting)
+        self._pending.put((None, _STOP))
+        self._writer.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                if deadline is None:
+                    line, future = self._pending.get()
+                else:
+                    remaining = deadline - time.perf_counter()
+                    try:
+                        line, future = self._pending.get(timeout=remaining) if remaining > 0 else \
+                            self._pending.get_nowait()
+                    except queue.Empty:
+                        break
+                if future is _STOP:
+                    stopping = True
+                    break
+                # Drop lines whose future was cancelled; the rest can no longer be
+                if not future.set_running_or_notify_cancel():
+                    continue
+                batch.append((line, future))
+                if deadline is None:
+                    deadline = time.perf_counter() + self.max_delay
+            if not batch:
+                continue
+            try:
+                self._write(batch)
+            except Exception as e:
+                # The writer must outlive any error, or every later line would hang
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _write(self, batch):
+        lines = [line for line, _ in batch]
+        start = time.perf_counter()
+        try:
+            self.store.insert_order_items(lines)
+        except StoreConstraintError as e:
+            if len(batch) == 1:
+                self.stats["failed"] += 1
+                batch[0][1].set_exception(e)
+                return
+            # Bisect to isolate the bad lines: one bad line costs about
+            # 2 * log2(len(batch)) commits instead of one per line
+            middle = len(batch) // 2
+            self._write(batch[:middle])
+            self._write(batch[middle:])
+            return
+        except Exception as e:
+            # Pool timeouts, lost connections and the like would fail every
+            # half again, so the whole batch fails at once; keep the writer alive
+            self.stats["failed"] += len(batch)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.stats["commit_ms"] += (time.perf_counter() - start) * 1000
+        self.stats["lines"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["full_batches"] += len(batch) >= self.batch_size
+        for _, future in batch:
+            future.set_result(None)
@@ -0,0 +1,222 @@
+import datetime
+import functools
+import json
+import re
+import threading
+import time
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(query):
+    """Normalise a statement so calls differing only in values group together"""
+    text = query.replace("%s", "?")
+    text = _STRING_LITERAL.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _PLACEHOLDER_LIST.sub("(?+)", text)
+    return " ".join(text.split())
+
+
+class QueryStats:
+    """Thread-safe per-statement timing counters with an optional slow-query log
+
+    Statements slower than slow_ms are appended to log_path as JSON lines,
+    together with the plan from explain(connection, query, params) when an
+    explain function is given.
+    """
+
+    def __init__(self, slow_ms=None, log_path=None, explain=None):
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self.explain = explain
+        self._lock = threading.Lock()
+        self._statements = {}
+        self._methods = {}
+
+    def record(self, connection, query, params, method, seconds, rows, error=None):
+        key = fingerprint(query)
+        with self._lock:
+            for table, name in ((self._statements, key), (self._methods, method)):
+                entry = table.get(name)
+                if entry is None:
+                    entry = table[name] = {"calls": 0, "errors": 0, "rows": 0,
+                                           "total_ms": 0.0, "max_ms": 0.0}
+                entry["calls"] += 1
+                entry["rows"] += max(rows, 0)
+                entry["total_ms"] += seconds * 1000
+                entry["max_ms"] = max(entry["max_ms"], seconds * 1000)
+                if error:
+                    entry["errors"] += 1
+        
+        if self.slow_ms is not None and seconds * 1000 >= self.slow_ms:
+            self._log_slow(connection, query, params, key, method, seconds, rows, error)
+
+    def _log_slow(self, connection, query, params, key, method, seconds, rows, error):
+        plan = None
+        if self.explain and not error:
+            try:
+                plan = self.explain(connection, query, params)
+            except Exception as e:
+                plan = [f"EXPLAIN failed: {e}"]
+        entry = {
+            "time": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "ms": round(seconds * 1000, 3),
+            "method": method,
+            "fingerprint": key,
+            "statement": " ".join(query.split()),
+            "rows": rows,
+            "error": error,
+            "explain": plan,
+        }
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            else:
+                print(f"[slow query] {line}")
+
+    def snapshot(self):
+        """Return a copy of the aggregated counters by statement and by method"""
+        with self._lock:
+            result = {}
+            for name, table in (("statements", self._statements), ("methods", self._methods)):
+                result[name] = {}
+                for key, entry in table.items():
+                    entry = dict(entry)
+                    entry["avg_ms"] = entry["total_ms"] / entry["calls"] if entry["calls"] else 0.0
+                    result[name][key] = entry
+            return result
+
+    def export(self, path):
+        """Write the current counters to a JSON file"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._methods.clear()
+
+
+class InstrumentedCursor:
+    """Cursor wrapper timing each statement from execute until its rows are read
+
+    A statement is recorded when the next one starts or the cursor is
+    closed, so fetch time and the number of rows fetched are included.
+    """
+
+    def __init__(self, cursor, connection, stats, method, prepare=None):
+        self._cursor = cursor
+        self._connection = connection
+        self._stats = stats
+        self._method = method
+        self._pending = None
+        self._prepare = prepare
+        self._statements = []
+
+    def execute(self, query, params=()):
+        return self._run(self._cursor.execute, query, params, params)
+
+    def executemany(self, query, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        # EXPLAIN in the slow-query log uses the first parameter set
+        sample = seq_of_params[0] if seq_of_params else ()
+        return self._run(self._cursor.executemany, query, seq_of_params, sample)
+
+    def _run(self, func, query, params, sample_params):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            result = func(query, params)
+        except Exception as e:
+            self._stats.record(self._connection, query, sample_params, self._method,
+                               time.perf_counter() - start, 0, error=str(e))
+            raise
+        self._pending = [query, sample_params, time.perf_counter() - start, 0]
+        return result
+
+    def _fetch(self, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        if self._pending:
+            self._pending[2] += time.perf_counter() - start
+            if isinstance(result, list):
+                self._pending[3] += len(result)
+            elif result is not None:
+                self._pending[3] += 1
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def _finish(self):
+        if self._pending:
+            query, params, seconds, rows = self._pending
+            self._pending = None
+            if not rows and self._cursor.rowcount and self._cursor.rowcount > 0:
+                rows = self._cursor.rowcount
+            self._stats.record(self._connection, query, params, self._method, seconds, rows)
+
+    def prepared(self, name):
+        """InstrumentedStatement for a registered statement on this cursor's connection
+
+        prepare(name) must return (cursor, sql, reusable) as
+        StatementRegistry.cursor() does. Statements are recorded when this
+        cursor is closed.
+        """
+        cursor, sql, reusable = self._prepare(name)
+        statement = InstrumentedStatement(cursor, sql, reusable, self._connection, self._stats, self._method)
+        self._statements.append(statement)
+        return statement
+
+    def close(self):
+        for statement in self._statements:
+            statement.close()
+        self._finish()
+        return self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+
+class InstrumentedStatement(InstrumentedCursor):
+    """InstrumentedCursor bound to one prepared statement
+
+    execute() and executemany() take only parameters. A reusable cursor is
+    owned by the statement registry, so close() just records the last call.
+    """
+
+    def __init__(self, cursor, sql, reusable, connection, stats, method):
+        super().__init__(cursor, connection, stats, method)
+        self.sql = sql
+        self._reusable = reusable
+
+    def execute(self, params=()):
+        return super().execute(self.sql, params)
+
+    def executemany(self, seq_of_params):
+        return super().executemany(self.sql, seq_of_params)
+
+    def close(self):
+        self._finish()
+        if not self._reusable:
+            self._cursor.close()
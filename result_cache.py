@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Bounded LRU cache with a per-entry TTL and explicit invalidation
+
+    Keys are (report, id) tuples. Writers invalidate the keys they affect
+    after committing; a reader that started before an invalidation passes
+    the generation it saw to put() so its possibly stale result is dropped.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key):
+        """Return (True, value) on a fresh hit, (False, None) otherwise"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return True, value
+                del self._entries[key]
+                self._counters["expired"] += 1
+            self._counters["misses"] += 1
+            return False, None
+
+    def put(self, key, value, generation=None):
+        """Store a value unless an invalidation happened since generation"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, keys):
+        """Drop the given keys and make in-flight fills for any key stale"""
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._counters["invalidations"] += 1
+
+    def cached_ids(self, report):
+        """Ids currently cached for one report"""
+        with self._lock:
+            return [key[1] for key in self._entries if key[0] == report]
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._entries)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            return stats
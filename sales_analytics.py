@@ -0,0 +1,200 @@
+import time
+from itertools import chain
+
+import numpy as np
+
+from store_backends import StoreError
+
+ANALYTICS_CHUNK_SIZE = 100000
+EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _add_bincount(totals, keys, weights):
+    """Add np.bincount(keys, weights) into totals, growing it when needed"""
+    counts = np.bincount(keys, weights=weights)
+    if len(counts) > len(totals):
+        totals = np.concatenate([totals, np.zeros(len(counts) - len(totals))])
+    totals[:len(counts)] += counts
+    return totals
+
+
+def moving_average(values, window):
+    """Trailing moving average; the first window-1 points average what exists so far"""
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    sums = np.cumsum(np.insert(np.asarray(values, dtype=float), 0, 0.0))
+    ends = np.arange(1, len(sums))
+    return (sums[ends] - sums[np.maximum(ends - window, 0)]) / np.minimum(ends, window)
+
+
+class SalesAnalytics:
+    """Revenue reports over an OnlineStore computed with NumPy instead of GROUP BY
+
+    refresh() streams every order line (day, customer, salesperson,
+    product, quantity) through one unbuffered query in chunks of
+    chunk_size rows. Each chunk becomes an integer array whose revenue is
+    priced from a product price array and folded into per-day, -product,
+    -salesperson and -customer totals with np.bincount, so memory depends
+    on the number of ids and days, not on the number of lines. Revenue
+    uses current product prices, like the order totals.
+    """
+
+    def __init__(self, store, chunk_size=ANALYTICS_CHUNK_SIZE):
+        self.store = store
+        self.chunk_size = chunk_size
+        self.lines = 0
+        self.refresh_seconds = 0.0
+        self.by_day = np.zeros(0)
+        self.by_product = np.zeros(0)
+        self.by_salesperson = np.zeros(0)
+        self.by_customer = np.zeros(0)
+        self.product_names = {}
+        self.salesperson_names = {}
+        self.employment_types = {}
+
+    def refresh(self):
+        """Reload the totals from the database; returns the number of lines read"""
+        start = time.perf_counter()
+        with self.store.transaction("sales_analytics") as cursor:
+            cursor.execute("SELECT id, name, price FROM products")
+            products = cursor.fetchall()
+            cursor.execute("SELECT id, first_name, last_name, employment_type FROM salespeople")
+            salespeople = cursor.fetchall()
+
+        prices = np.zeros(max((row[0] for row in products), default=0) + 1)
+        prices[[row[0] for row in products]] = [float(row[2] or 0) for row in products]
+        self.product_names = {row[0]: row[1] for row in products}
+        self.salesperson_names = {row[0]: f"{row[1]} {row[2]}" for row in salespeople}
+        self.employment_types = {row[0]: row[3] for row in salespeople}
+
+        by_day, by_product, by_salesperson, by_customer = (np.zeros(0) for _ in range(4))
+        lines = 0
+        # Missing ids, quantities and dates become 0 / -1 so every column
+        # stays an integer
+        query = f"""
+        SELECT COALESCE({self.store.backend.epoch_days("o.order_date")}, -1),
+               COALESCE(o.customer_id, 0), COALESCE(o.salesperson_id, 0),
+               COALESCE(oi.product_id, 0), COALESCE(oi.quantity, 0)
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        """
+        with self.store.transaction("sales_analytics", stream=True) as cursor:
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                # fromiter over the flattened tuples is about twice as fast as np.array(rows)
+                chunk = np.fromiter(chain.from_iterable(rows), dtype=np.int64,
+                                    count=len(rows) * 5).reshape(-1, 5)
+                # Negative ids count as missing too; np.bincount rejects them
+                day, quantity = chunk[:, 0], chunk[:, 4]
+                customer, salesperson, product = np.maximum(chunk[:, 1:4], 0).T
+                known = product < len(prices)
+                revenue = np.where(known, quantity * prices[np.where(known, product, 0)], 0.0)
+                dated = day >= 0
+                by_day = _add_bincount(by_day, day[dated], revenue[dated])
+                by_product = _add_bincount(by_product, product, revenue)
+                by_salesperson = _add_bincount(by_salesperson, salesperson, revenue)
+                by_customer = _add_bincount(by_customer, customer, revenue)
+                lines += len(rows)
+
+        self.by_day, self.by_product = by_day, by_product
+        self.by_salesperson, self.by_customer = by_salesperson, by_customer
+        self.lines = lines
+        self.refresh_seconds = time.perf_counter() - start
+        return lines
+
+    def total_revenue(self):
+        return float(self.by_product.sum())
+
+    def revenue_by_day(self):
+        """(date, revenue) for every day with sales, oldest first"""
+        days = np.flatnonzero(self.by_day)
+        return list(zip((EPOCH + days).tolist(), self.by_day[days].tolist()))
+
+    def daily_series(self):
+        """Dates and revenue for every day from the first to the last sale"""
+        days = np.flatnonzero(self.by_day)
+        if not len(days):
+            return np.array([], dtype="datetime64[D]"), np.zeros(0)
+        span = np.arange(days[0], days[-1] + 1)
+        return EPOCH + span, self.by_day[span]
+
+    def moving_average(self, window=7):
+        """(date, trailing window-day average revenue) over the daily series"""
+        dates, revenue = self.daily_series()
+        return list(zip(dates.tolist(), moving_average(revenue, window).tolist()))
+
+    def _ranked(self, totals, names, limit=None):
+        ids = np.flatnonzero(totals)
+        if limit is not None and limit < len(ids):
+            ids = ids[np.argpartition(totals[ids], -limit)[-limit:]]
+        ids = ids[np.argsort(totals[ids], kind="stable")[::-1]]
+        return [(int(i), names.get(int(i)), float(totals[i])) for i in ids]
+
+    def revenue_by_product(self, limit=None):
+        """(product_id, name, revenue), highest revenue first"""
+        return self._ranked(self.by_product, self.product_names, limit)
+
+    def revenue_by_salesperson(self, limit=None):
+        """(salesperson_id, name, revenue), highest revenue first"""
+        return self._ranked(self.by_salesperson, self.salesperson_names, limit)
+
+    def revenue_by_employment_type(self):
+        """{employment_type: revenue}, e.g. payroll vs on_call"""
+        types = sorted(set(self.employment_types.values()))
+        codes = np.full(len(self.by_salesperson), -1)
+        for salesperson_id, employment_type in self.employment_types.items():
+            if salesperson_id < len(codes):
+                codes[salesperson_id] = types.index(employment_type)
+        known = codes >= 0
+        totals = np.bincount(codes[known], weights=self.by_salesperson[known], minlength=len(types))
+        return dict(zip(types, totals.tolist()))
+
+    def top_customers(self, n=10):
+        """(customer_id, name, revenue) for the n biggest customers"""
+        ranked = self._ranked(self.by_customer, {}, n)
+        if ranked:
+            placeholders = ", ".join(["%s"] * len(ranked))
+            with self.store.transaction("sales_analytics") as cursor:
+                cursor.execute(f"SELECT id, name FROM customers WHERE id IN ({placeholders})",
+                               [row[0] for row in ranked])
+                names = dict(cursor.fetchall())
+            ranked = [(customer_id, names.get(customer_id), revenue) for customer_id, _, revenue in ranked]
+        return ranked
+
+    def print_report(self, top=10, window=7):
+        """Refresh and print the revenue summary"""
+        try:
+            self.refresh()
+            print(f"\nSales analytics over {self.lines} order lines "
+                  f"({self.refresh_seconds:.2f}s): total revenue ${self.total_revenue():,.2f}")
+
+            print("\nRevenue by employment type:")
+            for employment_type, revenue in self.revenue_by_employment_type().items():
+                print(f"  {employment_type}: ${revenue:,.2f}")
+
+            print(f"\nTop {top} products:")
+            for product_id, name, revenue in self.revenue_by_product(top):
+                print(f"  {product_id}: {name} - ${revenue:,.2f}")
+
+            print(f"\nTop {top} salespeople:")
+            for salesperson_id, name, revenue in self.revenue_by_salesperson(top):
+                print(f"  {salesperson_id}: {name} - ${revenue:,.2f}")
+
+            print(f"\nTop {top} customers:")
+            for customer_id, name, revenue in self.top_customers(top):
+                print(f"  {customer_id}: {name} - ${revenue:,.2f}")
+
+            print(f"\nLast {top} days ({window}-day moving average):")
+            daily = self.revenue_by_day()
+            averages = dict(self.moving_average(window))
+            for day, revenue in daily[-top:]:
+                print(f"  {day}: ${revenue:,.2f} (avg ${averages[day]:,.2f})")
+        except StoreError as e:
+            print(f"Error computing sales analytics: {e}")
+        except (ValueError, TypeError, OverflowError) as e:
+            # Values NumPy cannot turn into the integer arrays, e.g. a
+            # non-numeric id or a quantity past 64 bits
+            print(f"Error computing sales analytics: unexpected data ({e})")
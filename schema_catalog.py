@@ -0,0 +1,155 @@
+from collections import OrderedDict, namedtuple
+
+# Same field order as PRAGMA table_info rows
+Column = namedtuple("Column", "cid name type notnull default pk")
+ForeignKey = namedtuple("ForeignKey", "columns ref_table ref_columns")
+Index = namedtuple("Index", "name columns unique origin partial")
+
+
+def column_converter(col_type):
+    """Return a function coercing text input to a column's SQLite type affinity"""
+    col_type = (col_type or "").upper()
+    if "INT" in col_type:
+        cast = int
+    elif any(name in col_type for name in ("CHAR", "CLOB", "TEXT")):
+        cast = str
+    elif "BLOB" in col_type or not col_type:
+        cast = None
+    elif any(name in col_type for name in ("REAL", "FLOA", "DOUB")):
+        cast = float
+    else:
+        cast = _numeric
+
+    def convert(value):
+        # Empty CSV fields become NULL; JSON values already carry a type
+        if value is None or value == "":
+            return None
+        if cast is None or not isinstance(value, str):
+            return value
+        return cast(value)
+
+    return convert
+
+
+def _numeric(value):
+    # NUMERIC affinity (DATE, BOOLEAN, DECIMAL, ...) keeps non-numeric text as is
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+class TableInfo:
+    """Columns, keys and indexes of one table, with a type converter per column"""
+
+    def __init__(self, name, columns, foreign_keys, indexes):
+        self.name = name
+        self.columns = columns
+        self.foreign_keys = foreign_keys
+        self.indexes = indexes
+        self.column_names = [col.name for col in columns]
+        self.column_types = {col.name: col.type for col in columns}
+        self.converters = {col.name: column_converter(col.type) for col in columns}
+        self.primary_key = [col.name for col in sorted(columns, key=lambda col: col.pk) if col.pk > 0]
+        # Rowid tables without a declared key are paged on rowid
+        self.page_key = self.primary_key or ["rowid"]
+
+
+class SchemaCatalog:
+    """Per-connection cache of table metadata
+
+    Table names and DDL are read from sqlite_master on first use and each
+    table's columns, foreign keys and indexes when it is first looked up.
+    Every lookup costs a single PRAGMA schema_version; the cache is dropped
+    when that changes, whichever connection altered the schema.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.version = None
+        self._tables = None
+        self._ddl = None
+        self._details = {}
+        self.loads = 0
+
+    def _check_version(self):
+        version = self.conn.execute("PRAGMA schema_version").fetchone()[0]
+        if version != self.version:
+            self.invalidate()
+            self.version = version
+
+    def invalidate(self):
+        """Forget everything; the next lookup reloads from the database"""
+        self.version = None
+        self._tables = None
+        self._ddl = None
+        self._details = {}
+
+    def _load_master(self):
+        rows = self.conn.execute(
+            "SELECT type, name, sql FROM sqlite_master ORDER BY rowid"
+        ).fetchall()
+        self._tables = OrderedDict((name.lower(), name) for kind, name, _ in rows if kind == "table")
+        self._ddl = [sql for _, name, sql in rows if sql and not name.startswith("sqlite_")]
+        self.loads += 1
+
+    def tables(self, internal=True):
+        """Table names in creation order; internal=False hides sqlite_* tables"""
+        self._check_version()
+        if self._tables is None:
+            self._load_master()
+        names = list(self._tables.values())
+        return names if internal else [name for name in names if not name.lower().startswith("sqlite_")]
+
+    def ddl(self):
+        """CREATE statements of every table, index, view and trigger"""
+        self._check_version()
+        if self._ddl is None:
+            self._load_master()
+        return list(self._ddl)
+
+    def table(self, table_name):
+        """TableInfo for table_name, or None if there is no such table"""
+        self._check_version()
+        if self._tables is None:
+            self._load_master()
+        name = self._tables.get(table_name.lower())
+        if name is None:
+            return None
+        info = self._details.get(name)
+        if info is None:
+            info = self._details[name] = self._load_table(name)
+        return info
+
+    def _load_table(self, name):
+        columns = [Column(*row) for row in self.conn.execute("SELECT * FROM pragma_table_info(?)", (name,))]
+
+        foreign_keys = OrderedDict()
+        for fk_id, ref_table, from_col, to_col in self.conn.execute(
+            'SELECT id, "table", "from", "to" FROM pragma_foreign_key_list(?) ORDER BY id, seq', (name,)
+        ):
+            fk = foreign_keys.setdefault(fk_id, (ref_table, [], []))
+            fk[1].append(from_col)
+            fk[2].append(to_col)
+
+        indexes = OrderedDict()
+        for index_name, unique, origin, partial, col in self.conn.execute(
+            'SELECT il.name, il."unique", il.origin, il.partial, ii.name '
+            "FROM pragma_index_list(?) il LEFT JOIN pragma_index_info(il.name) ii "
+            "ORDER BY il.seq, ii.seqno", (name,)
+        ):
+            index = indexes.setdefault(index_name, Index(index_name, [], bool(unique), origin, bool(partial)))
+            # Expression index terms have no column name
+            index.columns.append(col)
+
+        self.loads += 1
+        return TableInfo(
+            name,
+            columns,
+            [ForeignKey(cols, ref_table, ref_cols) for ref_table, cols, ref_cols in foreign_keys.values()],
+            list(indexes.values())
+        )
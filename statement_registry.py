@@ -0,0 +1,65 @@
+import threading
+
+
+class StatementRegistry:
+    """Named SQL statements, each prepared at most once per pooled connection
+
+    Statements are registered up front with their %s-style SQL. cursor()
+    hands out a connection's prepared cursor for a statement, creating it
+    with backend.prepare() on first use and reusing it afterwards. The pool
+    calls forget() when it closes a connection so its cursors are dropped.
+    With enabled=False every call gets a fresh unprepared cursor instead,
+    which is what the statement benchmark compares against.
+    """
+
+    def __init__(self, backend, enabled=True):
+        self.backend = backend
+        self.enabled = enabled
+        self._sql = {}
+        # id(connection) -> (connection, {name: prepared cursor})
+        self._prepared = {}
+        self._lock = threading.Lock()
+        self._counters = {"prepares": 0, "reuses": 0}
+
+    def register(self, name, sql):
+        self._sql[name] = sql
+
+    def sql(self, name):
+        return self._sql[name]
+
+    def cursor(self, connection, name):
+        """Return (cursor, sql, reusable) for a registered statement on connection
+
+        A reusable cursor belongs to the registry and must not be closed by
+        the caller; a non-reusable one is the caller's to close.
+        """
+        sql = self._sql[name]
+        if not self.enabled:
+            return self.backend.cursor(connection), sql, False
+        with self._lock:
+            statements = self._prepared.setdefault(id(connection), (connection, {}))[1]
+            cursor = statements.get(name)
+            if cursor is None:
+                cursor = statements[name] = self.backend.prepare(connection, sql)
+                self._counters["prepares"] += 1
+            else:
+                self._counters["reuses"] += 1
+        return cursor, sql, True
+
+    def forget(self, connection):
+        """Drop the prepared cursors of a connection that is being closed"""
+        with self._lock:
+            entry = self._prepared.pop(id(connection), None)
+        if entry:
+            for cursor in entry[1].values():
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["connections"] = len(self._prepared)
+        stats["statements"] = len(self._sql)
+        return stats
@@ -0,0 +1,289 @@
+import functools
+import itertools
+import re
+import sqlite3
+
+from fulltext import ensure_fts5, fts5_query, mysql_boolean_query
+
+# Per-connection compiled statement cache for SQLite (sqlite3 defaults to 128)
+SQLITE_CACHED_STATEMENTS = 256
+# Columns behind the product search index on both backends
+PRODUCT_SEARCH_COLUMNS = ("name", "description")
+# Name of the FULLTEXT index in online_stores.sql
+PRODUCT_SEARCH_INDEX = "ft_products_search"
+
+
+class StoreError(Exception):
+    """Database error raised by OnlineStore regardless of the backend in use"""
+
+
+class StoreConstraintError(StoreError):
+    """A write the database refused for its data: an unknown foreign key,
+    a duplicate key, a NULL or out-of-range value"""
+
+
+class MySQLBackend:
+    """OnlineStore backend talking to a MySQL/MariaDB server via mysql.connector"""
+
+    name = "MySQL"
+    max_connections = None
+
+    def __init__(self, **config):
+        import mysql.connector
+        self._mysql = mysql.connector
+        self.Error = mysql.connector.Error
+        # Raised as StoreConstraintError; strict mode reports bad values as DataError
+        self.ConstraintError = (mysql.connector.IntegrityError, mysql.connector.DataError)
+        self.config = config
+
+    def connect(self):
+        return self._mysql.connect(**self.config)
+
+    def check(self, connection):
+        """Health check for pooled connections
+
+        A dropped connection is not reconnected in place: its server-side
+        prepared statements are gone, so the pool replaces it instead.
+        """
+        return connection.is_connected()
+
+    def cursor(self, connection):
+        return connection.cursor()
+
+    def stream_cursor(self, connection):
+        """Unbuffered cursor: rows stay on the server until fetched"""
+        return connection.cursor(buffered=False)
+
+    def prepare(self, connection, sql):
+        """Cursor for a server-side prepared statement
+
+        The statement is prepared on its first execute and re-executed by id
+        while the same SQL is passed again.
+        """
+        return connection.cursor(prepared=True)
+
+    def concat(self, *parts):
+        return f"CONCAT({', '.join(parts)})"
+
+    def epoch_days(self, column):
+        """Expression for a DATE column as whole days since 1970-01-01"""
+        return f"(TO_DAYS({column}) - 719528)"
+
+    @staticmethod
+    def explain(connection, query, params=()):
+        """Return EXPLAIN output for a statement as one string per plan row"""
+        cursor = connection.cursor(buffered=True)
+        try:
+            cursor.execute(f"EXPLAIN {query}", params)
+            columns = [column[0] for column in cursor.description]
+            return [", ".join(f"{col}={value}" for col, value in zip(columns, row))
+                    for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def upsert(self, key_columns, update_columns):
+        """Clause turning an INSERT into an insert-or-update on key_columns"""
+        updates = ", ".join(f"{col} = VALUES({col})" for col in update_columns)
+        return f"ON DUPLICATE KEY UPDATE {updates}"
+
+    def has_table(self, cursor, table):
+        """Whether table exists in the connected database"""
+        cursor.execute("SELECT 1 FROM information_schema.tables "
+                       "WHERE table_schema = DATABASE() AND table_name = %s", (table,))
+        return bool(cursor.fetchall())
+
+    def ensure_product_search(self, cursor):
+        """Add the products FULLTEXT index to databases created without it"""
+        cursor.execute("SELECT 1 FROM information_schema.statistics "
+                       "WHERE table_schema = DATABASE() AND table_name = 'products' "
+                       "AND index_name = %s", (PRODUCT_SEARCH_INDEX,))
+        if cursor.fetchall():
+            return False
+        cursor.execute(f"CREATE FULLTEXT INDEX {PRODUCT_SEARCH_INDEX} "
+                       f"ON products ({', '.join(PRODUCT_SEARCH_COLUMNS)})")
+        return True
+
+    def product_search(self, text, limit):
+        """(query, params) for the limit best products matching text
+
+        Rows are (id, name, price, description, score), best match first.
+        Returns None when text contains no words to search for.
+        """
+        term = mysql_boolean_query(text)
+        if term is None:
+            return None
+        columns = ", ".join(PRODUCT_SEARCH_COLUMNS)
+        query = f"""
+        SELECT id, name, price, description,
+               MATCH({columns}) AGAINST (%s IN BOOLEAN MODE) AS score
+        FROM products
+        WHERE MATCH({columns}) AGAINST (%s IN BOOLEAN MODE)
+        ORDER BY score DESC, id
+        LIMIT %s
+        """
+        return query, (term, term, limit)
+
+
+class SQLiteBackend:
+    """Embedded OnlineStore backend using the standard library sqlite3 module
+
+    OnlineStore's SQL is written with MySQL's %s placeholders; cursors from
+    this backend translate them to SQLite's ? on the fly. ":memory:" maps
+    to a shared-cache in-memory database that lives as long as the backend
+    object. Shared-cache connections fail on lock conflicts instead of
+    waiting, so an in-memory store is limited to a single pooled
+    connection; use a database file (WAL mode) for concurrent workers.
+    """
+
+    name = "SQLite"
+    Error = sqlite3.Error
+    ConstraintError = sqlite3.IntegrityError
+    _memory_ids = itertools.count(1)
+
+    def __init__(self, database=":memory:", timeout=30.0):
+        self.timeout = timeout
+        self.max_connections = None
+        self._keeper = None
+        if database == ":memory:":
+            self.max_connections = 1
+            self.database = f"file:online_store_{next(self._memory_ids)}?mode=memory&cache=shared"
+            self._uri = True
+            # An in-memory database only lives while a connection is open
+            self._keeper = self.connect()
+        else:
+            self.database = database
+            self._uri = False
+
+    def connect(self):
+        connection = sqlite3.connect(
+            self.database,
+            timeout=self.timeout,
+            uri=self._uri,
+            check_same_thread=False,
+            cached_statements=SQLITE_CACHED_STATEMENTS
+        )
+        connection.execute("PRAGMA foreign_keys = ON")
+        if not self._uri:
+            connection.execute("PRAGMA journal_mode = WAL")
+        return connection
+
+    def check(self, connection):
+        connection.execute("SELECT 1")
+        return True
+
+    def cursor(self, connection):
+        return SQLiteCursor(connection.cursor())
+
+    def stream_cursor(self, connection):
+        # SQLite cursors already step through results as they are fetched
+        return self.cursor(connection)
+
+    def prepare(self, connection, sql):
+        # sqlite3 keeps compiled statements in the connection's statement
+        # cache keyed by SQL text, so a kept cursor reuses them
+        return self.cursor(connection)
+
+    def concat(self, *parts):
+        return " || ".join(parts)
+
+    def epoch_days(self, column):
+        return f"CAST(julianday({column}) - 2440587.5 AS INTEGER)"
+
+    @staticmethod
+    def explain(connection, query, params=()):
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {query.replace('%s', '?')}", params).fetchall()
+        return [row[3] for row in rows]
+
+    def upsert(self, key_columns, update_columns):
+        updates = ", ".join(f"{col} = excluded.{col}" for col in update_columns)
+        return f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}"
+
+    def has_table(self, cursor, table):
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", (table,))
+        return bool(cursor.fetchall())
+
+    def ensure_product_search(self, cursor):
+        """Create the products_fts index and its sync triggers if missing"""
+        return ensure_fts5(cursor, "products", PRODUCT_SEARCH_COLUMNS)
+
+    def product_search(self, text, limit):
+        # bm25() is lower for better matches; negate it so higher scores win
+        # on both backends
+        term = fts5_query(text)
+        if term is None:
+            return None
+        query = """
+        SELECT p.id, p.name, p.price, p.description, -bm25(products_fts) AS score
+        FROM products_fts
+        JOIN products p ON p.id = products_fts.rowid
+        WHERE products_fts MATCH %s
+        ORDER BY bm25(products_fts), p.id
+        LIMIT %s
+        """
+        return query, (term, limit)
+
+    def load_schema(self, path, sample_data=True):
+        """Create the store schema from a MySQL script such as online_stores.sql
+
+        With sample_data=False the script's INSERT statements are skipped.
+        """
+        with open(path, encoding="utf-8") as f:
+            script = translate_mysql_schema(f.read(), sample_data)
+        connection = self.connect()
+        try:
+            connection.executescript(script)
+            self.ensure_product_search(connection.cursor())
+            connection.commit()
+        finally:
+            connection.close()
+
+    def has_schema(self):
+        connection = self.connect()
+        try:
+            return connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'orders'"
+            ).fetchone() is not None
+        finally:
+            connection.close()
+
+
+@functools.lru_cache(maxsize=SQLITE_CACHED_STATEMENTS)
+def _sqlite_placeholders(query):
+    return query.replace("%s", "?")
+
+
+class SQLiteCursor:
+    """sqlite3 cursor wrapper accepting MySQL-style %s placeholders"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=()):
+        return self._cursor.execute(_sqlite_placeholders(query), params)
+
+    def executemany(self, query, seq_of_params):
+        return self._cursor.executemany(_sqlite_placeholders(query), seq_of_params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+def translate_mysql_schema(script, sample_data=True):
+    """Rewrite the MySQL DDL used by online_stores.sql into SQLite syntax
+
+    Handles CREATE DATABASE/USE, INT AUTO_INCREMENT PRIMARY KEY and
+    ENUM columns (turned into TEXT with a CHECK constraint). FULLTEXT
+    indexes are dropped; SQLiteBackend.load_schema adds FTS5 tables instead.
+    INSERT statements are dropped too unless sample_data is true.
+    """
+    script = re.sub(r"^\s*(CREATE DATABASE|USE|CREATE FULLTEXT INDEX)\b[^;]*;", "", script, flags=re.I | re.M)
+    if not sample_data:
+        script = re.sub(r"^\s*INSERT\b[^;]*;", "", script, flags=re.I | re.M)
+    script = re.sub(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b",
+                    "INTEGER PRIMARY KEY AUTOINCREMENT", script, flags=re.I)
+    script = re.sub(r"\b(\w+)\s+ENUM\s*\(([^)]*)\)",
+                    r"\1 TEXT CHECK (\1 IN (\2))", script, flags=re.I)
+    return script
@@ -0,0 +1,328 @@
+"""Serve an OnlineStore as a local JSON-over-HTTP service.
+
+Requests are handled by a fixed pool of worker threads that share the
+store's connection pool, so at most --pool-size statements run at once
+and the rest wait for a connection. Per-route latency (count, errors,
+mean, p50/p95/p99, max) is served at GET /metrics together with the
+store's query and report cache statistics.
+
+Endpoints:
+  GET  /products?after=ID&limit=N        GET /products/ID
+  GET  /products/search?q=TEXT&limit=N
+  GET  /customers?after=ID&limit=N       GET /customers/ID
+  GET  /salespeople?after=ID&limit=N     GET /salespeople/ID
+  GET  /orders?after=ID&limit=N          GET /orders/ID
+  GET  /customers/ID/orders?limit=N&cursor=C    (also /salespeople/ID/orders,
+                                                 /products/ID/orders)
+  POST /products {"name", "price", "description"}
+  POST /customers {"name", "email", "address"}
+  POST /salespeople {"first_name", "last_name", "employment_type"}
+  POST /orders {"customer_id", "salesperson_id", "order_date", "items": [[product_id, quantity], ...]}
+  GET  /metrics
+
+A body field of the wrong JSON type (see FIELD_TYPES) answers 400 Bad
+Request naming the field. Writes the database refuses for their data (an
+unknown customer, product or salesperson, a duplicate or invalid value)
+answer 409 Conflict.
+
+Usage:
+  python store_service.py --sqlite store.db --port 8080
+"""
+import argparse
+import collections
+import http.server
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from exporter import json_value
+from online_stores import TABLE_ROWS, OnlineStore
+from store_backends import SQLiteBackend, StoreConstraintError, StoreError
+
+SERVICE_WORKERS = 16
+SERVICE_PAGE_SIZE = 50
+SERVICE_MAX_PAGE_SIZE = 1000
+# Latencies kept per route for the percentiles
+LATENCY_WINDOW = 10000
+
+# JSON types accepted for each request body field, and how a 400 names them
+FIELD_TYPES = {
+    "name": (str, "a string"),
+    "price": ((int, float), "a number"),
+    "description": ((str, type(None)), "a string or null"),
+    "email": (str, "a string"),
+    "address": ((str, type(None)), "a string or null"),
+    "first_name": (str, "a string"),
+    "last_name": (str, "a string"),
+    "employment_type": (str, "a string"),
+    "customer_id": (int, "an integer"),
+    "salesperson_id": (int, "an integer"),
+    "order_date": ((str, type(None)), "a date string or null"),
+    "items": (list, "a list of [product_id, quantity] pairs"),
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RequestMetrics:
+    """Thread-safe latency counters per route, with percentiles over a recent window"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, seconds, status):
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                               "recent": collections.deque(maxlen=self.window)}
+            ms = seconds * 1000
+            entry["count"] += 1
+            entry["errors"] += status >= 500
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+            entry["recent"].append(ms)
+
+    def snapshot(self):
+        with self._lock:
+            routes = {route: dict(entry, recent=sorted(entry["recent"])) for route, entry in self._routes.items()}
+        result = {}
+        for route, entry in routes.items():
+            recent = entry.pop("recent")
+            entry["mean_ms"] = entry["total_ms"] / entry["count"]
+            for name, fraction in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                entry[name] = recent[min(len(recent) - 1, int(fraction * len(recent)))]
+            result[route] = entry
+        return {"uptime_s": time.time() - self.started, "routes": result}
+
+
+class StoreService:
+    """Maps (method, path) to OnlineStore reads and writes returning JSON-ready data"""
+
+    def __init__(self, store):
+        self.store = store
+        self.metrics = RequestMetrics()
+        self.routes = [
+            ("GET", r"/metrics", self.get_metrics),
+            ("GET", r"/products/search", self.search_products),
+            ("GET", r"/(products|customers|salespeople)", self.list_rows),
+            ("GET", r"/(products|customers|salespeople)/(\d+)", self.get_row),
+            ("POST", r"/(products|customers|salespeople)", self.create_row),
+            ("GET", r"/orders", self.list_orders),
+            ("GET", r"/orders/(\d+)", self.get_order),
+            ("POST", r"/orders", self.create_order),
+            ("GET", r"/(customers|salespeople|products)/(\d+)/orders", self.report),
+        ]
+        self.routes = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in self.routes]
+
+    def handle(self, method, url, body):
+        """Return (status, route, payload) for one request"""
+        parts = urlsplit(url)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        route = f"{method} (unmatched)"
+        try:
+            allowed = False
+            for route_method, pattern, handler in self.routes:
+                match = pattern.match(parts.path)
+                if not match:
+                    continue
+                if route_method != method:
+                    allowed = True
+                    continue
+                route = f"{method} {pattern.pattern[:-1]}"
+                return 200 if method == "GET" else 201, route, handler(*match.groups(), query=query, body=body)
+            raise HTTPError(405 if allowed else 404, "Method not allowed" if allowed else "Not found")
+        except HTTPError as e:
+            return e.status, route, {"error": str(e)}
+        except ValueError as e:
+            return 400, route, {"error": str(e)}
+        except StoreConstraintError as e:
+            return 409, route, {"error": str(e)}
+        except StoreError as e:
+            return 500, route, {"error": str(e)}
+
+    def _limit(self, query):
+        limit = int(query.get("limit", SERVICE_PAGE_SIZE))
+        if not 1 <= limit <= SERVICE_MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {SERVICE_MAX_PAGE_SIZE}")
+        return limit
+
+    def _fields(self, body, names):
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        missing = [name for name in names if name not in body]
+        if missing:
+            raise ValueError(f"Missing fields: {', '.join(missing)}")
+        for name in names:
+            types, description = FIELD_TYPES[name]
+            # JSON true/false arrive as bool, which is an int subclass
+            if isinstance(body[name], bool) or not isinstance(body[name], types):
+                raise ValueError(f"Field {name} must be {description}")
+        return [body[name] for name in names]
+
+    def get_metrics(self, query, body):
+        snapshot = self.metrics.snapshot()
+        snapshot["query_methods"] = self.store.query_stats.snapshot()["methods"]
+        snapshot["report_cache"] = self.store.report_cache.stats()
+        return snapshot
+
+    def list_rows(self, table, query, body):
+        """One keyset page ordered by id; pass the last id as ?after= for the next"""
+        limit = self._limit(query)
+        rows = self.store.rows_after(table, int(query.get("after", 0)), limit)
+        return {"rows": [row._asdict() for row in rows], "next_after": rows[-1].id if len(rows) == limit else None}
+
+    def get_row(self, table, row_id, query, body):
+        row = self.store.get_row(table, int(row_id))
+        if row is None:
+            raise HTTPError(404, f"No {table} row with id {row_id}")
+        return row._asdict()
+
+    def create_row(self, table, query, body):
+        values = self._fields(body, TABLE_ROWS[table]._fields[1:])
+        return {"id": self.store.insert_row(table, values)}
+
+    def search_products(self, query, body):
+        matches = self.store.find_products(query.get("q", ""), self._limit(query))
+        if matches is None:
+            raise ValueError("q must contain at least one word")
+        return {"rows": [match._asdict() for match in matches]}
+
+    def list_orders(self, query, body):
+        limit = self._limit(query)
+        rows = self.store.orders_after(int(query.get("after", 0)), limit)
+        return {"rows": [row._asdict() for row in rows], "next_after": rows[-1].id if len(rows) == limit else None}
+
+    def get_order(self, order_id, query, body):
+        order = self.store.order_detail(int(order_id))
+        if order is None:
+            raise HTTPError(404, f"No order with id {order_id}")
+        return dict(order._asdict(), items=[item._asdict() for item in order.items])
+
+    def create_order(self, query, body):
+        customer_id, salesperson_id, order_date, items = self._fields(
+            body, ["customer_id", "salesperson_id", "order_date", "items"])
+        for index, item in enumerate(items):
+            if not (isinstance(item, list) and len(item) == 2
+                    and all(type(value) is int for value in item)):
+                raise ValueError(f"Field items[{index}] must be a [product_id, quantity] pair of integers")
+        order_id = self.store.insert_orders([(customer_id, salesperson_id, order_date, items)])[0]
+        return {"id": order_id}
+
+    def report(self, kind, report_id, query, body):
+        fetch = {
+            "customers": self.store.orders_by_customer,
+            "salespeople": self.store.orders_by_salesperson,
+            "products": self.store.orders_by_product,
+        }[kind]
+        page = fetch(int(report_id), self._limit(query), query.get("cursor"))
+        return {"rows": [row._asdict() for row in page.rows], "next_cursor": page.next_cursor}
+
+
+class StoreRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections give their worker back after this long
+    timeout = 5
+    # Headers and body go out in separate writes; with Nagle on, the body
+    # waits for the client's delayed ACK (about 40 ms per request)
+    disable_nagle_algorithm = True
+
+    def _respond(self):
+        start = time.perf_counter()
+        service = self.server.service
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+        except ValueError as e:
+            status, route, payload = 400, f"{self.command} (bad body)", {"error": f"Invalid JSON body: {e}"}
+        else:
+            status, route, payload = service.handle(self.command, self.path, body)
+        data = json.dumps(payload, default=json_value).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        service.metrics.record(route, time.perf_counter() - start, status)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """HTTPServer handing each connection to a fixed pool of worker threads"""
+
+    def __init__(self, address, service, workers=SERVICE_WORKERS, verbose=False):
+        super().__init__(address, StoreRequestHandler)
+        self.service = service
+        self.verbose = verbose
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="store-service")
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+def serve(store, host="127.0.0.1", port=8080, workers=SERVICE_WORKERS, verbose=False):
+    """Serve store until interrupted"""
+    server = PooledHTTPServer((host, port), StoreService(store), workers, verbose)
+    print(f"Serving the store on http://{host}:{server.server_address[1]} "
+          f"({workers} workers, {store.pool.size} connections)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sqlite", metavar="DB_FILE", help="use an embedded SQLite database instead of MySQL")
+    parser.add_argument("--schema", default="online_stores.sql", help="schema loaded into a new SQLite database")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS,
+                        help="request threads (keep-alive clients each hold one while connected)")
+    parser.add_argument("--pool-size", type=int, default=8, help="pooled database connections")
+    parser.add_argument("--slow-query-ms", type=float,
+                        help="log statements at least this slow, with their EXPLAIN output")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    backend = None
+    if args.sqlite:
+        backend = SQLiteBackend(args.sqlite)
+        if not backend.has_schema():
+            backend.load_schema(args.schema)
+    store = OnlineStore(backend, pool_size=args.pool_size, slow_query_ms=args.slow_query_ms)
+
+    serve(store, args.host, args.port, args.workers, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import sys
+from itertools import islice
+
+# Rows used to size the columns before anything is printed
+RENDER_SAMPLE_ROWS = 200
+# Longer values are cut to this many characters, ending in "…"
+MAX_COLUMN_WIDTH = 40
+
+
+def format_value(value):
+    """One-line text for a cell; BLOBs are shown by size only"""
+    if value is None:
+        return ""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<BLOB {len(value)} bytes>"
+    text = str(value)
+    if "\n" in text or "\r" in text or "\t" in text:
+        text = text.replace("\r\n", " ").replace("\n", " ").replace("\r", " ").replace("\t", " ")
+    return text
+
+
+def _truncate(text, width):
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def render_grid(rows, headers, out=None, sample_size=RENDER_SAMPLE_ROWS,
+                max_width=MAX_COLUMN_WIDTH, title=None):
+    """Write rows as a grid table while they are being fetched
+
+    The output looks like tabulate's "grid" format, but column widths and
+    alignment come from the headers and the first sample_size rows only,
+    and values longer than the column (or max_width) are truncated.
+    Nothing is kept after a row is written, so rows can be a cursor over
+    any number of rows. Numeric columns (per the sample) are right-aligned.
+    title is printed above the table unless there are no rows. Returns the
+    number of rows written.
+    """
+    out = out or sys.stdout
+    rows = iter(rows)
+    sample = list(islice(rows, sample_size))
+    if not sample:
+        return 0
+
+    headers = [str(header) for header in headers]
+    columns = range(len(headers))
+    sample_text = [[_truncate(format_value(row[i]), max_width) for i in columns] for row in sample]
+    widths = [
+        max([min(len(headers[i]), max_width)] + [len(cells[i]) for cells in sample_text])
+        for i in columns
+    ]
+    numeric = [
+        all(value is None or _is_number(value) for value in (row[i] for row in sample))
+        and any(row[i] is not None for row in sample)
+        for i in columns
+    ]
+
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+\n"
+    header_border = border.replace("-", "=")
+
+    def line(cells):
+        return "|" + "|".join(
+            f" {cell.rjust(width) if right else cell.ljust(width)} "
+            for cell, width, right in zip(cells, widths, numeric)
+        ) + "|\n"
+
+    if title:
+        out.write(title + "\n")
+    out.write(border)
+    out.write(line([_truncate(header, width) for header, width in zip(headers, widths)]))
+    out.write(header_border)
+    for cells in sample_text:
+        out.write(line([_truncate(cell, width) for cell, width in zip(cells, widths)]))
+        out.write(border)
+    out.flush()
+
+    count = len(sample)
+    for row in rows:
+        out.write(line([_truncate(format_value(row[i]), widths[i]) for i in columns]))
+        out.write(border)
+        count += 1
+    out.flush()
+    return count
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from online_stores import OnlineStore
+from store_backends import SQLiteBackend
+
+SCHEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "online_stores.sql")
+
+
+def open_store(path, sample_data=True):
+    backend = SQLiteBackend(str(path))
+    backend.load_schema(SCHEMA, sample_data=sample_data)
+    return OnlineStore(backend)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """OnlineStore on a fresh SQLite file loaded with the schema's sample data"""
+    store = open_store(tmp_path / "store.db")
+    yield store
+    store.pool.close()
+
+
+@pytest.fixture
+def empty_store(tmp_path):
+    """OnlineStore on a fresh SQLite file with the schema only"""
+    store = open_store(tmp_path / "empty.db", sample_data=False)
+    yield store
+    store.pool.close()
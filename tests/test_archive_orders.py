@@ -0,0 +1,75 @@
+import datetime
+
+import pytest
+
+from archive_orders import OrderArchiver
+from store_backends import StoreError
+
+CUTOFF = datetime.date(2024, 1, 1)
+
+
+@pytest.fixture
+def old_orders(store):
+    """Ids of 7 orders dated before CUTOFF; 3 later ones and the sample order stay live"""
+    dates = ["2023-03-01", "2024-02-01", "2023-05-01", "2023-06-01", "2024-03-01",
+             "2023-07-01", "2023-08-01", "2024-04-01", "2023-09-01", "2023-12-31"]
+    ids = store.insert_orders([(1, 1, date, [(1, 1), (3, 2)]) for date in dates])
+    return [order_id for order_id, date in zip(ids, dates) if date < str(CUTOFF)]
+
+
+def table_ids(store, table, column="id"):
+    with store.transaction() as cursor:
+        cursor.execute(f"SELECT {column} FROM {table} ORDER BY {column}")
+        return [row[0] for row in cursor.fetchall()]
+
+
+def checkpoint(store):
+    with store.transaction() as cursor:
+        cursor.execute("SELECT last_id, orders_archived, items_archived FROM archive_checkpoints "
+                       "WHERE cutoff = %s", (str(CUTOFF),))
+        return cursor.fetchone()
+
+
+def test_moves_old_orders_with_their_lines_and_totals(store, old_orders):
+    assert OrderArchiver(store, CUTOFF, batch_size=3).run() == len(old_orders)
+    assert table_ids(store, "orders_archive") == old_orders
+    assert table_ids(store, "order_totals_archive", "order_id") == old_orders
+    assert len(table_ids(store, "order_items_archive")) == 2 * len(old_orders)
+    assert not set(old_orders) & set(table_ids(store, "orders"))
+    assert store.verify_order_totals() == []
+    assert checkpoint(store) == (old_orders[-1], len(old_orders), 2 * len(old_orders))
+
+
+def test_failed_run_resumes_after_the_last_committed_batch(store, old_orders, monkeypatch):
+    archiver = OrderArchiver(store, CUTOFF, batch_size=3)
+    archive_batch = archiver._archive_batch
+    batches = []
+
+    def fail_on_second_batch():
+        batches.append(1)
+        if len(batches) == 2:
+            raise StoreError("lock wait timeout")
+        return archive_batch()
+
+    monkeypatch.setattr(archiver, "_archive_batch", fail_on_second_batch)
+    assert archiver.run() is None
+    assert table_ids(store, "orders_archive") == old_orders[:3]
+    assert checkpoint(store)[:2] == (old_orders[2], 3)
+
+    assert OrderArchiver(store, CUTOFF, batch_size=3).run() == len(old_orders) - 3
+    assert table_ids(store, "orders_archive") == old_orders
+    assert checkpoint(store) == (old_orders[-1], len(old_orders), 2 * len(old_orders))
+
+
+def test_time_budget_stops_between_batches(store, old_orders):
+    assert OrderArchiver(store, CUTOFF, batch_size=2, max_seconds=0).run() == 2
+    assert OrderArchiver(store, CUTOFF, batch_size=2).run() == len(old_orders) - 2
+    assert table_ids(store, "orders_archive") == old_orders
+
+
+def test_archived_totals_keep_their_amounts(store, old_orders):
+    OrderArchiver(store, CUTOFF).run()
+    store.update_product_price(1, 1)
+    with store.transaction() as cursor:
+        cursor.execute("SELECT DISTINCT total_amount FROM order_totals_archive")
+        assert [row[0] for row in cursor.fetchall()] == [pytest.approx(999.99 + 2 * 199.99)]
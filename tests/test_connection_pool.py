@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from connection_pool import ConnectionPool, PoolTimeout
+from online_stores import OnlineStore
+from store_backends import StoreError
+
+
+def sqlite_pool(size=2, timeout=0.1, check=None):
+    return ConnectionPool(lambda: sqlite3.connect(":memory:", check_same_thread=False),
+                          size=size, timeout=timeout, check=check)
+
+
+def test_released_connection_is_reused():
+    pool = sqlite_pool()
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+
+
+def test_checkout_times_out_when_every_connection_is_busy():
+    pool = sqlite_pool(size=1)
+    with pool.connection():
+        started = time.perf_counter()
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+        assert time.perf_counter() - started >= 0.1
+
+
+def test_waiting_checkout_gets_the_released_connection():
+    pool = sqlite_pool(size=1, timeout=5)
+    conn = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    assert not got
+    pool.release(conn)
+    waiter.join(timeout=5)
+    assert got == [conn]
+
+
+def test_unhealthy_connection_is_replaced_on_checkout():
+    healthy = {}
+    pool = sqlite_pool(check=lambda conn: healthy.get(conn, True))
+    with pool.connection() as first:
+        healthy[first] = False
+    with pool.connection() as second:
+        assert second is not first
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
+
+
+def test_failed_connect_gives_the_slot_back():
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise sqlite3.OperationalError("unable to open database file")
+        return sqlite3.connect(":memory:")
+
+    pool = ConnectionPool(connect, size=1, timeout=0.1)
+    with pytest.raises(sqlite3.OperationalError):
+        pool.acquire()
+    pool.release(pool.acquire())
+
+
+def test_closed_pool_refuses_checkout():
+    pool = sqlite_pool()
+    pool.close()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+
+
+def test_failed_store_transaction_returns_its_connection(store):
+    single = OnlineStore(store.backend, pool_size=1, pool_timeout=0.1)
+    with pytest.raises(StoreError):
+        with single.transaction() as cursor:
+            cursor.execute("SELECT * FROM no_such_table")
+    with single.transaction() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM products")
+        assert cursor.fetchone()[0] == 3
+    single.pool.close()
@@ -0,0 +1,98 @@
+import sqlite3
+
+import pytest
+
+from migrate_store import StoreMigration
+from store_backends import SQLiteBackend, StoreError
+
+OLD_SCHEMA = """
+CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT NOT NULL, email TEXT NOT NULL, address TEXT);
+CREATE TABLE products (id INTEGER PRIMARY KEY, name TEXT NOT NULL, price REAL NOT NULL, description TEXT);
+CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INT, product_id INT, quantity INT NOT NULL,
+                     order_date DATE);
+INSERT INTO customers VALUES (1, 'Ann', 'ann@example.com', NULL), (2, 'Ben', 'ben@example.com', NULL);
+INSERT INTO products VALUES (1, 'Pen', 2.5, NULL), (2, 'Pad', 4.0, NULL);
+"""
+# (customer_id, product_id, quantity, order_date); each customer and day is one new order
+OLD_ORDERS = [
+    (1, 1, 2, "2024-01-01"), (1, 2, 1, "2024-01-01"), (2, 1, 1, "2024-01-01"),
+    (1, 1, 5, "2024-01-02"), (2, 2, 3, "2024-01-03"), (1, 2, 2, "2024-01-01"),
+    (2, 1, 4, "2024-01-03"),
+]
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(OLD_SCHEMA)
+    add_old_orders(conn, OLD_ORDERS)
+    conn.close()
+    return SQLiteBackend(path)
+
+
+def add_old_orders(conn, orders):
+    conn.executemany("INSERT INTO orders (customer_id, product_id, quantity, order_date) VALUES (?, ?, ?, ?)",
+                     orders)
+    conn.commit()
+
+
+def migrated_lines(store):
+    """{(customer_id, order_date): sorted [(product_id, quantity)]} of the target"""
+    with store.transaction() as cursor:
+        cursor.execute("SELECT o.customer_id, o.order_date, oi.product_id, oi.quantity "
+                       "FROM orders o JOIN order_items oi ON oi.order_id = o.id")
+        rows = cursor.fetchall()
+    lines = {}
+    for customer_id, order_date, product_id, quantity in rows:
+        lines.setdefault((customer_id, str(order_date)), []).append((product_id, quantity))
+    return {key: sorted(value) for key, value in lines.items()}
+
+
+def expected_lines(orders):
+    lines = {}
+    for customer_id, product_id, quantity, order_date in orders:
+        lines.setdefault((customer_id, order_date), []).append((product_id, quantity))
+    return {key: sorted(value) for key, value in lines.items()}
+
+
+def test_full_run_groups_lines_into_orders(source, empty_store):
+    assert StoreMigration(source, empty_store, chunk_size=2).run() == len(OLD_ORDERS)
+    assert migrated_lines(empty_store) == expected_lines(OLD_ORDERS)
+    assert empty_store.verify_order_totals() == []
+
+
+def test_interrupted_run_resumes_after_the_last_chunk(source, empty_store, monkeypatch):
+    migration = StoreMigration(source, empty_store, chunk_size=2)
+    migrate_chunk = migration._migrate_chunk
+    chunks = []
+
+    def fail_on_third_chunk(rows):
+        chunks.append(rows)
+        if len(chunks) == 3:
+            raise StoreError("connection lost")
+        migrate_chunk(rows)
+
+    monkeypatch.setattr(migration, "_migrate_chunk", fail_on_third_chunk)
+    assert migration.run() is None
+    assert migrated_lines(empty_store) == expected_lines(OLD_ORDERS[:4])
+
+    assert StoreMigration(source, empty_store, chunk_size=2).run() == len(OLD_ORDERS) - 4
+    assert migrated_lines(empty_store) == expected_lines(OLD_ORDERS)
+    assert empty_store.verify_order_totals() == []
+
+
+def test_later_run_adds_only_new_rows_to_existing_orders(source, empty_store):
+    StoreMigration(source, empty_store, chunk_size=3).run()
+    added = [(1, 2, 7, "2024-01-01"), (2, 2, 1, "2024-01-04")]
+    conn = sqlite3.connect(source.database)
+    add_old_orders(conn, added)
+    conn.close()
+
+    assert StoreMigration(source, empty_store, chunk_size=3).run() == len(added)
+    assert migrated_lines(empty_store) == expected_lines(OLD_ORDERS + added)
+    assert empty_store.verify_order_totals() == []
+
+
+def test_first_run_into_a_store_with_orders_is_refused(source, store):
+    assert StoreMigration(source, store).run() is None
@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from order_ingest import OrderLineQueue
+from store_backends import StoreConstraintError, StoreError
+
+# Long enough for every line of a test to land in one batch
+BATCH_DELAY = 0.5
+
+
+def order_lines(store, order_id):
+    with store.transaction() as cursor:
+        cursor.execute("SELECT product_id, quantity FROM order_items WHERE order_id = %s ORDER BY id",
+                       (order_id,))
+        return cursor.fetchall()
+
+
+def counted_inserts(store, monkeypatch, fail_with=None):
+    """Record the batch sizes passed to insert_order_items, optionally failing them"""
+    calls = []
+    insert = store.insert_order_items
+
+    def insert_order_items(lines):
+        calls.append(len(lines))
+        if fail_with:
+            raise fail_with
+        insert(lines)
+
+    monkeypatch.setattr(store, "insert_order_items", insert_order_items)
+    return calls
+
+
+def test_lines_are_committed_in_one_batch(store, monkeypatch):
+    calls = counted_inserts(store, monkeypatch)
+    with OrderLineQueue(store, max_delay=BATCH_DELAY) as ingest:
+        futures = [ingest.submit(1, 2, quantity) for quantity in range(1, 11)]
+        assert [future.result(timeout=5) for future in futures] == [None] * 10
+    assert calls == [10]
+    assert order_lines(store, 1)[2:] == [(2, quantity) for quantity in range(1, 11)]
+    assert store.verify_order_totals() == []
+
+
+def test_bisection_fails_only_the_rejected_lines(store):
+    with OrderLineQueue(store, max_delay=BATCH_DELAY) as ingest:
+        # Product 999 does not exist, so those lines break the foreign key
+        products = [2, 2, 999, 2, 2, 2, 2, 999, 2, 2, 2, 2, 2, 2, 2, 2]
+        futures = [ingest.submit(1, product_id, 1) for product_id in products]
+        for product_id, future in zip(products, futures):
+            if product_id == 999:
+                assert isinstance(future.exception(timeout=5), StoreConstraintError)
+            else:
+                assert future.result(timeout=5) is None
+    assert ingest.stats["failed"] == 2
+    assert ingest.stats["lines"] == 14
+    assert len(order_lines(store, 1)) == 2 + 14
+
+
+def test_other_store_errors_fail_the_whole_batch_at_once(store, monkeypatch):
+    calls = counted_inserts(store, monkeypatch, fail_with=StoreError("lost connection"))
+    with OrderLineQueue(store, max_delay=BATCH_DELAY) as ingest:
+        futures = [ingest.submit(1, 2, 1) for _ in range(40)]
+        assert all(isinstance(future.exception(timeout=5), StoreError) for future in futures)
+    assert calls == [40]
+    assert ingest.stats["failed"] == 40
+
+
+def test_close_commits_queued_lines_and_refuses_new_ones(store):
+    ingest = OrderLineQueue(store, max_delay=BATCH_DELAY)
+    future = ingest.submit(1, 2, 3)
+    ingest.close()
+    assert future.done() and future.result() is None
+    with pytest.raises(StoreError):
+        ingest.submit(1, 2, 3)
+
+
+def test_cancelled_line_is_not_written(store, monkeypatch):
+    writing, release = threading.Event(), threading.Event()
+    insert = store.insert_order_items
+    calls = []
+
+    def blocking_insert(lines):
+        calls.append(len(lines))
+        writing.set()
+        release.wait(5)
+        insert(lines)
+
+    monkeypatch.setattr(store, "insert_order_items", blocking_insert)
+    with OrderLineQueue(store, max_delay=0) as ingest:
+        first = ingest.submit(1, 2, 1)
+        assert writing.wait(5)
+        # The writer is busy with the first line, so this one is still queued
+        cancelled = ingest.submit(1, 2, 2)
+        assert cancelled.cancel()
+        release.set()
+        first.result(timeout=5)
+    assert calls == [1]
+    assert order_lines(store, 1)[2:] == [(2, 1)]
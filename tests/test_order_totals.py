@@ -0,0 +1,59 @@
+import pytest
+
+from online_stores import OnlineStore
+
+
+def stored_totals(store, order_id):
+    with store.transaction() as cursor:
+        cursor.execute("SELECT item_count, total_amount FROM order_totals WHERE order_id = %s", (order_id,))
+        return cursor.fetchone()
+
+
+def test_sample_totals_match_the_order_lines(store):
+    assert store.verify_order_totals() == []
+    items, total = stored_totals(store, 1)
+    assert items == 2
+    assert total == pytest.approx(999.99 + 2 * 199.99)
+
+
+def test_new_orders_get_their_totals(store):
+    order_id = store.insert_orders([(2, 2, "2024-02-01", [(2, 3), (3, 1)])])[0]
+    items, total = stored_totals(store, order_id)
+    assert items == 2
+    assert total == pytest.approx(3 * 699.99 + 199.99)
+
+
+def test_added_line_updates_the_totals(store):
+    store.add_order_item(1, 2, 1)
+    items, total = stored_totals(store, 1)
+    assert items == 3
+    assert total == pytest.approx(999.99 + 2 * 199.99 + 699.99)
+    assert store.verify_order_totals() == []
+
+
+def test_price_change_updates_the_totals(store):
+    store.update_product_price(3, 100)
+    assert stored_totals(store, 1)[1] == pytest.approx(999.99 + 200)
+    assert store.verify_order_totals() == []
+
+
+def test_deleted_order_loses_its_totals(store):
+    store.delete_order(1)
+    assert stored_totals(store, 1) is None
+    assert store.verify_order_totals() == []
+
+
+def test_rebuild_repairs_stale_totals(store):
+    with store.transaction() as cursor:
+        cursor.execute("UPDATE order_totals SET total_amount = 0")
+    assert [row[0] for row in store.verify_order_totals()] == [1]
+    store.rebuild_order_totals()
+    assert store.verify_order_totals() == []
+
+
+def test_store_without_the_table_creates_and_fills_it(store):
+    with store.transaction() as cursor:
+        cursor.execute("DROP TABLE order_totals")
+    reopened = OnlineStore(store.backend)
+    assert stored_totals(reopened, 1)[0] == 2
+    reopened.pool.close()
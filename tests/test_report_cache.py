@@ -0,0 +1,62 @@
+import pytest
+
+from result_cache import ResultCache
+from store_backends import StoreError
+
+
+def test_fill_started_before_an_invalidation_is_dropped():
+    cache = ResultCache()
+    generation = cache.generation
+    cache.invalidate([("customer", 1)])
+    cache.put(("customer", 1), "stale", generation)
+    assert cache.get(("customer", 1)) == (False, None)
+    cache.put(("customer", 1), "fresh", cache.generation)
+    assert cache.get(("customer", 1)) == (True, "fresh")
+
+
+def test_invalidation_of_another_key_also_drops_in_flight_fills():
+    cache = ResultCache()
+    generation = cache.generation
+    cache.invalidate([("product", 9)])
+    cache.put(("customer", 1), "maybe stale", generation)
+    assert cache.get(("customer", 1)) == (False, None)
+
+
+def test_first_page_is_served_from_the_cache(store):
+    first = store.orders_by_customer(1)
+    assert store.orders_by_customer(1) is first
+    assert store.report_cache.stats()["hits"] == 1
+
+
+def test_new_order_invalidates_its_reports(store):
+    store.orders_by_customer(1)
+    store.orders_by_salesperson(2)
+    order_id = store.insert_orders([(1, 2, "2024-03-01", [(2, 1)])])[0]
+    assert [row.order_id for row in store.orders_by_customer(1).rows] == [order_id, 1]
+    assert [row.order_id for row in store.orders_by_salesperson(2).rows] == [order_id]
+
+
+def test_price_change_invalidates_reports_of_orders_with_the_product(store):
+    before = store.orders_by_customer(1).rows[0].total_amount
+    store.update_product_price(3, 100)
+    after = store.orders_by_customer(1).rows[0].total_amount
+    assert after == pytest.approx(before - 2 * 99.99)
+
+
+def test_failed_report_lookup_after_price_change_clears_the_cache(store, monkeypatch):
+    store.orders_by_customer(1)
+
+    def fail(product_id):
+        raise StoreError("lookup failed")
+
+    monkeypatch.setattr(store, "_invalidate_reports_for_product", fail)
+    store.update_product_price(3, 100)
+    assert store.report_cache.stats()["size"] == 0
+
+
+def test_rebuild_clears_cached_reports(store):
+    store.orders_by_customer(1)
+    with store.transaction() as cursor:
+        cursor.execute("UPDATE order_totals SET total_amount = 0")
+    store.rebuild_order_totals()
+    assert store.orders_by_customer(1).rows[0].total_amount == pytest.approx(999.99 + 2 * 199.99)
@@ -0,0 +1,52 @@
+import pytest
+
+from online_stores import decode_report_cursor, encode_report_cursor
+
+DATES = ["2024-03-01", None, "2024-01-15", "2024-03-01", None, "2023-12-31", None]
+
+
+def all_pages(fetch, report_id, limit):
+    rows, cursor, pages = [], None, 0
+    while True:
+        page = fetch(report_id, limit, cursor)
+        rows.extend(page.rows)
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            return rows, pages
+
+
+@pytest.fixture
+def orders(store):
+    """Ids of customer 2's orders, newest first with undated orders last"""
+    ids = store.insert_orders([(2, 2, date, [(2, 1)]) for date in DATES])
+    dated = sorted((date, order_id) for order_id, date in zip(ids, DATES) if date)
+    undated = [order_id for order_id, date in zip(ids, DATES) if date is None]
+    return [order_id for _, order_id in reversed(dated)] + sorted(undated, reverse=True)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 50])
+def test_customer_pages_cover_null_dates_once(store, orders, limit):
+    rows, pages = all_pages(store.orders_by_customer, 2, limit)
+    assert [row.order_id for row in rows] == orders
+    assert pages == max(1, -(-len(orders) // limit))
+
+
+def test_salesperson_pages_cover_null_dates_once(store, orders):
+    rows, _ = all_pages(store.orders_by_salesperson, 2, 2)
+    assert [row.order_id for row in rows] == orders
+
+
+def test_product_pages_cover_null_dates_once(store, orders):
+    rows, _ = all_pages(store.orders_by_product, 2, 2)
+    assert [row.order_id for row in rows] == orders
+
+
+def test_cursor_round_trips_a_null_date():
+    assert decode_report_cursor(encode_report_cursor(None, 7)) == (None, 7)
+    assert decode_report_cursor(encode_report_cursor("2024-01-15", 3)) == ("2024-01-15", 3)
+
+
+def test_malformed_cursor_is_a_value_error():
+    with pytest.raises(ValueError):
+        decode_report_cursor("not a cursor")